@@ -0,0 +1,25 @@
+"""Add renormalization claim columns to catalog_revisions
+
+Revision ID: add_catalog_renormalization
+Revises: add_data_versions
+Create Date: 2026-10-19 00:00:06.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_catalog_renormalization'
+down_revision = 'add_data_versions'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('catalog_revisions', sa.Column('renormalize_claimed_at', sa.DateTime(), nullable=True))
+    op.add_column('catalog_revisions', sa.Column('renormalized_at', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('catalog_revisions', 'renormalized_at')
+    op.drop_column('catalog_revisions', 'renormalize_claimed_at')
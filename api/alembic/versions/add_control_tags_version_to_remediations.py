@@ -0,0 +1,28 @@
+"""Add control_tags_version to remediations
+
+Revision ID: add_control_tags_version
+Revises: add_archived_col
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_control_tags_version'
+down_revision = 'add_archived_col'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # NULL marks existing rows as stale: they are re-normalized in the
+    # background at API startup (crud.renormalize_stale_remediations)
+    op.add_column(
+        'remediations',
+        sa.Column('control_tags_version', sa.String(length=16), nullable=True)
+    )
+
+
+def downgrade():
+    op.drop_column('remediations', 'control_tags_version')
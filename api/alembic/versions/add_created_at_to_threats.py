@@ -0,0 +1,36 @@
+"""Add created_at to threats
+
+Revision ID: add_threats_created_at
+Revises: add_standards_catalog
+Create Date: 2026-10-19 00:00:02.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_threats_created_at'
+down_revision = 'add_standards_catalog'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('threats', sa.Column('created_at', sa.DateTime(), nullable=True))
+    # Existing threats were created together with their information system
+    op.execute("""
+        UPDATE threats SET created_at = (
+            SELECT information_systems.datetime FROM information_systems
+            WHERE information_systems.id = threats.information_system_id
+        )
+        WHERE created_at IS NULL
+    """)
+    op.execute("UPDATE threats SET created_at = CURRENT_TIMESTAMP WHERE created_at IS NULL")
+    op.alter_column('threats', 'created_at', nullable=False)
+    # Keyset pagination of /report: ORDER BY created_at DESC, id DESC
+    op.create_index('ix_threats_created_at_id', 'threats', ['created_at', 'id'])
+
+
+def downgrade():
+    op.drop_index('ix_threats_created_at_id', table_name='threats')
+    op.drop_column('threats', 'created_at')
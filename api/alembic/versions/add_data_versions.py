@@ -0,0 +1,28 @@
+"""Add data_versions table
+
+Revision ID: add_data_versions
+Revises: add_stored_risk_levels
+Create Date: 2026-10-19 00:00:05.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_data_versions'
+down_revision = 'add_stored_risk_levels'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'data_versions',
+        sa.Column('scope', sa.String(), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('scope')
+    )
+
+
+def downgrade():
+    op.drop_table('data_versions')
@@ -0,0 +1,71 @@
+"""Add remediation_control_tags table
+
+Revision ID: add_remediation_control_tags
+Revises: add_threats_created_at
+Create Date: 2026-10-19 00:00:03.000000
+
+"""
+import json
+import re
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_remediation_control_tags'
+down_revision = 'add_threats_created_at'
+branch_labels = None
+depends_on = None
+
+# Stored tags are normalized to 'ID (STANDARD)' (crud.normalize_control_tags)
+_STORED_TAG_RE = re.compile(r'^(.+?)\s*\(([^)]+)\)\s*$')
+
+
+def upgrade():
+    op.create_table(
+        'remediation_control_tags',
+        sa.Column('remediation_id', sa.UUID(), nullable=False),
+        sa.Column('standard', sa.String(), nullable=False),
+        sa.Column('tag_id', sa.String(), nullable=False),
+        sa.ForeignKeyConstraint(['remediation_id'], ['remediations.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('remediation_id', 'standard', 'tag_id')
+    )
+    op.create_index(
+        'ix_remediation_control_tags_standard_tag', 'remediation_control_tags', ['standard', 'tag_id']
+    )
+
+    # Backfill from the JSON column
+    bind = op.get_bind()
+    tag_rows = sa.table(
+        'remediation_control_tags',
+        sa.column('remediation_id', sa.UUID()),
+        sa.column('standard', sa.String()),
+        sa.column('tag_id', sa.String()),
+    )
+    remediations = sa.table('remediations', sa.column('id', sa.UUID()), sa.column('control_tags', sa.Text()))
+    result = bind.execute(
+        sa.select(remediations.c.id, remediations.c.control_tags)
+        .where(remediations.c.control_tags.isnot(None), remediations.c.control_tags != '[]')
+    ).fetchall()
+    batch = []
+    for remediation_id, control_tags in result:
+        try:
+            tags = json.loads(control_tags)
+        except (TypeError, ValueError):
+            continue
+        seen = set()
+        for tag in tags if isinstance(tags, list) else []:
+            m = _STORED_TAG_RE.match(tag) if isinstance(tag, str) else None
+            if m and (m.group(2), m.group(1)) not in seen:
+                seen.add((m.group(2), m.group(1)))
+                batch.append({"remediation_id": remediation_id, "standard": m.group(2), "tag_id": m.group(1)})
+        if len(batch) >= 1000:
+            op.bulk_insert(tag_rows, batch)
+            batch = []
+    if batch:
+        op.bulk_insert(tag_rows, batch)
+
+
+def downgrade():
+    op.drop_index('ix_remediation_control_tags_standard_tag', table_name='remediation_control_tags')
+    op.drop_table('remediation_control_tags')
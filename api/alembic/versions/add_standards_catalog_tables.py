@@ -0,0 +1,56 @@
+"""Add standards catalog tables
+
+Revision ID: add_standards_catalog
+Revises: add_control_tags_version
+Create Date: 2026-10-19 00:00:01.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_standards_catalog'
+down_revision = 'add_control_tags_version'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Empty tables: the API seeds them from the api/standards modules at startup
+    # (crud.seed_standards_catalog)
+    op.create_table(
+        'catalog_revisions',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('created_by', sa.UUID(), nullable=True),
+        sa.Column('detail', sa.Text(), nullable=True),
+        sa.ForeignKeyConstraint(['created_by'], ['users.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table(
+        'catalog_standards',
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('version', sa.String(), nullable=True),
+        sa.Column('position', sa.Integer(), nullable=False),
+        sa.Column('revision_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['revision_id'], ['catalog_revisions.id']),
+        sa.PrimaryKeyConstraint('name')
+    )
+    op.create_table(
+        'catalog_controls',
+        sa.Column('standard_name', sa.String(), nullable=False),
+        sa.Column('tag_id', sa.String(), nullable=False),
+        sa.Column('position', sa.Integer(), nullable=False),
+        sa.Column('title', sa.Text(), nullable=False),
+        sa.Column('description', sa.Text(), nullable=False),
+        sa.Column('category', sa.String(), nullable=False),
+        sa.Column('extra', sa.Text(), nullable=True),
+        sa.ForeignKeyConstraint(['standard_name'], ['catalog_standards.name']),
+        sa.PrimaryKeyConstraint('standard_name', 'tag_id')
+    )
+
+
+def downgrade():
+    op.drop_table('catalog_controls')
+    op.drop_table('catalog_standards')
+    op.drop_table('catalog_revisions')
@@ -0,0 +1,83 @@
+"""Add stored risk scores and levels
+
+Revision ID: add_stored_risk_levels
+Revises: add_remediation_control_tags
+Create Date: 2026-10-19 00:00:04.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_stored_risk_levels'
+down_revision = 'add_remediation_control_tags'
+branch_labels = None
+depends_on = None
+
+LIKELIHOOD_FACTORS = (
+    'skill_level', 'motive', 'opportunity', 'size',
+    'ease_of_discovery', 'ease_of_exploit', 'awareness', 'intrusion_detection',
+)
+IMPACT_FACTORS = (
+    'loss_of_confidentiality', 'loss_of_integrity', 'loss_of_availability', 'loss_of_accountability',
+    'financial_damage', 'reputation_damage', 'non_compliance', 'privacy_violation',
+)
+
+
+def _average_score(factors):
+    # Same as models.Risk.likelihood_score / impact_score: 0 when a factor is missing
+    missing = " OR ".join(f"{f} IS NULL" for f in factors)
+    first, second = " + ".join(factors[:4]), " + ".join(factors[4:])
+    return f"CASE WHEN {missing} THEN 0 ELSE (({first}) / 4.0 + ({second}) / 4.0) / 2.0 END"
+
+
+def _level(score):
+    # models.risk_level
+    return (
+        f"CASE WHEN {score} < 3 THEN 'LOW' WHEN {score} < 6 THEN 'MEDIUM' "
+        f"WHEN {score} < 9 THEN 'HIGH' ELSE 'CRITICAL' END"
+    )
+
+
+def upgrade():
+    op.add_column('risks', sa.Column('likelihood', sa.Float(), nullable=True))
+    op.add_column('risks', sa.Column('impact', sa.Float(), nullable=True))
+    op.add_column('risks', sa.Column('risk_score', sa.Float(), nullable=True))
+    op.add_column('risks', sa.Column('inherent_level', sa.String(length=8), nullable=True))
+    op.add_column('threats', sa.Column('current_level', sa.String(length=8), nullable=True))
+
+    op.execute(
+        f"UPDATE risks SET likelihood = {_average_score(LIKELIHOOD_FACTORS)}, "
+        f"impact = {_average_score(IMPACT_FACTORS)}"
+    )
+    op.execute("UPDATE risks SET risk_score = (likelihood + impact) / 2.0")
+    op.execute(f"UPDATE risks SET inherent_level = {_level('risk_score')}")
+    # models.Risk.current_risk: the residual risk once the remediation is applied
+    op.execute(f"""
+        UPDATE threats SET current_level = (
+            SELECT CASE
+                WHEN remediations.status = TRUE AND risks.residual_risk IS NOT NULL
+                THEN {_level('risks.residual_risk')}
+                ELSE risks.inherent_level
+            END
+            FROM risks LEFT JOIN remediations ON remediations.id = threats.remediation_id
+            WHERE risks.id = threats.risk_id
+        )
+    """)
+
+    op.create_index('ix_risks_inherent_level', 'risks', ['inherent_level'])
+    op.create_index('ix_risks_risk_score', 'risks', ['risk_score'])
+    op.create_index(
+        'ix_threats_current_level_created_at_id', 'threats', ['current_level', 'created_at', 'id']
+    )
+
+
+def downgrade():
+    op.drop_index('ix_threats_current_level_created_at_id', table_name='threats')
+    op.drop_index('ix_risks_risk_score', table_name='risks')
+    op.drop_index('ix_risks_inherent_level', table_name='risks')
+    op.drop_column('threats', 'current_level')
+    op.drop_column('risks', 'inherent_level')
+    op.drop_column('risks', 'risk_score')
+    op.drop_column('risks', 'impact')
+    op.drop_column('risks', 'likelihood')
@@ -13,17 +13,22 @@ This module contains all the REST API endpoints organized by functional domains:
 
 import os
 import json
+import hashlib
 import logging
+import re
+import threading
+import time
 from uuid import UUID
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import List, Optional, Dict, Any
 
 # Third-party imports
-from fastapi import FastAPI, HTTPException, Depends, UploadFile, Body, Form, status, Path, Query
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, HTTPException, Depends, UploadFile, File, Body, Form, status, Path, Query, Request, BackgroundTasks
+from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
+from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
 from sqlalchemy.orm import Session, joinedload
 import jwt
@@ -47,9 +52,10 @@ import crud
 import database
 import utils
 import init_db
-import control_tags
 from tzu_ai import clientAI
 from utils import process_file, save_text_content
+from section_diff import build_incremental_content
+from threat_importers import parse_threat_model, ImportFormatError
 from stride_validator import normalize_stride_category, get_valid_stride_categories
 
 # =====================================================
@@ -113,9 +119,17 @@ app.add_middleware(
     allow_origins=origins,
     allow_credentials=True,
     allow_methods=["*"],
-    allow_headers=["*"]
+    allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor", "X-Total-Count-Estimate"]
 )
 
+@app.middleware("http")
+async def pin_standards_catalog(request: Request, call_next):
+    """Each request sees one standards catalog, even if a new one is installed meanwhile."""
+    from standards import pinned_catalog
+    with pinned_catalog():
+        return await call_next(request)
+
 # Static file serving
 app.mount("/diagrams", StaticFiles(directory="diagrams"), name="diagrams")
 
@@ -522,6 +536,48 @@ async def read_information_systems(
     information_systems = crud.get_information_systems(db, skip=skip, limit=limit, project_id=filter_project_id, include_archived=include_archived)
     return information_systems
 
+@app.get(
+    "/information_systems/summary",
+    response_model=schemas.InformationSystemSummaryPage,
+    tags=["Information Systems"],
+    summary="List Information Systems Summary",
+    description="Page of information systems with threat counts per risk level and the total of systems"
+)
+async def read_information_systems_summary(
+    skip: int = Query(0, ge=0, description="Number of records to skip"),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of records to return"),
+    project_id: Optional[str] = Query(None, description="Filter by project UUID"),
+    include_archived: bool = Query(False, description="Include archived systems"),
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_active_user)
+):
+    """
+    Summary listing of information systems for the list page.
+
+    Unlike /information_systems, the threats are not embedded: each system
+    carries its threat count per current risk level and its remediation
+    ratio, all computed in one grouped query, plus the total number of
+    systems matching the filters (no separate count request).
+
+    Args:
+        skip: Number of records to skip for pagination
+        limit: Maximum number of records to return
+        project_id: Filter by project UUID
+        include_archived: Include archived systems
+        db: Database session
+        current_user: Current authenticated user
+
+    Returns:
+        schemas.InformationSystemSummaryPage: Total and the page of summaries
+    """
+    filter_project_id = None
+    if project_id is not None:
+        filter_project_id = validate_uuid(project_id, "project_id")
+    total, items = crud.get_information_system_summaries(
+        db, skip=skip, limit=limit, project_id=filter_project_id, include_archived=include_archived
+    )
+    return {"total": total, "items": items}
+
 @app.get(
     "/information_systems/{information_system_id}", 
     response_model=schemas.InformationSystem,
@@ -599,6 +655,7 @@ async def evaluate_system_diagram(
     information_system_id: str = Path(..., description="Information system UUID"),
     file: Optional[UploadFile] = None,
     text_content: Optional[str] = Form(None, description="Plain-text architecture/diagram description"),
+    incremental: bool = Form(False, description="Only analyze sections that changed since the last text evaluation"),
     db: Session = Depends(get_db),
     current_user: models.User = Depends(require_analyst_user)
 ):
@@ -607,10 +664,16 @@ async def evaluate_system_diagram(
 
     Provide EITHER a file upload OR a text_content form field — not both simultaneously.
 
+    When incremental is set and both the previous and the new content are text, the
+    new description is diffed section by section against the stored one; only the
+    changed sections are sent to the model and threats already present in the
+    system (same STRIDE type and title) are skipped.
+
     Args:
         information_system_id: UUID of the target information system
         file: Optional uploaded file (image, PDF, XML, JSON, TXT, MD, SVG)
         text_content: Optional plain-text description of the system architecture
+        incremental: Diff-aware re-evaluation mode
         db: Database session
         current_user: Current authenticated user
 
@@ -642,6 +705,15 @@ async def evaluate_system_diagram(
         if not content or not saved_filename:
             return {"message": "Error al procesar el contenido", "success": False}
 
+        # Incremental mode: keep the previously analyzed text to diff against
+        previous_text = None
+        if incremental and content_type == "text":
+            previous_system = db.query(models.InformationSystem).filter(
+                models.InformationSystem.id == system_uuid
+            ).first()
+            if previous_system and previous_system.diagram_input_type == "text":
+                previous_text = utils.read_saved_text(previous_system.diagram)
+
         # Attach diagram/file reference and input type to information system
         db_information_system = crud.attach_diagram(
             db,
@@ -650,9 +722,22 @@ async def evaluate_system_diagram(
             input_type=content_type
         )
 
+        analysis_content = content
+        changed_sections = None
+        if previous_text is not None:
+            analysis_content, changed_sections = build_incremental_content(previous_text, content)
+            if analysis_content is None:
+                return {
+                    "information_system": db_information_system,
+                    "message": "No se detectaron cambios respecto al último análisis",
+                    "success": True,
+                    "threats_found": 0,
+                    "changed_sections": 0
+                }
+
         # Get AI analysis
         try:
-            result = clientAI(content, content_type)
+            result = clientAI(analysis_content, content_type)
         except ValueError as e:
             logger.warning("AI analysis returned an invalid response: %s", e)
             return {
@@ -680,41 +765,28 @@ async def evaluate_system_diagram(
                 "success": False
             }
 
+        # Reconcile against existing threats when re-evaluating incrementally
+        existing_signatures = crud.get_threat_signatures(db, system_uuid) if previous_text is not None else None
+
         # Process identified threats
-        threats_created = 0
-        for threat_data in result.threats:
-            normalized_type = normalize_stride_category(threat_data.type)
-            if not normalized_type:
-                normalized_type = 'Spoofing'
-
-            if hasattr(threat_data.remediation, 'description'):
-                remediation_desc = threat_data.remediation.description
-                control_tags = getattr(threat_data.remediation, 'control_tags', [])
-            else:
-                remediation_desc = str(threat_data.remediation)
-                control_tags = []
-            
-            # Create threat components
-            remediation = crud.create_remediation(db, remediation_desc, control_tags, created_by=current_user.id)
-            risk = crud.create_risk(db, threat_data.risk)
-            threat = crud.create_threat(
-                db, 
-                threat_data.title, 
-                threat_data.description, 
-                normalized_type, 
-                system_uuid, 
-                risk.id, 
-                remediation.id,
-                created_by=current_user.id
-            )
-            threats_created += 1
+        threats_created, threats_skipped = crud.create_threats_from_analysis(
+            db,
+            system_uuid,
+            result.threats,
+            created_by=current_user.id,
+            existing_signatures=existing_signatures
+        )
 
-        return {
+        response = {
             "information_system": db_information_system,
             "message": f"Contenido analizado exitosamente. Se encontraron {threats_created} amenazas",
             "success": True,
             "threats_found": threats_created
         }
+        if changed_sections is not None:
+            response["changed_sections"] = changed_sections
+            response["threats_skipped"] = threats_skipped
+        return response
 
     except Exception as e:
         logger.exception("Error during system diagram evaluation")
@@ -723,6 +795,76 @@ async def evaluate_system_diagram(
             "success": False
         }
 
+@app.post(
+    "/import",
+    tags=["Information Systems"],
+    summary="Import Threat Models",
+    description=(
+        "Import existing threat models without AI analysis. "
+        "Supported formats: OWASP Threat Dragon (.json, v1 and v2) and "
+        "Microsoft Threat Modeling Tool (.tm7). Each file becomes a new information system."
+    )
+)
+async def import_threat_models(
+    files: List[UploadFile] = File(..., description="Threat Dragon .json or TMT .tm7 files"),
+    project_id: Optional[str] = Form(None, description="Project UUID for the imported systems"),
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(require_analyst_user)
+):
+    """
+    Import Threat Dragon / TM7 models as information systems with their threats,
+    risks and remediations. STRIDE categories are normalized and threats are
+    bulk-inserted, one transaction per file.
+
+    Args:
+        files: Threat model files
+        project_id: Optional project the imported systems belong to
+        db: Database session
+        current_user: Current authenticated analyst/admin user
+
+    Returns:
+        dict: Per-file import results and the total of imported threats
+    """
+    filter_project_id = None
+    if project_id:
+        filter_project_id = validate_uuid(project_id, "project_id")
+        if not db.query(models.Project).filter(models.Project.id == filter_project_id).first():
+            raise HTTPException(status_code=404, detail="Project not found")
+
+    results = []
+    total_threats = 0
+    for upload in files:
+        try:
+            raw_bytes = await upload.read()
+            source_format, parsed = parse_threat_model(upload.filename, raw_bytes)
+        except ImportFormatError as e:
+            results.append({"file": upload.filename, "success": False, "message": str(e)})
+            continue
+        finally:
+            await upload.close()
+
+        system, imported = crud.import_threat_model(
+            db,
+            parsed,
+            project_id=filter_project_id,
+            created_by=current_user.id
+        )
+        total_threats += imported
+        results.append({
+            "file": upload.filename,
+            "success": True,
+            "format": source_format,
+            "information_system_id": str(system.id),
+            "title": system.title,
+            "threats_imported": imported
+        })
+
+    return {
+        "results": results,
+        "systems_imported": sum(1 for r in results if r["success"]),
+        "threats_imported": total_threats
+    }
+
 # =====================================================
 # THREAT MANAGEMENT ENDPOINTS
 # =====================================================
@@ -735,15 +877,21 @@ async def evaluate_system_diagram(
     description="Get all threats associated with a specific information system"
 )
 async def get_threats_by_system(
+    response: Response,
     information_system_id: str = Path(..., description="Information system UUID"),
+    limit: Optional[int] = Query(None, ge=1, le=5000, description="Page size (all threats when omitted)"),
+    cursor: str = Query(None, description="Opaque cursor from the X-Next-Cursor header of the previous page"),
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_active_user)
 ):
     """
-    Get all threats associated with a specific information system.
+    Get all threats associated with a specific information system, newest first.
     
     Args:
+        response: Outgoing response (pagination headers)
         information_system_id: UUID of the information system
+        limit: Page size; the next page cursor is sent in X-Next-Cursor
+        cursor: Cursor of the page to read
         db: Database session
         current_user: Current authenticated user
         
@@ -752,11 +900,19 @@ async def get_threats_by_system(
     """
     # Validate UUID format
     system_uuid = validate_uuid(information_system_id, "information system ID")
+    after = None
+    if cursor:
+        try:
+            after = crud.decode_threat_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
     
-    threats = db.query(models.Threat).options(
-        joinedload(models.Threat.risk),
-        joinedload(models.Threat.remediation)
-    ).filter(models.Threat.information_system_id == system_uuid).all()
+    threats = crud.get_threats_by_information_system(
+        db, system_uuid, limit=limit + 1 if limit else None, cursor=after
+    )
+    if limit and len(threats) > limit:
+        threats = threats[:limit]
+        response.headers["X-Next-Cursor"] = crud.encode_threat_cursor(threats[-1])
     
     return threats
 
@@ -1101,6 +1257,119 @@ async def update_threats_risk_by_system(
 # REPORT GENERATION ENDPOINTS
 # =====================================================
 
+def _report_filters(standards: Optional[str], inherit_risk: Optional[str], current_risk: Optional[str], tag_filter: Optional[str] = None, project_id: Optional[str] = None) -> dict:
+    """
+    Validated /report filters as crud.get_all_threats keyword arguments.
+
+    Raises:
+        HTTPException: 400 if a risk level is not LOW, MEDIUM, HIGH or CRITICAL,
+            a control tag is not recognized or project_id is not a UUID
+    """
+    valid_levels = ["LOW", "MEDIUM", "HIGH", "CRITICAL"]
+    for name, value in (("inherit_risk", inherit_risk), ("current_risk", current_risk)):
+        if value and value.upper() not in valid_levels:
+            raise HTTPException(
+                status_code=400, 
+                detail=f"Invalid {name}. Must be one of: {', '.join(valid_levels)}"
+            )
+    return {
+        "standards": [s.strip().upper() for s in standards.split(',')] if standards else None,
+        "inherit_risk": inherit_risk.upper() if inherit_risk else None,
+        "current_risk": current_risk.upper() if current_risk else None,
+        "control_tags": _report_control_tags(tag_filter) if tag_filter else None,
+        "project_id": validate_uuid(project_id, "project_id") if project_id else None,
+    }
+
+def _report_control_tags(tag_filter: str) -> list:
+    """(standard, tag_id) pairs of a comma-separated control tag filter ('V2.1.1 (ASVS),AUTH-1')."""
+    keys = []
+    for raw in tag_filter.split(","):
+        if not raw.strip():
+            continue
+        normalized, _ = crud.normalize_control_tags([raw])
+        parsed = crud.stored_control_tag_keys(normalized)
+        if not parsed:
+            raise HTTPException(status_code=400, detail=f"Unknown control tag: {raw.strip()}")
+        keys.extend(parsed)
+    return keys
+
+REPORT_VIEWS = ("full", "slim")
+
+def _report_row_fields(view: str, fields: Optional[str]) -> Optional[set]:
+    """
+    Fields of the slim /report row to serialize.
+
+    Args:
+        view: "full" (ThreatWithSystem) or "slim" (ThreatReportRow)
+        fields: Comma-separated sparse fieldset of the slim row (implies slim)
+
+    Returns:
+        Optional[set]: None for the full view, otherwise the selected fields (id always included)
+
+    Raises:
+        HTTPException: 400 for an unknown view or field
+    """
+    if view not in REPORT_VIEWS:
+        raise HTTPException(status_code=400, detail=f"Invalid view. Must be one of: {', '.join(REPORT_VIEWS)}")
+    if not fields:
+        return set(schemas.ThreatReportRow.model_fields) if view == "slim" else None
+    selected = {f.strip() for f in fields.split(",") if f.strip()}
+    unknown = selected - set(schemas.ThreatReportRow.model_fields)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    return selected | {"id"}
+
+def _report_page(db: Session, filters: dict, system_id: Optional[str], limit: int, skip: int = 0, after: Optional[tuple] = None, row_fields: Optional[set] = None):
+    """
+    One /report page serialized to JSON bytes.
+
+    Returns:
+        tuple: (body, headers) with X-Next-Cursor when more threats follow
+    """
+    # One extra row tells whether there is a next page
+    threats = crud.get_all_threats(
+        db=db,
+        skip=skip,
+        limit=limit + 1,
+        system_id=system_id,
+        cursor=after,
+        **filters
+    )
+    headers = {}
+    if len(threats) > limit:
+        threats = threats[:limit]
+        headers["X-Next-Cursor"] = crud.encode_threat_cursor(threats[-1])
+
+    if row_fields is not None:
+        # Slim rows: the system's sibling threats are never loaded nor serialized
+        rows = [
+            schemas.ThreatReportRow.model_validate(threat).model_dump(mode="json", include=row_fields)
+            for threat in threats
+        ]
+    else:
+        rows = [schemas.ThreatWithSystem.model_validate(threat).model_dump(mode="json") for threat in threats]
+    return json.dumps(rows, ensure_ascii=False, separators=(",", ":")).encode("utf-8"), headers
+
+def _report_snapshot_response(db: Session, filters: dict, request: dict, build_body) -> Optional[Response]:
+    """
+    The materialized response of a project report (report_snapshots), or
+    None when there is no snapshot of the current data version (answer live).
+
+    X-Data-Version tells the project data version it was built from.
+    """
+    import report_snapshots
+
+    project_id = filters["project_id"]
+    key = report_snapshots.snapshot_key(project_id, request)
+    meta = report_snapshots.serve(db, key, models.project_scope(project_id), build_body)
+    if meta is None:
+        return None
+    return FileResponse(
+        meta["body"],
+        media_type=meta["media_type"],
+        headers={**meta["headers"], "X-Snapshot": "fresh", "X-Data-Version": str(meta["version"])},
+    )
+
 @app.get(
     "/report", 
     response_model=List[schemas.ThreatWithSystem],
@@ -1109,71 +1378,295 @@ async def update_threats_risk_by_system(
     description="Generate comprehensive threat report with filtering options"
 )
 async def get_threats_report(
-    skip: int = Query(0, ge=0, description="Number of records to skip"),
+    skip: int = Query(0, ge=0, description="Number of records to skip (prefer cursor)"),
     limit: int = Query(1000, ge=1, le=5000, description="Maximum number of records"),
+    cursor: str = Query(None, description="Opaque cursor from the X-Next-Cursor header of the previous page"),
+    estimate_total: bool = Query(False, description="Send an estimated total in X-Total-Count-Estimate"),
     standards: str = Query(None, description="Comma-separated list of standards (e.g., 'ASVS,MASVS,NIST')"),
     system_id: str = Query(None, description="Filter by specific information system ID"),
+    project_id: str = Query(None, description="Filter by project ID"),
     inherit_risk: str = Query(None, description="Filter by inherent risk level: LOW, MEDIUM, HIGH, CRITICAL"),
     current_risk: str = Query(None, description="Filter by current risk level considering remediations: LOW, MEDIUM, HIGH, CRITICAL"),
+    tag_filter: str = Query(None, alias="control_tags", description="Comma-separated control tags the threats must cite (e.g., 'V2.1.1 (ASVS),AUTH-1')"),
+    view: str = Query("full", description="Row shape: full (embeds the information system and all its threats) or slim"),
+    fields: str = Query(None, description="Comma-separated fields of the slim row (implies view=slim), e.g. 'title,current_risk_level,information_system'"),
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_active_user)
 ):
     """
     Generate a comprehensive threat report with various filtering options.
+
+    Threats come newest first. When more are available, the X-Next-Cursor
+    header holds the cursor of the next page (keyset pagination: every page
+    costs the same, and inserts do not shift the pages already read).
     
     Args:
         skip: Number of records to skip for pagination
         limit: Maximum number of records to return
+        cursor: Cursor of the page to read (X-Next-Cursor of the previous one)
+        estimate_total: Add X-Total-Count-Estimate (approximate count of the filtered threats,
+            capped at crud.REPORT_COUNT_ESTIMATE_CAP when filtered)
         standards: Comma-separated list of security standards to filter by
         system_id: Filter threats by specific information system
+        project_id: Filter threats by project
         inherit_risk: Filter by inherent risk level (LOW, MEDIUM, HIGH, CRITICAL)
         current_risk: Filter by current risk level considering remediations (LOW, MEDIUM, HIGH, CRITICAL)
+        control_tags: Filter by cited control tags (all must be present)
+        view: full keeps the legacy rows; slim carries only the system id, title and project
+        fields: Sparse fieldset of the slim row
         db: Database session
         current_user: Current authenticated user
         
     Returns:
         List[schemas.ThreatWithSystem]: Filtered list of threats with system information
+        (schemas.ThreatReportRow dicts with view=slim or fields)
     """
-    # Prepare standards list if provided
-    standards_list = None
-    if standards:
-        standards_list = [s.strip().upper() for s in standards.split(',')]
-    
-    # Validate inherit risk if provided
-    if inherit_risk:
-        valid_levels = ["LOW", "MEDIUM", "HIGH", "CRITICAL"]
-        if inherit_risk.upper() not in valid_levels:
-            raise HTTPException(
-                status_code=400, 
-                detail=f"Invalid inherit_risk. Must be one of: {', '.join(valid_levels)}"
-            )
-    
-    # Validate current risk if provided
-    if current_risk:
-        valid_levels = ["LOW", "MEDIUM", "HIGH", "CRITICAL"]
-        if current_risk.upper() not in valid_levels:
-            raise HTTPException(
-                status_code=400, 
-                detail=f"Invalid current_risk. Must be one of: {', '.join(valid_levels)}"
-            )
-    
-    # Use existing CRUD method for database-level filtering
-    threats = crud.get_all_threats(
-        db=db,
-        skip=skip,
-        limit=limit,
-        system_id=system_id,
-        standards=standards_list,
-        inherit_risk=inherit_risk.upper() if inherit_risk else None,
-        current_risk=current_risk.upper() if current_risk else None
+    row_fields = _report_row_fields(view, fields)
+    after = None
+    if cursor:
+        try:
+            after = crud.decode_threat_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    filters = _report_filters(standards, inherit_risk, current_risk, tag_filter, project_id)
+    body, headers = _report_page(db, filters, system_id, limit, skip, after, row_fields)
+    response = Response(content=body, media_type="application/json", headers=headers)
+    if estimate_total:
+        response.headers["X-Total-Count-Estimate"] = str(crud.estimate_threat_count(db, system_id, **filters))
+    return response
+
+@app.get(
+    "/report/export",
+    tags=["Reports"],
+    summary="Export Threat Report",
+    description="Stream every threat of the report as NDJSON, CSV, Parquet or Arrow IPC (no row cap)",
+    response_class=StreamingResponse,
+)
+async def export_threats_report(
+    format: str = Query("ndjson", description="Export format: ndjson, csv, parquet or arrow"),
+    standards: str = Query(None, description="Comma-separated list of standards (e.g., 'ASVS,MASVS,NIST')"),
+    system_id: str = Query(None, description="Filter by specific information system ID"),
+    project_id: str = Query(None, description="Filter by project ID (served from a snapshot)"),
+    inherit_risk: str = Query(None, description="Filter by inherent risk level: LOW, MEDIUM, HIGH, CRITICAL"),
+    current_risk: str = Query(None, description="Filter by current risk level considering remediations: LOW, MEDIUM, HIGH, CRITICAL"),
+    tag_filter: str = Query(None, alias="control_tags", description="Comma-separated control tags the threats must cite (e.g., 'V2.1.1 (ASVS),AUTH-1')"),
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_active_user)
+):
+    """
+    Stream the threat report (same filters and order as /report) for
+    full-portfolio audits. Threats are read from a server-side cursor in
+    batches and serialized row by row, so memory stays constant and the
+    download starts right away.
+
+    parquet and arrow (Arrow IPC file) are typed columnar files for
+    analytics: every OWASP factor and stored score as its own column and one
+    row per cited control tag, written in record batches.
+
+    A project export (project_id) is served from its snapshot file while
+    the project's data is unchanged, and rebuilt in the background after it
+    changes (see report_snapshots).
+
+    Args:
+        format: ndjson (one JSON object per line), csv, parquet or arrow
+        standards: Comma-separated list of security standards to filter by
+        system_id: Filter threats by specific information system
+        project_id: Filter threats by project
+        inherit_risk: Filter by inherent risk level (LOW, MEDIUM, HIGH, CRITICAL)
+        current_risk: Filter by current risk level considering remediations (LOW, MEDIUM, HIGH, CRITICAL)
+        control_tags: Filter by cited control tags (all must be present)
+        db: Database session
+        current_user: Current authenticated user
+
+    Returns:
+        StreamingResponse | FileResponse: The report as an attachment
+    """
+    import report_export
+
+    export_format = format.lower()
+    if export_format not in report_export.EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid format. Must be one of: {', '.join(report_export.EXPORT_FORMATS)}"
+        )
+    columnar = export_format in report_export.COLUMNAR_FORMATS
+    filters = _report_filters(standards, inherit_risk, current_risk, tag_filter, project_id)
+    serialize = {
+        "ndjson": report_export.iter_ndjson,
+        "csv": report_export.iter_csv,
+        "parquet": report_export.iter_parquet,
+        "arrow": report_export.iter_arrow,
+    }[export_format]
+    # Columnar formats read flat rows (no ORM objects), the text ones threats
+    read = crud.iter_report_rows if columnar else crud.iter_report_threats
+
+    def attachment():
+        filename = f"threat-report-{datetime.now(timezone.utc):%Y%m%d-%H%M%S}.{export_format}"
+        return {"Content-Disposition": f'attachment; filename="{filename}"'}
+
+    if filters["project_id"] is not None:
+        def build_body(snapshot_db):
+            rows = read(snapshot_db, system_id=system_id, **filters)
+            return report_export.EXPORT_FORMATS[export_format], attachment(), serialize(rows)
+
+        snapshot = _report_snapshot_response(db, filters, {
+            "endpoint": "export", "format": export_format, "system_id": system_id, **filters,
+        }, build_body)
+        if snapshot is not None:
+            return snapshot
+
+    def stream():
+        # Own session: the request's one is closed before the body is streamed
+        db = database.SessionLocal()
+        try:
+            yield from serialize(read(db, system_id=system_id, **filters))
+        finally:
+            db.close()
+
+    return StreamingResponse(
+        stream(),
+        media_type=report_export.EXPORT_FORMATS[export_format],
+        headers=attachment(),
     )
-    
-    return threats
+
+def _report_pdf_response(key: str, status_: str):
+    """The PDF when it is on disk, otherwise 202 pointing at the render to poll."""
+    import report_pdf
+
+    if status_ == "ready":
+        return FileResponse(
+            report_pdf.artifact_path(key),
+            media_type="application/pdf",
+            filename=f"threat-report-{key}.pdf",
+        )
+    return JSONResponse(
+        status_code=202,
+        content={"status": status_, "key": key},
+        headers={"Location": f"/report/pdf/{key}", "Retry-After": "2"},
+    )
+
+@app.get(
+    "/report/pdf",
+    tags=["Reports"],
+    summary="Threat Report PDF",
+    description="PDF of the threat report, rendered in the background and cached until the data changes",
+    responses={202: {"description": "Rendering; poll the Location URL"}},
+)
+async def get_threats_report_pdf(
+    standards: str = Query(None, description="Comma-separated list of standards (e.g., 'ASVS,MASVS,NIST')"),
+    system_id: str = Query(None, description="Filter by specific information system ID"),
+    project_id: str = Query(None, description="Filter by project ID"),
+    inherit_risk: str = Query(None, description="Filter by inherent risk level: LOW, MEDIUM, HIGH, CRITICAL"),
+    current_risk: str = Query(None, description="Filter by current risk level considering remediations: LOW, MEDIUM, HIGH, CRITICAL"),
+    tag_filter: str = Query(None, alias="control_tags", description="Comma-separated control tags the threats must cite (e.g., 'V2.1.1 (ASVS),AUTH-1')"),
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_active_user)
+):
+    """
+    Server-side PDF of the threat report (same filters as /report), with the
+    diagrams of the systems embedded from the diagrams/ store.
+
+    The file is keyed by the filter set and the data version (the project's
+    one with project_id): a repeated request answers with the file on disk
+    right away while nothing changed.
+    Otherwise the render is queued in a worker pool and the response is 202
+    with a Location to poll (GET /report/pdf/{key}).
+
+    Args:
+        standards: Comma-separated list of security standards to filter by
+        system_id: Filter threats by specific information system
+        project_id: Filter threats by project
+        inherit_risk: Filter by inherent risk level (LOW, MEDIUM, HIGH, CRITICAL)
+        current_risk: Filter by current risk level considering remediations (LOW, MEDIUM, HIGH, CRITICAL)
+        control_tags: Filter by cited control tags (all must be present)
+        db: Database session
+        current_user: Current authenticated user
+
+    Returns:
+        FileResponse | JSONResponse: The PDF, or 202 {status, key} while it renders
+    """
+    import report_pdf
+
+    filters = {"system_id": system_id, **_report_filters(standards, inherit_risk, current_risk, tag_filter, project_id)}
+    # A project report only goes stale when that project changes
+    scope = models.project_scope(filters["project_id"]) if filters["project_id"] else "global"
+    key = report_pdf.artifact_key(filters, crud.get_data_version(db, scope))
+    return _report_pdf_response(key, report_pdf.submit(key, filters))
+
+@app.get(
+    "/report/pdf/{key}",
+    tags=["Reports"],
+    summary="Threat Report PDF Status",
+    description="Download a rendered report PDF, or 202 while it is still rendering",
+    responses={202: {"description": "Still rendering"}},
+)
+async def get_threats_report_pdf_artifact(
+    key: str = Path(..., description="Key returned by /report/pdf"),
+    current_user: models.User = Depends(get_current_active_user)
+):
+    """Serve a rendered report PDF by key (from the Location of /report/pdf)."""
+    import report_pdf
+
+    status_ = report_pdf.job_status(key) if report_pdf.is_valid_key(key) else None
+    if status_ is None:
+        raise HTTPException(status_code=404, detail="Report PDF not found")
+    if status_ == "failed":
+        raise HTTPException(status_code=500, detail="Report PDF rendering failed")
+    return _report_pdf_response(key, status_)
 
 # =====================================================
 # SECURITY CONTROL TAGS ENDPOINTS
 # =====================================================
 
+# Read endpoints whose data only changes with the catalog answer with JSON
+# bytes serialized once per catalog version: (CATALOG_VERSION, key) -> (etag, body)
+_CATALOG_RESPONSES = {}
+_CATALOG_RESPONSES_MAX = 4096
+CATALOG_CACHE_CONTROL = "private, no-cache"  # Always revalidate: the catalog can change at runtime
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match check (weak comparison, as RFC 9110 requires for it)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (candidate.strip() for candidate in if_none_match.split(","))
+    return any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+def _catalog_json_response(request: Request, key: str, build) -> Response:
+    """
+    Pre-serialized, ETag-validated JSON response for catalog data.
+
+    Args:
+        request: Incoming request (If-None-Match)
+        key: Identifies the response within a catalog version
+        build: Callable returning the JSON payload (may raise HTTPException)
+
+    Returns:
+        Response: 200 with the cached body, or 304 if the client has it
+    """
+    import standards
+    version = standards.CATALOG_VERSION
+    cached = _CATALOG_RESPONSES.get((version, key))
+    if cached is None:
+        body = json.dumps(
+            jsonable_encoder(build()), ensure_ascii=False, allow_nan=False, separators=(",", ":")
+        ).encode("utf-8")
+        etag = f'"{version}-{hashlib.sha256(body).hexdigest()[:16]}"'
+        cached = (etag, body)
+        # All entries share one catalog version: those of a previous one are never asked for again
+        cached_version = next(iter(_CATALOG_RESPONSES), (version,))[0]
+        if cached_version != version or len(_CATALOG_RESPONSES) >= _CATALOG_RESPONSES_MAX:
+            _CATALOG_RESPONSES.clear()
+        _CATALOG_RESPONSES[(version, key)] = cached
+
+    etag, body = cached
+    headers = {"ETag": etag, "Cache-Control": CATALOG_CACHE_CONTROL}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
 @app.get(
     "/control-tags/standards",
     tags=["Control Tags"],
@@ -1181,12 +1674,14 @@ async def get_threats_report(
     description="Get list of all available security standards"
 )
 async def get_available_standards(
+    request: Request,
     current_user: models.User = Depends(get_current_active_user)
 ):
     """
     Get list of all available security standards.
     
     Args:
+        request: Incoming request (ETag validation)
         current_user: Current authenticated user
         
     Returns:
@@ -1194,11 +1689,15 @@ async def get_available_standards(
     """
     try:
         from standards import get_available_standards as get_standards
-        standards = get_standards()
-        return {
-            "standards": standards,
-            "total_standards": len(standards)
-        }
+
+        def build():
+            standards = get_standards()
+            return {
+                "standards": standards,
+                "total_standards": len(standards)
+            }
+
+        return _catalog_json_response(request, "standards", build)
     except Exception as e:
         raise HTTPException(
             status_code=500, 
@@ -1212,6 +1711,7 @@ async def get_available_standards(
     description="Get detailed information about a specific security standard"
 )
 async def get_standard_info(
+    request: Request,
     standard: str = Path(..., description="Standard name (e.g., ASVS, MASVS, NIST)"),
     current_user: models.User = Depends(get_current_active_user)
 ):
@@ -1219,6 +1719,7 @@ async def get_standard_info(
     Get detailed information about a specific security standard.
     
     Args:
+        request: Incoming request (ETag validation)
         standard: Name of the security standard
         current_user: Current authenticated user
         
@@ -1230,13 +1731,17 @@ async def get_standard_info(
     """
     try:
         from standards import get_standard_info as get_info
-        result = get_info(standard)
-        if result is None:
-            raise HTTPException(
-                status_code=404, 
-                detail=f"Standard '{standard}' not found"
-            )
-        return result
+
+        def build():
+            result = get_info(standard)
+            if result is None:
+                raise HTTPException(
+                    status_code=404, 
+                    detail=f"Standard '{standard}' not found"
+                )
+            return result
+
+        return _catalog_json_response(request, f"standard:{standard.upper()}", build)
     except HTTPException:
         raise
     except Exception as e:
@@ -1245,6 +1750,70 @@ async def get_standard_info(
             detail=f"Error getting standard info: {str(e)}"
         )
 
+@app.put(
+    "/control-tags/standards/{standard}",
+    response_model=schemas.CatalogStandardResponse,
+    tags=["Control Tags"],
+    summary="Add or Update Standard",
+    description="Add a standard or update its controls (admin). Every worker picks up the change without a restart."
+)
+def upsert_standard(
+    payload: schemas.CatalogStandardUpsert,
+    background_tasks: BackgroundTasks,
+    standard: str = Path(..., description="Standard name (e.g., ASVS, PCIDSS)"),
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(require_admin_user)
+):
+    """
+    Add or update a standard of the database-backed catalog.
+
+    The change is stored as a new catalog revision and installed right away
+    in this worker; the other workers install it on their next poll.
+
+    Args:
+        payload: Version, controls and replace/merge mode
+        background_tasks: Re-normalizes stored control tags afterwards
+        standard: Standard name
+        db: Database session
+        current_user: Current admin user
+
+    Returns:
+        CatalogStandardResponse: Standard, controls count, revision and catalog version
+
+    Raises:
+        HTTPException: 400 if the name or the controls are invalid
+    """
+    standard_name = standard.strip().upper()
+    if not _STANDARD_NAME_RE.match(standard_name):
+        raise HTTPException(status_code=400, detail="Standard name must be letters, digits or '_'")
+    if not payload.controls and payload.replace:
+        raise HTTPException(status_code=400, detail="A standard needs at least one control")
+    if any(not tag_id.strip() or tag_id != tag_id.strip() for tag_id in payload.controls):
+        raise HTTPException(status_code=400, detail="Tag IDs must be non-empty and without surrounding spaces")
+
+    revision = crud.upsert_catalog_standard(
+        db,
+        standard_name,
+        {tag_id: control.model_dump() for tag_id, control in payload.controls.items()},
+        version=payload.version,
+        replace=payload.replace,
+        created_by=current_user.id,
+    )
+    _sync_standards_catalog(db)
+    # Stored tags were normalized against the previous catalog
+    background_tasks.add_task(_renormalize_control_tags, revision)
+
+    # The request is pinned to the catalog it started with: answer from the new one
+    import standards
+    with standards.pinned_catalog(latest=True):
+        return schemas.CatalogStandardResponse(
+            standard=standard_name,
+            version=standards.STANDARDS_VERSIONS.get(standard_name),
+            controls_count=len(standards.STANDARDS_MAP.get(standard_name, {})),
+            revision=revision,
+            catalog_version=standards.CATALOG_VERSION,
+        )
+
 @app.get(
     "/control-tags/validate/{tag}",
     tags=["Control Tags"],
@@ -1302,13 +1871,9 @@ async def validate_control_tags_batch(
     try:
         from control_tags import validate_control_tag as validate_tag
         
-        results = []
-        for tag in tags:
-            is_valid = validate_tag(tag)
-            results.append({
-                "tag": tag,
-                "is_valid": is_valid
-            })
+        # Repeated tags are validated once
+        validity = {tag: validate_tag(tag) for tag in dict.fromkeys(tags)}
+        results = [{"tag": tag, "is_valid": validity[tag]} for tag in tags]
         
         return {
             "results": results,
@@ -1320,6 +1885,83 @@ async def validate_control_tags_batch(
             detail=f"Error validating tags: {str(e)}"
         )
 
+_NDJSON_CHUNK = 1000  # Tags per streamed chunk
+
+@app.post(
+    "/control-tags/normalize/batch",
+    tags=["Control Tags"],
+    summary="Normalize Control Tags in Bulk",
+    description="Deduplicate, validate and correct a large list of control tags in one pass. "
+                "Use format=ndjson (or Accept: application/x-ndjson) to stream one line per distinct tag."
+)
+def normalize_control_tags_batch(
+    request: Request,
+    tags: List[str] = Body(..., description="Control tags in any format (duplicates are processed once)"),
+    format: str = Query("json", pattern="^(json|ndjson)$", description="Response format"),
+    current_user: models.User = Depends(get_current_active_user)
+):
+    """
+    Normalize control tags in bulk (e.g. to clean up legacy remediations).
+
+    Every distinct tag goes through validate_and_correct_control_tags once
+    and is reported as valid, corrected, external (well-formed tag of a
+    known standard that is not in the catalog) or unknown (discarded).
+
+    Args:
+        request: Incoming request (Accept header)
+        tags: Control tags to normalize
+        format: 'json' (single document) or 'ndjson' (streamed lines)
+        current_user: Current authenticated user
+
+    Returns:
+        dict | StreamingResponse: Per-tag results plus corrections, categories
+        and unknown tags; as NDJSON, one line per distinct tag followed by a
+        {"summary": {...}} line
+    """
+    from standards import classify_control_tags
+
+    results = classify_control_tags(tags)
+    summary = {"total_submitted": len(tags), "total_unique": 0,
+               "valid": 0, "corrected": 0, "external": 0, "unknown": 0}
+
+    if format == "ndjson" or "application/x-ndjson" in request.headers.get("accept", ""):
+        def stream():
+            lines = []
+            for item in results:
+                summary["total_unique"] += 1
+                summary[item["status"]] += 1
+                lines.append(json.dumps(item, ensure_ascii=False))
+                if len(lines) >= _NDJSON_CHUNK:
+                    yield "\n".join(lines) + "\n"
+                    lines = []
+            lines.append(json.dumps({"summary": summary}))
+            yield "\n".join(lines) + "\n"
+
+        return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+    items = []
+    corrections = {}
+    categories = {}
+    unknown = []
+    for item in results:
+        items.append(item)
+        summary[item["status"]] += 1
+        if item["status"] == "unknown":
+            unknown.append(item["tag"])
+            continue
+        if item["status"] == "corrected":
+            corrections[item["tag"]] = item["normalized"]
+        categories.setdefault(item["standard"], {})[item["normalized"]] = None
+    summary["total_unique"] = len(items)
+
+    return {
+        "results": items,
+        "corrections": corrections,
+        "categories": {standard: list(normalized) for standard, normalized in categories.items()},
+        "unknown": unknown,
+        "summary": summary
+    }
+
 @app.get(
     "/control-tags/search",
     tags=["Control Tags"],
@@ -1329,6 +1971,8 @@ async def validate_control_tags_batch(
 async def search_control_tags(
     query: str = Query("", min_length=0, description="Search query"),
     limit: int = Query(50, ge=1, le=500, description="Maximum number of results"),
+    mode: str = Query("search", pattern="^(search|autocomplete)$",
+                      description="'autocomplete': prefix match on tag IDs and title words, accent and typo tolerant"),
     current_user: models.User = Depends(get_current_active_user)
 ):
     """
@@ -1337,12 +1981,34 @@ async def search_control_tags(
     Args:
         query: Search query string (empty string returns all tags)
         limit: Maximum number of results to return
+        mode: 'search' (substring search) or 'autocomplete' (tag picker, per keystroke)
         current_user: Current authenticated user
         
     Returns:
         dict: Search results with matching tags
     """
     try:
+        if mode == "autocomplete" and query.strip():
+            from standards import autocomplete_tags, TAG_RECORDS
+            search_results = []
+            detailed_results = []
+            for tag_id in autocomplete_tags(query, limit=limit):
+                record = TAG_RECORDS[tag_id]
+                search_results.append(record.tag)
+                detailed_results.append({
+                    "tag": tag_id,
+                    "title": record.title,
+                    "description": record.description,
+                    "category": record.category,
+                    "standard": record.standard
+                })
+            return {
+                "query": query,
+                "results": search_results,
+                "detailed_results": detailed_results,
+                "total": len(search_results)
+            }
+
         # Handle empty query by returning all tags
         if not query or query.strip() == "":
             from control_tags import get_all_predefined_tags
@@ -1450,6 +2116,7 @@ async def search_control_tags(
     description="Get detailed information about a specific control tag"
 )
 async def get_control_tag_details(
+    request: Request,
     tag: str = Path(..., description="Control tag identifier"),
     current_user: models.User = Depends(get_current_active_user)
 ):
@@ -1457,6 +2124,7 @@ async def get_control_tag_details(
     Get detailed information about a specific control tag.
     
     Args:
+        request: Incoming request (ETag validation)
         tag: Control tag identifier
         current_user: Current authenticated user
         
@@ -1467,16 +2135,18 @@ async def get_control_tag_details(
         HTTPException: 404 if tag not found
     """
     try:
-        from standards import get_tag_details
-        
-        details = get_tag_details(tag)
-        if details is None:
-            raise HTTPException(
-                status_code=404, 
-                detail=f"Control tag '{tag}' not found"
-            )
-        
-        return details
+        from standards import get_tag_details, normalize_tag_for_lookup
+
+        def build():
+            details = get_tag_details(tag)
+            if details is None:
+                raise HTTPException(
+                    status_code=404, 
+                    detail=f"Control tag '{tag}' not found"
+                )
+            return details
+
+        return _catalog_json_response(request, f"details:{normalize_tag_for_lookup(tag)}", build)
     except HTTPException:
         raise
     except Exception as e:
@@ -1485,6 +2155,67 @@ async def get_control_tag_details(
             detail=f"Error getting tag details: {str(e)}"
         )
 
+@app.get(
+    "/control-tags/{tag}/crosswalk",
+    tags=["Control Tags"],
+    summary="Get Control Tag Crosswalk",
+    description="Equivalent controls of other standards (ASVS, NIST, ISO27001, MASVS, SBS) for a control tag"
+)
+async def get_control_tag_crosswalk(
+    request: Request,
+    tag: str = Path(..., description="Control tag identifier"),
+    standards: str = Query(None, description="Comma-separated list of target standards (default: all)"),
+    current_user: models.User = Depends(get_current_active_user)
+):
+    """
+    Get the controls of other standards that the given control maps to.
+
+    Args:
+        request: Incoming request (ETag validation)
+        tag: Control tag identifier
+        standards: Comma-separated list of target standards
+        current_user: Current authenticated user
+
+    Returns:
+        dict: Tag, its standard and the related controls grouped by standard
+
+    Raises:
+        HTTPException: 404 if tag not found
+    """
+    try:
+        from standards import TAG_RECORDS, get_crosswalk, normalize_tag_for_lookup
+
+        tag_id = normalize_tag_for_lookup(tag)
+        standards_list = sorted({s.strip().upper() for s in standards.split(',') if s.strip()}) if standards else None
+
+        def build():
+            record = TAG_RECORDS.get(tag_id)
+            if record is None:
+                raise HTTPException(
+                    status_code=404,
+                    detail=f"Control tag '{tag}' not found"
+                )
+            crosswalk = {
+                standard_name: [TAG_RECORDS[related]._asdict() for related in related_ids]
+                for standard_name, related_ids in get_crosswalk(tag_id, standards_list).items()
+            }
+            return {
+                "tag": record.tag_id,
+                "standard": record.standard,
+                "crosswalk": crosswalk,
+                "total": sum(len(related) for related in crosswalk.values())
+            }
+
+        key = f"crosswalk:{tag_id}:{','.join(standards_list or [])}"
+        return _catalog_json_response(request, key, build)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error getting tag crosswalk: {str(e)}"
+        )
+
 @app.get(
     "/control-tags/predefined",
     tags=["Control Tags"],
@@ -1492,12 +2223,14 @@ async def get_control_tag_details(
     description="Get list of all predefined control tags across all standards"
 )
 async def get_predefined_control_tags(
+    request: Request,
     current_user: models.User = Depends(get_current_active_user)
 ):
     """
     Get list of all predefined control tags across all standards.
     
     Args:
+        request: Incoming request (ETag validation)
         current_user: Current authenticated user
         
     Returns:
@@ -1505,13 +2238,15 @@ async def get_predefined_control_tags(
     """
     try:
         from control_tags import get_all_predefined_tags
-        
-        tags = get_all_predefined_tags()
-        
-        return {
-            "tags": tags,
-            "total": len(tags)
-        }
+
+        def build():
+            tags = get_all_predefined_tags()
+            return {
+                "tags": tags,
+                "total": len(tags)
+            }
+
+        return _catalog_json_response(request, "predefined", build)
     except Exception as e:
         raise HTTPException(
             status_code=500, 
@@ -1560,6 +2295,7 @@ async def categorize_control_tags(
     description="Get control tag suggestions for a specific STRIDE threat category"
 )
 async def get_stride_control_suggestions(
+    request: Request,
     stride_category: str = Path(..., description="STRIDE category (e.g., Spoofing, Tampering)"),
     current_user: models.User = Depends(get_current_active_user)
 ):
@@ -1567,6 +2303,7 @@ async def get_stride_control_suggestions(
     Get control tag suggestions for a specific STRIDE threat category.
     
     Args:
+        request: Incoming request (ETag validation)
         stride_category: STRIDE threat category
         current_user: Current authenticated user
         
@@ -1590,30 +2327,33 @@ async def get_stride_control_suggestions(
                 "message": f"Invalid STRIDE category. Valid categories: {', '.join(valid_categories)}"
             }
         
-        try:
-            from control_tags import get_suggested_tags_for_stride
-            suggestions = get_suggested_tags_for_stride(normalized_category)
-        except ImportError:
-            # Fallback with empty suggestions if function doesn't exist
-            suggestions = []
-        
-        # Separar tags formateados de información detallada para compatibilidad con frontend
-        suggested_tags = []
-        detailed_suggestions = []
-        
-        for item in suggestions:
-            if isinstance(item, dict):
-                suggested_tags.append(item.get('tag', ''))
-                detailed_suggestions.append(item)
-            else:
-                # Compatibilidad con formato anterior
-                suggested_tags.append(str(item))
-        
-        return {
-            "stride_category": normalized_category,
-            "suggested_tags": suggested_tags,
-            "detailed_suggestions": detailed_suggestions
-        }
+        def build():
+            try:
+                from control_tags import get_suggested_tags_for_stride
+                suggestions = get_suggested_tags_for_stride(normalized_category)
+            except ImportError:
+                # Fallback with empty suggestions if function doesn't exist
+                suggestions = []
+            
+            # Separar tags formateados de información detallada para compatibilidad con frontend
+            suggested_tags = []
+            detailed_suggestions = []
+            
+            for item in suggestions:
+                if isinstance(item, dict):
+                    suggested_tags.append(item.get('tag', ''))
+                    detailed_suggestions.append(item)
+                else:
+                    # Compatibilidad con formato anterior
+                    suggested_tags.append(str(item))
+            
+            return {
+                "stride_category": normalized_category,
+                "suggested_tags": suggested_tags,
+                "detailed_suggestions": detailed_suggestions
+            }
+
+        return _catalog_json_response(request, f"suggestions:{normalized_category}", build)
     except Exception as e:
         # Return 500 only for actual server errors
         raise HTTPException(
@@ -1946,6 +2686,117 @@ async def internal_error_handler(request, exc):
         content={"detail": "Internal server error"}
     )
 
+# =====================================================
+# GAP ANALYSIS ENDPOINTS
+# =====================================================
+
+def _gap_analysis_standards(standards: Optional[str]) -> list:
+    """Standards requested for a gap analysis (all catalog standards by default)."""
+    from standards import get_available_standards
+    available = get_available_standards()
+    if not standards:
+        return available
+    requested = list(dict.fromkeys(s.strip().upper() for s in standards.split(',') if s.strip()))
+    unknown = [s for s in requested if s not in available]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown standards: {', '.join(unknown)}. Available: {', '.join(available)}"
+        )
+    return requested or available
+
+@app.get(
+    "/projects/{project_id}/gap-analysis",
+    response_model=schemas.GapAnalysis,
+    tags=["Projects"],
+    summary="Project Compliance Gap Analysis",
+    description="Catalog controls not covered by any remediation of the project, overall and per system",
+)
+async def get_project_gap_analysis(
+    project_id: str = Path(..., description="Project UUID"),
+    standards: str = Query(None, description="Comma-separated list of standards (default: all)"),
+    crosswalk: bool = Query(False, description="Also cover the equivalent controls of other standards"),
+    include_systems: bool = Query(True, description="Include per-system coverage counts"),
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_active_user),
+):
+    """
+    Gap analysis of a project: for each standard, the controls no remediation
+    covers (uncovered) and those covered only by open remediations (pending).
+
+    Args:
+        project_id: Project UUID
+        standards: Comma-separated list of standards
+        crosswalk: Count controls reached through the crosswalk as covered
+        include_systems: Include per-system coverage counts
+        db: Database session
+        current_user: Current authenticated user
+
+    Returns:
+        schemas.GapAnalysis: Project coverage and gaps per standard
+    """
+    import gap_analysis
+    from standards import CATALOG_VERSION
+
+    pid = validate_uuid(project_id, "project ID")
+    if crud.get_project(db, project_id=pid) is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    standard_names = _gap_analysis_standards(standards)
+
+    rows = crud.get_remediation_tags_by_system(db, project_id=pid)
+    systems = gap_analysis.system_bitsets(rows, crosswalk=crosswalk)
+    return schemas.GapAnalysis(
+        project_id=pid,
+        catalog_version=CATALOG_VERSION,
+        crosswalk=crosswalk,
+        **gap_analysis.gap_analysis(systems, standard_names, include_systems=include_systems),
+    )
+
+@app.get(
+    "/information_systems/{information_system_id}/gap-analysis",
+    response_model=schemas.GapAnalysis,
+    tags=["Information Systems"],
+    summary="System Compliance Gap Analysis",
+    description="Catalog controls not covered by any remediation of an information system",
+)
+async def get_information_system_gap_analysis(
+    information_system_id: str = Path(..., description="Information system UUID"),
+    standards: str = Query(None, description="Comma-separated list of standards (default: all)"),
+    crosswalk: bool = Query(False, description="Also cover the equivalent controls of other standards"),
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_active_user),
+):
+    """
+    Gap analysis of a single information system.
+
+    Args:
+        information_system_id: Information system UUID
+        standards: Comma-separated list of standards
+        crosswalk: Count controls reached through the crosswalk as covered
+        db: Database session
+        current_user: Current authenticated user
+
+    Returns:
+        schemas.GapAnalysis: System coverage and gaps per standard
+    """
+    import gap_analysis
+    from standards import CATALOG_VERSION
+
+    system_id = validate_uuid(information_system_id, "information system ID")
+    standard_names = _gap_analysis_standards(standards)
+    rows = crud.get_remediation_tags_by_system(db, information_system_id=system_id)
+    if not rows:
+        raise HTTPException(status_code=404, detail="Information system not found")
+
+    systems = gap_analysis.system_bitsets(rows, crosswalk=crosswalk)
+    return schemas.GapAnalysis(
+        information_system_id=system_id,
+        catalog_version=CATALOG_VERSION,
+        crosswalk=crosswalk,
+        **gap_analysis.gap_analysis(systems, standard_names, include_systems=False),
+    )
+
+
 # =====================================================
 # DASHBOARD ENDPOINTS
 # =====================================================
@@ -1959,6 +2810,7 @@ async def internal_error_handler(request, exc):
 )
 async def get_dashboard_stats(
     project_id: Optional[str] = Query(None, description="Filter all stats to a single project UUID"),
+    crosswalk: bool = Query(False, description="Also count the standards reached through the control crosswalk"),
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_active_user),
 ):
@@ -1967,7 +2819,9 @@ async def get_dashboard_stats(
     1. Load InformationSystem objects with eager-loaded threats → risk + remediation
     2. KPI aggregation: threats_by_level and remediation_rate
     3. Top-5 systems sorted by (CRITICAL+HIGH) desc, total_threats desc
-    4. Standards coverage: prefix-based tag matching per standard
+    4. Standards coverage: prefix-based tag matching per standard; with
+       crosswalk=true a threat also covers the standards its tags map to
+       (e.g. an ASVS-tagged remediation counts for NIST and ISO27001)
     """
     # Validate project_id and verify it exists
     filter_project_id = None
@@ -2047,7 +2901,7 @@ async def get_dashboard_stats(
         top_projects = proj_list[:5]
 
     # Pass 4: Standards coverage (via STANDARDS_MAP lookup)
-    from standards import get_standard_from_tag_id, normalize_tag_for_lookup
+    from standards import get_standard_from_tag_id, normalize_tag_for_lookup, crosswalk_standards
     import re as _re
     _tag_suffix_re = _re.compile(r'\(([^)]+)\)\s*$')
     TRACKED_STANDARDS = ["NIST", "ISO27001", "ASVS", "MASVS", "SBS"]
@@ -2069,6 +2923,8 @@ async def get_dashboard_stats(
                     std = get_standard_from_tag_id(normalize_tag_for_lookup(tag))
                     if std in TRACKED_STANDARDS:
                         matched_stds.add(std)
+            if crosswalk:
+                matched_stds.update(s for s in crosswalk_standards(tags) if s in TRACKED_STANDARDS)
             is_remediated = bool(threat.remediation and threat.remediation.status)
             for std in matched_stds:
                 counts[std] += 1
@@ -2087,6 +2943,7 @@ async def get_dashboard_stats(
         standards_coverage=schemas.StandardsCoverage(**coverage),
         standards_remediation=schemas.StandardsRemediation(**remediation_by_std),
         filtered_by_project=str(filter_project_id) if filter_project_id else None,
+        crosswalk=crosswalk,
     )
 
 
@@ -2094,6 +2951,72 @@ async def get_dashboard_stats(
 # APPLICATION STARTUP
 # =====================================================
 
+def _renormalize_control_tags(revision: Optional[int] = None):
+    """
+    Background job: re-normalizes remediations with a stale control_tags_version.
+
+    With a database catalog, the job belongs to its revision: whichever worker
+    claims it runs it once, against that revision only (it must be installed here).
+    """
+    if revision is not None and revision != _loaded_catalog_revision:
+        return
+    db = database.SessionLocal()
+    try:
+        if revision is None:
+            updated = crud.renormalize_stale_remediations(db)
+        else:
+            updated = crud.renormalize_catalog_revision(db, revision)
+        if updated:
+            print(f"🏷️  Re-normalized control tags of {updated} remediation(s)")
+    except Exception as e:
+        print(f"⚠️  Control tag re-normalization failed: {e}")
+    finally:
+        db.close()
+
+# Standard names become module-level names (e.g. ASVS_CONTROLS)
+_STANDARD_NAME_RE = re.compile(r'^[A-Z][A-Z0-9_]*$')
+
+# Polling interval of the database-backed standards catalog (seconds)
+CATALOG_POLL_SECONDS = float(os.getenv("TZU_CATALOG_POLL_SECONDS", "15"))
+_catalog_sync_lock = threading.Lock()
+_loaded_catalog_revision = None
+
+def _sync_standards_catalog(db: Session) -> Optional[int]:
+    """
+    Installs the catalog stored in the database if its revision changed
+    since the last sync of this worker.
+
+    Returns:
+        int | None: The installed revision, or None if nothing changed
+    """
+    global _loaded_catalog_revision
+    with _catalog_sync_lock:
+        revision = crud.get_catalog_revision(db)
+        if revision is None or revision == _loaded_catalog_revision:
+            return None
+        revision, standards_map, standards_versions = crud.get_standards_catalog(db)
+        from standards import install_catalog, autocomplete_tags
+        catalog_version = install_catalog(standards_map, standards_versions)
+        autocomplete_tags("a")  # Builds the autocomplete index before the first keystroke
+        _loaded_catalog_revision = revision
+    print(f"📚 Standards catalog revision {revision} installed (version {catalog_version})")
+    return revision
+
+def _watch_standards_catalog():
+    """Background job: picks up catalog changes made through any worker."""
+    while True:
+        time.sleep(CATALOG_POLL_SECONDS)
+        db = database.SessionLocal()
+        try:
+            _sync_standards_catalog(db)
+        except Exception as e:
+            print(f"⚠️  Standards catalog sync failed: {e}")
+        finally:
+            db.close()
+        # Takes over the re-normalization of a worker that died with the claim
+        if _loaded_catalog_revision is not None:
+            _renormalize_control_tags(_loaded_catalog_revision)
+
 @app.on_event("startup")
 async def startup_event():
     """Initialize application on startup"""
@@ -2105,6 +3028,19 @@ async def startup_event():
         print("✅ Database initialized successfully")
     except Exception as e:
         print(f"❌ Database initialization failed: {e}")
+
+    # Standards catalog: the database is the source of truth once seeded
+    db = database.SessionLocal()
+    try:
+        _sync_standards_catalog(db)
+    except Exception as e:
+        print(f"⚠️  Using the built-in standards catalog: {e}")
+    finally:
+        db.close()
+    threading.Thread(target=_watch_standards_catalog, daemon=True).start()
+
+    # Re-normalize control tags stored against an older catalog (non-blocking)
+    threading.Thread(target=_renormalize_control_tags, args=(_loaded_catalog_revision,), daemon=True).start()
     
     print("🎯 TZU API Ready!")
 
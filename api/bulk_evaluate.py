@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Offline bulk evaluation of diagram directories.
+
+Walks a directory of diagrams / descriptions, runs the same STRIDE analysis as
+the /evaluate endpoint and stores the resulting threat models either in the
+database (one information system per file) or as JSON files.
+
+Progress is recorded in a state file, so an interrupted run can simply be
+started again with the same arguments: files already processed (same path and
+same content hash) are skipped.
+
+Usage:
+    python bulk_evaluate.py ./diagrams-to-review --workers 4 --output json --out-dir results
+    python bulk_evaluate.py ./diagrams-to-review --output db --project-id <uuid> --user admin
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from types import SimpleNamespace
+
+import utils
+from tzu_ai import clientAI
+
+STATE_FILE_NAME = ".tzu_bulk_state.jsonl"
+
+
+class _LocalUpload:
+    """Minimal stand-in for fastapi.UploadFile accepted by utils.process_file."""
+
+    def __init__(self, filename, raw_bytes):
+        self.filename = filename
+        self.file = io.BytesIO(raw_bytes)
+
+
+def discover_files(input_dir):
+    """Returns supported files under input_dir (recursive), in a stable order."""
+    root = Path(input_dir)
+    return sorted(
+        p for p in root.rglob("*")
+        if p.is_file() and p.suffix.lower() in utils.ALLOWED_EXTENSIONS
+        and p.name != STATE_FILE_NAME
+    )
+
+
+def file_digest(raw_bytes):
+    return hashlib.sha256(raw_bytes).hexdigest()
+
+
+def load_state(state_path):
+    """Reads the completed-file ledger: {relative_path: sha256}."""
+    done = {}
+    if not os.path.exists(state_path):
+        return done
+    with open(state_path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                # A partially written last line from an interrupted run
+                continue
+            if entry.get("status") == "ok":
+                done[entry["file"]] = entry["sha256"]
+    return done
+
+
+def _to_plain(value):
+    """Converts the SimpleNamespace tree returned by clientAI into JSON-able data."""
+    if isinstance(value, SimpleNamespace):
+        return {k: _to_plain(v) for k, v in vars(value).items()}
+    if isinstance(value, list):
+        return [_to_plain(v) for v in value]
+    return value
+
+
+class BulkEvaluator:
+    def __init__(self, input_dir, output, out_dir=None, project_id=None, username=None, state_path=None):
+        self.input_dir = Path(input_dir)
+        self.output = output
+        self.out_dir = Path(out_dir) if out_dir else None
+        self.project_id = project_id
+        self.username = username
+        self.state_path = state_path or str(
+            (self.out_dir or self.input_dir) / STATE_FILE_NAME
+        )
+        self._state_lock = threading.Lock()
+        self._created_by = None
+        if self.out_dir:
+            self.out_dir.mkdir(parents=True, exist_ok=True)
+
+        if self.output == "db":
+            # Imported lazily: JSON mode must work without DATABASE_URL
+            import crud
+            import database
+            self.crud = crud
+            self.SessionLocal = database.SessionLocal
+            if self.username:
+                db = self.SessionLocal()
+                try:
+                    user = crud.get_user_by_username(db, self.username)
+                    if user is None:
+                        raise ValueError(f"User '{self.username}' not found")
+                    self._created_by = user.id
+                finally:
+                    db.close()
+
+    def _record(self, entry):
+        with self._state_lock:
+            with open(self.state_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    def _store_db(self, relative, content_type, saved_filename, result):
+        import schemas
+        db = self.SessionLocal()
+        try:
+            system = self.crud.create_information_system(
+                db,
+                schemas.InformationSystemCreate(
+                    title=Path(relative).stem,
+                    description=f"Bulk evaluation of {relative}",
+                    project_id=self.project_id,
+                ),
+                created_by=self._created_by,
+            )
+            self.crud.attach_diagram(db, str(system.id), saved_filename, input_type=content_type)
+            created, _ = self.crud.create_threats_from_analysis(
+                db, system.id, result.threats, created_by=self._created_by
+            )
+            return {"information_system_id": str(system.id), "threats": created}
+        finally:
+            db.close()
+
+    def _store_json(self, relative, content_type, saved_filename, result):
+        target = self.out_dir / f"{relative}.json"
+        target.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "source": relative,
+            "content_type": content_type,
+            "diagram": saved_filename,
+            "threats": _to_plain(result.threats),
+        }
+        tmp = target.with_suffix(target.suffix + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, target)
+        return {"json": str(target), "threats": len(result.threats)}
+
+    def evaluate_file(self, path, digest):
+        relative = path.relative_to(self.input_dir).as_posix()
+        raw_bytes = path.read_bytes()
+        # JSON mode keeps the diagram copies next to its results, not in the API's diagram store
+        diagrams_dir = "diagrams" if self.output == "db" else str(self.out_dir / "diagrams")
+        content, content_type, saved_filename = utils.process_file(_LocalUpload(path.name, raw_bytes), diagrams_dir)
+        if not content:
+            raise ValueError("No se pudo extraer contenido del archivo")
+        result = clientAI(content, content_type)
+        if self.output == "db":
+            stored = self._store_db(relative, content_type, saved_filename, result)
+        else:
+            stored = self._store_json(relative, content_type, saved_filename, result)
+        self._record({"file": relative, "sha256": digest, "status": "ok", **stored})
+        return relative, stored
+
+    def run(self, workers=4):
+        done = load_state(self.state_path)
+        pending = []
+        skipped = 0
+        for path in discover_files(self.input_dir):
+            digest = file_digest(path.read_bytes())
+            relative = path.relative_to(self.input_dir).as_posix()
+            if done.get(relative) == digest:
+                skipped += 1
+                continue
+            pending.append((path, digest))
+
+        print(f"🔎 {len(pending)} file(s) to evaluate, {skipped} already done")
+        failures = 0
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            futures = {pool.submit(self.evaluate_file, *item): item[0] for item in pending}
+            for future in as_completed(futures):
+                path = futures[future]
+                try:
+                    relative, stored = future.result()
+                    print(f"✅ {relative}: {stored['threats']} threats")
+                except Exception as e:
+                    failures += 1
+                    relative = path.relative_to(self.input_dir).as_posix()
+                    self._record({"file": relative, "status": "error", "error": str(e)})
+                    print(f"❌ {relative}: {e}")
+
+        print(f"\n🎯 Completed: {len(pending) - failures} evaluated, {skipped} skipped, {failures} failed")
+        return failures
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk STRIDE evaluation of a directory of diagrams")
+    parser.add_argument("input_dir", help="Directory with diagrams / descriptions")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent evaluations (default: 4)")
+    parser.add_argument("--output", choices=["db", "json"], default="json",
+                        help="Store results in the database or as JSON files (default: json)")
+    parser.add_argument("--out-dir", help="Directory for JSON results (json output)")
+    parser.add_argument("--project-id", help="Project UUID for created information systems (db output)")
+    parser.add_argument("--user", help="Username the created resources are attributed to (db output)")
+    parser.add_argument("--state-file", help=f"Resume ledger (default: <out-dir or input_dir>/{STATE_FILE_NAME})")
+    args = parser.parse_args(argv)
+    if args.output == "json" and not args.out_dir:
+        parser.error("--out-dir is required with --output json")
+    if not os.path.isdir(args.input_dir):
+        parser.error(f"{args.input_dir} is not a directory")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    project_id = None
+    if args.project_id:
+        from uuid import UUID
+        project_id = UUID(args.project_id)
+    evaluator = BulkEvaluator(
+        args.input_dir,
+        args.output,
+        out_dir=args.out_dir,
+        project_id=project_id,
+        username=args.user,
+        state_path=args.state_file,
+    )
+    failures = evaluator.run(workers=args.workers)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,11 @@
 from uuid import UUID
+import base64
 import json
+import re
 import models
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import or_, text
+from sqlalchemy.orm import Session, aliased, joinedload
+from sqlalchemy import and_, func, or_, select, text
+from sqlalchemy.exc import IntegrityError
 from passlib.context import CryptContext
 from datetime import datetime, timedelta
 import jwt
@@ -12,15 +15,93 @@ import schemas
 
 # Import STRIDE normalization function
 from stride_validator import normalize_stride_category
+from section_diff import threat_signature
 
-def get_all_threats(db: Session, skip: int = 0, limit: int = 100, system_id: Optional[str] = None, standards: Optional[list] = None, inherit_risk: Optional[str] = None, current_risk: Optional[str] = None):
-    """Gets all threats with optional filters"""
+def encode_threat_cursor(threat) -> str:
+    """Opaque keyset cursor pointing after threat: (created_at, id) in URL-safe base64."""
+    payload = json.dumps([threat.created_at.isoformat(), str(threat.id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_threat_cursor(cursor: str) -> tuple:
+    """
+    Decodes a cursor made by encode_threat_cursor.
+
+    Returns:
+        tuple: (created_at, threat id)
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, threat_id = json.loads(payload)
+        return datetime.fromisoformat(created_at), UUID(threat_id)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+
+def _threats_after(query, cursor: tuple):
+    """Keyset condition for ORDER BY created_at DESC, id DESC (uses ix_threats_created_at_id)."""
+    created_at, threat_id = cursor
+    return query.filter(or_(
+        models.Threat.created_at < created_at,
+        and_(models.Threat.created_at == created_at, models.Threat.id < threat_id),
+    ))
+
+def get_data_version(db: Session, scope: str = "global") -> int:
+    """
+    Current write counter of the report data (see models.DataVersion); 0 before any write.
+    The 'global' scope sums every project's counter.
+    """
+    query = db.query(func.sum(models.DataVersion.version))
+    if scope != "global":
+        query = query.filter(models.DataVersion.scope == scope)
+    return query.scalar() or 0
+
+# Filtered report totals are counted exactly up to this many threats
+REPORT_COUNT_ESTIMATE_CAP = 10000
+
+def estimate_threat_count(db: Session, system_id: Optional[str] = None, **filters) -> int:
+    """
+    Approximate number of threats of the report.
+
+    Unfiltered, it reads the table size without scanning it: the planner
+    statistics on PostgreSQL, an exact count elsewhere (or before the first
+    ANALYZE). With filters (the _threats_report_query ones), it counts the
+    filtered threats, stopping at REPORT_COUNT_ESTIMATE_CAP.
+    """
+    if system_id is None and not any(filters.values()):
+        if db.bind.dialect.name == "postgresql":
+            estimate = db.execute(
+                text("SELECT reltuples::bigint FROM pg_class WHERE oid = 'threats'::regclass")
+            ).scalar()
+            if estimate is not None and estimate >= 0:
+                return int(estimate)
+        return db.query(func.count(models.Threat.id)).scalar()
+
+    query = _threats_report_query(db, system_id, columns=[models.Threat.id], **filters)
+    if query is None:
+        return 0
+    capped = query.order_by(None).limit(REPORT_COUNT_ESTIMATE_CAP).subquery()
+    return db.query(func.count()).select_from(capped).scalar()
+
+RISK_LEVELS = ("LOW", "MEDIUM", "HIGH", "CRITICAL")
+
+def _threats_report_query(db: Session, system_id: Optional[str] = None, standards: Optional[list] = None, inherit_risk: Optional[str] = None, current_risk: Optional[str] = None, control_tags: Optional[list] = None, project_id: Optional[UUID] = None, columns: Optional[list] = None):
+    """
+    Filtered threats of the report, newest first (None if system_id is not a UUID).
+    standards keeps threats citing every listed standard; control_tags
+    ((standard, tag_id) pairs) keeps threats citing every listed control.
+    With columns, the query selects those columns instead of Threat objects.
+    """
     
-    query = db.query(models.Threat).options(
-        joinedload(models.Threat.risk),
-        joinedload(models.Threat.remediation),
-        joinedload(models.Threat.information_system)
-    )
+    if columns is not None:
+        query = db.query(*columns).select_from(models.Threat)
+    else:
+        query = db.query(models.Threat).options(
+            joinedload(models.Threat.risk),
+            joinedload(models.Threat.remediation),
+            joinedload(models.Threat.information_system).joinedload(models.InformationSystem.project)
+        )
     
     # Exclude threats from archived systems
     query = query.join(models.InformationSystem).filter(models.InformationSystem.archived == False)
@@ -30,61 +111,116 @@ def get_all_threats(db: Session, skip: int = 0, limit: int = 100, system_id: Opt
         try:
             query = query.filter(models.Threat.information_system_id == UUID(system_id))
         except ValueError:
-            return []
+            return None
+
+    if project_id is not None:
+        query = query.filter(models.InformationSystem.project_id == project_id)
     
-        # Filtro por riesgo inherente
+    # Filtro por riesgo inherente (nivel almacenado en risks, indexado)
     if inherit_risk:
-        query = query.join(models.Risk).filter(models.Risk.inherit_risk == inherit_risk)
+        query = query.join(models.Risk).filter(models.Risk.inherent_level == inherit_risk)
     
-    # Filtro por riesgo actual (considerando estado de remediación)
+    # Filtro por riesgo actual (considerando estado de remediación): columna almacenada e indexada
     if current_risk:
-        from sqlalchemy import case, and_
-        
-        # Unir con Risk y Remediation si no se han unido ya
-        if not inherit_risk:
-            query = query.join(models.Risk)
-        query = query.join(models.Remediation)
-        
-        # Crear lógica condicional para riesgo actual:
-        # Si remediation.status = True Y residual_risk no es NULL, usar residual_risk
-        # Sino, usar inherit_risk
-        current_risk_expression = case(
-            (
-                and_(
-                    models.Remediation.status == True,
-                    models.Risk.residual_risk.isnot(None)
-                ),
-                case(
-                    (models.Risk.residual_risk < 3, "LOW"),
-                    (models.Risk.residual_risk < 6, "MEDIUM"),
-                    (models.Risk.residual_risk < 9, "HIGH"),
-                    else_="CRITICAL"
-                )
-            ),
-            else_=models.Risk.inherit_risk
-        )
-        
-        query = query.filter(current_risk_expression == current_risk)
+        query = query.filter(models.Threat.current_level == current_risk)
     
-    # Filtro por estándares - usando SQL directo para JSON
-    if standards and len(standards) > 0:
-        # Usar la lógica SQL que funciona correctamente
-        for standard in standards:
-            condition = text("""
-                EXISTS (
-                    SELECT 1 FROM remediations r 
-                    CROSS JOIN LATERAL json_array_elements_text(r.control_tags::json) AS tag
-                    WHERE r.id = threats.remediation_id 
-                    AND tag LIKE :pattern
-                )
-            """).params(pattern=f'%({standard})')
-            
-            query = query.filter(condition)
-    
-    # Get threats ordered by ID (newest first, assuming UUIDs are generated chronologically)
-    threats = query.order_by(models.Threat.id.desc()).offset(skip).limit(limit).all()
+    # Filtro por estándares y tags: EXISTS sobre remediation_control_tags (índices, cualquier motor)
+    tag_table = models.RemediationControlTag
+    for standard in standards or []:
+        query = query.filter(
+            select(tag_table.remediation_id).where(
+                tag_table.remediation_id == models.Threat.remediation_id,
+                tag_table.standard == standard,
+            ).exists()
+        )
+    for standard, tag_id in control_tags or []:
+        query = query.filter(
+            select(tag_table.remediation_id).where(
+                tag_table.remediation_id == models.Threat.remediation_id,
+                tag_table.standard == standard,
+                tag_table.tag_id == tag_id,
+            ).exists()
+        )
     
-    return threats
+    # Newest first; id breaks ties between threats created in the same batch
+    return query.order_by(models.Threat.created_at.desc(), models.Threat.id.desc())
+
+def get_all_threats(db: Session, skip: int = 0, limit: int = 100, system_id: Optional[str] = None, standards: Optional[list] = None, inherit_risk: Optional[str] = None, current_risk: Optional[str] = None, control_tags: Optional[list] = None, project_id: Optional[UUID] = None, cursor: Optional[tuple] = None):
+    """
+    Gets all threats with optional filters, newest first.
+
+    Pages with cursor (the (created_at, id) of the last threat of the previous
+    page, see decode_threat_cursor) cost the same at any depth; skip is kept
+    for compatibility and still scans the skipped rows.
+    """
+    query = _threats_report_query(db, system_id, standards, inherit_risk, current_risk, control_tags, project_id)
+    if query is None:
+        return []
+    if cursor is not None:
+        query = _threats_after(query, cursor)
+    if skip:
+        query = query.offset(skip)
+    return query.limit(limit).all()
+
+def iter_report_threats(db: Session, batch_size: int = 500, system_id: Optional[str] = None, standards: Optional[list] = None, inherit_risk: Optional[str] = None, current_risk: Optional[str] = None, control_tags: Optional[list] = None, project_id: Optional[UUID] = None):
+    """
+    Every threat of the report (same filters and order as get_all_threats),
+    fetched from a server-side cursor batch_size rows at a time, so memory
+    stays flat however many threats there are.
+    """
+    query = _threats_report_query(db, system_id, standards, inherit_risk, current_risk, control_tags, project_id)
+    if query is None:
+        return
+    # Risk, remediation and system are many-to-one: joined eager loading works per batch
+    yield from query.yield_per(batch_size)
+
+def iter_report_rows(db: Session, batch_size: int = 2000, system_id: Optional[str] = None, standards: Optional[list] = None, inherit_risk: Optional[str] = None, current_risk: Optional[str] = None, control_tags: Optional[list] = None, project_id: Optional[UUID] = None):
+    """
+    Flat rows of the report (same filters and order as iter_report_threats)
+    for columnar exports: threat, system and project, the OWASP factors and
+    stored scores of its risk, and its remediation with one row per control
+    tag (a threat citing no tag gives one row with the tag columns empty).
+
+    A single SELECT of plain columns read from a server-side cursor: no ORM
+    objects are built.
+    """
+    # Aliased: the standard/tag EXISTS filters must not correlate with these joins
+    risk = aliased(models.Risk)
+    remediation = aliased(models.Remediation)
+    tag = aliased(models.RemediationControlTag)
+    columns = [
+        models.Threat.id,
+        models.Threat.created_at,
+        models.Threat.information_system_id,
+        models.InformationSystem.title.label("information_system_title"),
+        models.InformationSystem.project_id,
+        models.Project.name.label("project_name"),
+        models.Threat.type,
+        models.Threat.title,
+        models.Threat.description,
+        *(getattr(risk, factor).label(factor) for factor in OWASP_RISK_FACTORS),
+        risk.likelihood,
+        risk.impact,
+        risk.risk_score,
+        risk.inherent_level,
+        risk.residual_risk,
+        models.Threat.current_level,
+        remediation.status.label("remediation_status"),
+        remediation.description.label("remediation_description"),
+        tag.standard.label("control_tag_standard"),
+        tag.tag_id.label("control_tag_id"),
+    ]
+    query = _threats_report_query(db, system_id, standards, inherit_risk, current_risk, control_tags, project_id, columns)
+    if query is None:
+        return
+    query = (
+        query.outerjoin(models.Project, models.Project.id == models.InformationSystem.project_id)
+        .outerjoin(risk, risk.id == models.Threat.risk_id)
+        .outerjoin(remediation, remediation.id == models.Threat.remediation_id)
+        .outerjoin(tag, tag.remediation_id == models.Threat.remediation_id)
+        .order_by(tag.standard, tag.tag_id)
+    )
+    yield from query.yield_per(batch_size)
 
 
 # Security configuration for passwords and JWT
@@ -360,6 +496,71 @@ def get_information_systems(db: Session, skip: int = 0, limit: int = 100, projec
     if project_id is not None:
         query = query.filter(models.InformationSystem.project_id == project_id)
     return query.order_by(models.InformationSystem.datetime.desc()).offset(skip).limit(limit).all()
+
+def get_information_system_summaries(db: Session, skip: int = 0, limit: int = 100, project_id: Optional[UUID] = None, include_archived: bool = False):
+    """
+    One page of systems (same order as get_information_systems) with their
+    threat counts per current risk level and remediated threats, in a single
+    grouped query. The total of systems matching the filters comes from a
+    window count over the groups, so it needs no extra query either.
+
+    Returns:
+        tuple: (total systems, list of summary dicts)
+    """
+    from sqlalchemy import case
+
+    level = models.Threat.current_level
+    system = models.InformationSystem
+    query = db.query(
+        system.id,
+        system.title,
+        system.description,
+        system.datetime,
+        system.project_id,
+        system.archived,
+        models.Project.name.label("project_name"),
+        func.count(models.Threat.id).label("threat_count"),
+        func.sum(case((models.Remediation.status == True, 1), else_=0)).label("remediated_count"),
+        *[func.sum(case((level == name, 1), else_=0)).label(name) for name in RISK_LEVELS],
+        func.count().over().label("total"),
+    ).outerjoin(models.Project, system.project_id == models.Project.id) \
+        .outerjoin(models.Threat, models.Threat.information_system_id == system.id) \
+        .outerjoin(models.Remediation, models.Threat.remediation_id == models.Remediation.id)
+    if not include_archived:
+        query = query.filter(system.archived == False)
+    if project_id is not None:
+        query = query.filter(system.project_id == project_id)
+    rows = query.group_by(system.id, models.Project.id) \
+        .order_by(system.datetime.desc()).offset(skip).limit(limit).all()
+
+    if rows:
+        total = rows[0].total
+    else:
+        # Página fuera de rango: el conteo de ventana no llega, se cuenta aparte
+        count = db.query(func.count(system.id))
+        if not include_archived:
+            count = count.filter(system.archived == False)
+        if project_id is not None:
+            count = count.filter(system.project_id == project_id)
+        total = count.scalar()
+
+    summaries = []
+    for row in rows:
+        remediated = row.remediated_count or 0
+        summaries.append({
+            "id": row.id,
+            "title": row.title,
+            "description": row.description,
+            "datetime": row.datetime,
+            "project_id": row.project_id,
+            "project_name": row.project_name,
+            "archived": row.archived,
+            "threat_count": row.threat_count,
+            "risk_counts": {name: getattr(row, name) or 0 for name in RISK_LEVELS},
+            "remediated_count": remediated,
+            "remediation_ratio": remediated / row.threat_count if row.threat_count else 0.0,
+        })
+    return total, summaries
  
 def get_information_system(db: Session, information_system_id: str):
     return db.query(models.InformationSystem).options(
@@ -367,12 +568,49 @@ def get_information_system(db: Session, information_system_id: str):
         joinedload(models.InformationSystem.threats).joinedload(models.Threat.remediation)
     ).filter(models.InformationSystem.id == UUID(information_system_id)).first()
  
-def get_threats_by_information_system(db: Session, information_system_id: str):
-    return db.query(models.Threat).options(
+def get_threats_by_information_system(db: Session, information_system_id: str, limit: Optional[int] = None, cursor: Optional[tuple] = None):
+    """Threats of a system, newest first; with limit, one keyset page after cursor."""
+    query = db.query(models.Threat).options(
         joinedload(models.Threat.risk),
         joinedload(models.Threat.remediation)
-    ).filter(models.Threat.information_system_id == UUID(information_system_id)).order_by(models.Threat.created_at.desc()).all()
- 
+    ).filter(models.Threat.information_system_id == UUID(str(information_system_id)))
+    if cursor is not None:
+        query = _threats_after(query, cursor)
+    query = query.order_by(models.Threat.created_at.desc(), models.Threat.id.desc())
+    if limit is not None:
+        query = query.limit(limit)
+    return query.all()
+
+def get_threat_signatures(db: Session, information_system_id) -> set:
+    """Returns the (type, title) signatures of the threats already stored for a system."""
+    rows = db.query(models.Threat.type, models.Threat.title).filter(
+        models.Threat.information_system_id == information_system_id
+    ).all()
+    return {threat_signature(title, type_) for type_, title in rows}
+
+def get_remediation_tags_by_system(db: Session, project_id: Optional[UUID] = None, information_system_id: Optional[UUID] = None):
+    """
+    Lean rows for the gap analysis, one per threat (or one per system without threats):
+    (system_id, system_title, threat_id, control_tags JSON, remediation status).
+    Archived systems are excluded.
+    """
+    query = db.query(
+        models.InformationSystem.id,
+        models.InformationSystem.title,
+        models.Threat.id,
+        models.Remediation.control_tags,
+        models.Remediation.status,
+    ).outerjoin(
+        models.Threat, models.Threat.information_system_id == models.InformationSystem.id
+    ).outerjoin(
+        models.Remediation, models.Threat.remediation_id == models.Remediation.id
+    ).filter(models.InformationSystem.archived == False)
+    if project_id is not None:
+        query = query.filter(models.InformationSystem.project_id == project_id)
+    if information_system_id is not None:
+        query = query.filter(models.InformationSystem.id == information_system_id)
+    return query.all()
+
 def create_information_system(db: Session, information_system: schemas.InformationSystemCreate, created_by=None):
     project_id = information_system.project_id
     # If project_name is provided (and no project_id), always create a new project
@@ -434,6 +672,177 @@ def create_threat(db: Session, title:str, description:str, type:str, information
     db.refresh(threat)
     return threat
 
+def create_threats_from_analysis(db: Session, information_system_id, threats: list, created_by=None, existing_signatures: Optional[set] = None):
+    """
+    Persists the threats returned by tzu_ai.clientAI for an information system.
+
+    Args:
+        db: Database session
+        information_system_id: UUID of the target information system
+        threats: AI threat objects (title, description, type, remediation, risk)
+        created_by: UUID of the user the threats are attributed to
+        existing_signatures: Optional set of threat signatures already stored;
+            matching threats are skipped and the set is updated in place
+
+    Returns:
+        tuple: (threats_created, threats_skipped)
+    """
+    threats_skipped = 0
+    rows = []
+    for threat_data in threats:
+        normalized_type = normalize_stride_category(threat_data.type)
+        if not normalized_type:
+            normalized_type = 'Spoofing'
+
+        if existing_signatures is not None:
+            signature = threat_signature(threat_data.title, normalized_type)
+            if signature in existing_signatures:
+                threats_skipped += 1
+                continue
+            existing_signatures.add(signature)
+
+        if hasattr(threat_data.remediation, 'description'):
+            remediation_desc = threat_data.remediation.description
+            control_tags = getattr(threat_data.remediation, 'control_tags', [])
+        else:
+            remediation_desc = str(threat_data.remediation)
+            control_tags = []
+
+        rows.append({
+            "title": threat_data.title,
+            "description": threat_data.description,
+            "type": normalized_type,
+            "remediation": {"description": remediation_desc, "control_tags": control_tags},
+            "risk": {factor: getattr(threat_data.risk, factor, None) for factor in OWASP_RISK_FACTORS},
+        })
+
+    threats_created = bulk_create_threats(db, information_system_id, rows, created_by=created_by)
+    return threats_created, threats_skipped
+
+
+OWASP_RISK_FACTORS = (
+    # Threat Agent Factors
+    'skill_level', 'motive', 'opportunity', 'size',
+    # Vulnerability Factors
+    'ease_of_discovery', 'ease_of_exploit', 'awareness', 'intrusion_detection',
+    # Technical Impact
+    'loss_of_confidentiality', 'loss_of_integrity', 'loss_of_availability', 'loss_of_accountability',
+    # Business Impact
+    'financial_damage', 'reputation_damage', 'non_compliance', 'privacy_violation',
+)
+
+
+def _coerce_factor(value):
+    """OWASP factors arrive as ints or numeric strings (LLM output); store them as ints."""
+    if value is None or isinstance(value, int):
+        return value
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def bulk_create_threats(db: Session, information_system_id, threats: list, created_by=None, commit: bool = True) -> int:
+    """
+    Inserts threats with their risks and remediations using three multi-row
+    INSERT statements instead of three commits per threat.
+
+    Args:
+        db: Database session
+        information_system_id: UUID of the target information system
+        threats: dicts with title, description, type (already STRIDE-normalized),
+            remediation {description, status, control_tags} and risk {OWASP factor: value}
+        created_by: UUID of the user the rows are attributed to
+        commit: Commit the transaction (False lets the caller group several inserts)
+
+    Returns:
+        int: Number of threats inserted
+    """
+    from sqlalchemy import insert
+    import uuid as _uuid
+
+    if not threats:
+        if commit:
+            db.commit()
+        return 0
+
+    risk_rows, remediation_rows, tag_rows, threat_rows = [], [], [], []
+    for item in threats:
+        risk_id = _uuid.uuid4()
+        remediation_id = _uuid.uuid4()
+        risk_data = item.get("risk") or {}
+        remediation_data = item.get("remediation") or {}
+        control_tags_json, control_tags_version = normalize_control_tags(remediation_data.get("control_tags"))
+
+        factors = {factor: _coerce_factor(risk_data.get(factor)) for factor in OWASP_RISK_FACTORS}
+        # Core inserts skip the ORM flush hook: stored scores and levels are computed here
+        risk = models.Risk(**factors)
+        risk_rows.append({"id": risk_id, **factors, **risk.stored_scores()})
+        status = bool(remediation_data.get("status", False))
+        remediation_rows.append({
+            "id": remediation_id,
+            "description": remediation_data.get("description"),
+            "status": status,
+            "control_tags": control_tags_json,
+            "control_tags_version": control_tags_version,
+            "created_by": created_by,
+        })
+        tag_rows.extend(
+            {"remediation_id": remediation_id, "standard": standard, "tag_id": tag_id}
+            for standard, tag_id in stored_control_tag_keys(control_tags_json)
+        )
+        threat_rows.append({
+            "id": _uuid.uuid4(),
+            "title": item.get("title"),
+            "description": item.get("description"),
+            "type": item.get("type"),
+            "information_system_id": information_system_id,
+            "risk_id": risk_id,
+            "remediation_id": remediation_id,
+            "current_level": risk.current_risk(status),
+            "created_by": created_by,
+        })
+
+    db.execute(insert(models.Risk), risk_rows)
+    db.execute(insert(models.Remediation), remediation_rows)
+    if tag_rows:
+        db.execute(insert(models.RemediationControlTag), tag_rows)
+    db.execute(insert(models.Threat), threat_rows)
+    # Core inserts skip the ORM flush hooks: bump the report data version here
+    project_id = db.query(models.InformationSystem.project_id).filter(
+        models.InformationSystem.id == information_system_id
+    ).scalar()
+    models.bump_data_version(db.connection(), models.project_scope(project_id))
+    if commit:
+        db.commit()
+    return len(threat_rows)
+
+
+def import_threat_model(db: Session, parsed_model: dict, project_id=None, created_by=None, title: str = None):
+    """
+    Creates an information system from a parsed threat model (see threat_importers)
+    and bulk-inserts its threats in a single transaction.
+
+    Returns:
+        tuple: (information_system, threats_imported)
+    """
+    system = models.InformationSystem(
+        title=title or parsed_model.get("title"),
+        description=parsed_model.get("description"),
+        created_by=created_by,
+        project_id=project_id,
+    )
+    db.add(system)
+    db.flush()
+    try:
+        imported = bulk_create_threats(db, system.id, parsed_model.get("threats") or [], created_by=created_by, commit=False)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    db.refresh(system)
+    return system, imported
+
 def create_risk(db: Session, risk: schemas.Risk):
     risk_model = models.Risk(
         # Threat Agent Factors
@@ -463,16 +872,115 @@ def create_risk(db: Session, risk: schemas.Risk):
     return risk_model
 
 
+def normalize_control_tags(control_tags):
+    """
+    Canonicalizes control tags for storage.
+
+    Tags are validated/corrected once here ('ID (STANDARD)' format, deduplicated)
+    so reads can trust the stored JSON while the catalog version is unchanged.
+
+    Args:
+        control_tags: List of tags, or a JSON string array (stored form)
+
+    Returns:
+        tuple: (control_tags JSON string, catalog version stamp)
+    """
+    import standards
+
+    if isinstance(control_tags, str):
+        try:
+            control_tags = json.loads(control_tags) if control_tags else []
+        except (json.JSONDecodeError, TypeError):
+            control_tags = []
+    if not isinstance(control_tags, list):
+        control_tags = []
+    normalized = standards.validate_and_correct_control_tags(control_tags)
+    return (json.dumps(normalized) if normalized else "[]"), standards.CATALOG_VERSION
+
+
+# Stored tags are 'ID (STANDARD)' (normalize_control_tags)
+_STORED_TAG_RE = re.compile(r'^(.+?)\s*\(([^)]+)\)\s*$')
+
+def stored_control_tag_keys(control_tags_json) -> list:
+    """(standard, tag_id) pairs of a stored control_tags JSON, in order and deduplicated."""
+    try:
+        tags = json.loads(control_tags_json) if control_tags_json else []
+    except (json.JSONDecodeError, TypeError):
+        return []
+    keys = []
+    for tag in tags if isinstance(tags, list) else []:
+        m = _STORED_TAG_RE.match(tag) if isinstance(tag, str) else None
+        if m and (m.group(2), m.group(1)) not in keys:
+            keys.append((m.group(2), m.group(1)))
+    return keys
+
+
+def sync_remediation_control_tags(remediation):
+    """
+    Rebuilds the remediation_control_tags rows of a remediation from its
+    control_tags JSON. Call it whenever control_tags changes; the rows are
+    written with the remediation on the next flush.
+    """
+    remediation.control_tag_rows = [
+        models.RemediationControlTag(standard=standard, tag_id=tag_id)
+        for standard, tag_id in stored_control_tag_keys(remediation.control_tags)
+    ]
+
+
+def renormalize_stale_remediations(db: Session, batch_size: int = 500, revision: Optional[int] = None):
+    """
+    Re-normalizes control tags stored against an older catalog version
+    (or never normalized). Meant to run in the background.
+
+    Args:
+        revision: Catalog revision the installed catalog comes from; the job
+            stops as soon as a newer one exists (its own job takes over)
+
+    Returns:
+        int: Number of remediations updated
+    """
+    import standards
+
+    current = standards.CATALOG_VERSION
+    updated = 0
+    while True:
+        if revision is not None:
+            if get_catalog_revision(db) != revision:
+                return updated
+            _extend_renormalization_claim(db, revision)
+        stale = (
+            db.query(models.Remediation)
+            .filter(or_(
+                models.Remediation.control_tags_version.is_(None),
+                models.Remediation.control_tags_version != current,
+            ))
+            .order_by(models.Remediation.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not stale:
+            return updated
+        for remediation in stale:
+            remediation.control_tags, remediation.control_tags_version = normalize_control_tags(
+                remediation.control_tags
+            )
+            sync_remediation_control_tags(remediation)
+        db.commit()
+        updated += len(stale)
+
+
 def create_remediation(db: Session, description: str, control_tags: list = None, created_by=None):
-    # Convertir lista de control_tags a JSON string
-    control_tags_json = json.dumps(control_tags) if control_tags else "[]"
+    # Normalizar y convertir lista de control_tags a JSON string
+    control_tags_json, control_tags_version = normalize_control_tags(control_tags)
     
     remediation = models.Remediation(
         description=description,
         status=False,
         control_tags=control_tags_json,
+        control_tags_version=control_tags_version,
         created_by=created_by
     )
+    sync_remediation_control_tags(remediation)
     db.add(remediation)
     db.commit()
     db.refresh(remediation)
@@ -498,9 +1006,9 @@ def update_remediation(db: Session, remediation_id: str, description: str = None
             remediation.status = status
         
         if control_tags is not None:
-            # Convert control_tags list to JSON string
-            control_tags_json = json.dumps(control_tags) if control_tags else "[]"
-            remediation.control_tags = control_tags_json
+            # Normalize and convert control_tags list to JSON string
+            remediation.control_tags, remediation.control_tags_version = normalize_control_tags(control_tags)
+            sync_remediation_control_tags(remediation)
         
         db.commit()
         db.refresh(remediation)
@@ -796,3 +1304,204 @@ def remove_project_member(db: Session, project_id, user_id, current_user: models
     db.delete(membership)
     db.commit()
     return True, None
+
+
+# =====================================================
+# STANDARDS CATALOG CRUD FUNCTIONS
+# =====================================================
+
+_CATALOG_CONTROL_FIELDS = ("title", "description", "category")
+
+
+def _catalog_control_fields(info) -> dict:
+    """Column values of a control dict; fields other than title/description/category go to extra."""
+    extra = {k: v for k, v in info.items() if k not in _CATALOG_CONTROL_FIELDS}
+    return {
+        "title": info.get("title", ""),
+        "description": info.get("description", ""),
+        "category": info.get("category", ""),
+        "extra": json.dumps(extra, ensure_ascii=False) if extra else None,
+    }
+
+
+def _catalog_control_row(standard_name: str, tag_id: str, info, position: int):
+    return models.CatalogControl(
+        standard_name=standard_name, tag_id=tag_id, position=position, **_catalog_control_fields(info)
+    )
+
+
+def get_catalog_revision(db: Session) -> Optional[int]:
+    """Current catalog revision (None if the catalog has not been seeded)."""
+    return db.query(func.max(models.CatalogRevision.id)).scalar()
+
+
+# A claim older than this is considered abandoned (worker died) and can be taken over
+RENORMALIZE_CLAIM_TIMEOUT = timedelta(minutes=10)
+
+def claim_catalog_renormalization(db: Session, revision: int) -> bool:
+    """
+    Claims the re-normalization of stored control tags for a catalog revision.
+
+    The claim is one conditional UPDATE: across every worker exactly one gets
+    it, and only for the latest revision that has not been re-normalized yet.
+
+    Returns:
+        bool: True if this caller must run the re-normalization
+    """
+    if get_catalog_revision(db) != revision:
+        return False
+    now = datetime.utcnow()
+    claimed = db.query(models.CatalogRevision).filter(
+        models.CatalogRevision.id == revision,
+        models.CatalogRevision.renormalized_at.is_(None),
+        or_(
+            models.CatalogRevision.renormalize_claimed_at.is_(None),
+            models.CatalogRevision.renormalize_claimed_at < now - RENORMALIZE_CLAIM_TIMEOUT,
+        ),
+    ).update({models.CatalogRevision.renormalize_claimed_at: now}, synchronize_session=False)
+    db.commit()
+    return claimed == 1
+
+def _extend_renormalization_claim(db: Session, revision: int):
+    db.query(models.CatalogRevision).filter(models.CatalogRevision.id == revision).update(
+        {models.CatalogRevision.renormalize_claimed_at: datetime.utcnow()}, synchronize_session=False
+    )
+
+def renormalize_catalog_revision(db: Session, revision: int) -> Optional[int]:
+    """
+    Re-normalizes stored control tags against a catalog revision if this
+    caller wins its claim (claim_catalog_renormalization), then marks the
+    revision done. The caller must have that revision installed.
+
+    Returns:
+        int | None: Remediations updated, or None if another worker has it (or it is done)
+    """
+    if not claim_catalog_renormalization(db, revision):
+        return None
+    updated = renormalize_stale_remediations(db, revision=revision)
+    if get_catalog_revision(db) == revision:
+        db.query(models.CatalogRevision).filter(models.CatalogRevision.id == revision).update(
+            {models.CatalogRevision.renormalized_at: datetime.utcnow()}, synchronize_session=False
+        )
+        db.commit()
+    return updated
+
+def seed_standards_catalog(db: Session) -> bool:
+    """
+    Seeds the catalog tables from the standard modules (api/standards) when
+    they are empty. Afterwards the database is the source of truth.
+
+    Returns:
+        bool: True if the catalog was seeded by this call
+    """
+    import standards
+
+    if db.query(models.CatalogStandard).first() is not None:
+        return False
+    try:
+        revision = models.CatalogRevision(detail="Seed from api/standards modules")
+        db.add(revision)
+        db.flush()
+        for position, (standard_name, controls) in enumerate(standards.STANDARDS_MAP.items()):
+            db.add(models.CatalogStandard(
+                name=standard_name,
+                version=standards.STANDARDS_VERSIONS.get(standard_name),
+                position=position,
+                revision_id=revision.id,
+            ))
+            db.add_all([
+                _catalog_control_row(standard_name, tag_id, info, control_position)
+                for control_position, (tag_id, info) in enumerate(controls.items())
+            ])
+        db.commit()
+        return True
+    except IntegrityError:
+        # Another worker seeded it first
+        db.rollback()
+        return False
+
+
+def get_standards_catalog(db: Session):
+    """
+    Reads the whole catalog, in load order.
+
+    Returns:
+        tuple: (revision, standards_map, standards_versions) in the format
+        expected by standards.install_catalog
+    """
+    # The revision is read first: if a change lands in between, the data is
+    # newer than the revision and the next sync simply reloads it
+    revision = get_catalog_revision(db)
+    catalog_standards = db.query(models.CatalogStandard).order_by(models.CatalogStandard.position).all()
+    standards_map = {standard.name: {} for standard in catalog_standards}
+    standards_versions = {
+        standard.name: standard.version for standard in catalog_standards if standard.version is not None
+    }
+    rows = db.query(models.CatalogControl).order_by(
+        models.CatalogControl.standard_name, models.CatalogControl.position
+    ).all()
+    for row in rows:
+        info = {"title": row.title, "description": row.description, "category": row.category}
+        if row.extra:
+            info.update(json.loads(row.extra))
+        standards_map[row.standard_name][row.tag_id] = info
+    return revision, standards_map, standards_versions
+
+
+def upsert_catalog_standard(db: Session, standard_name: str, controls: dict, version: Optional[str] = None,
+                            replace: bool = True, created_by=None) -> int:
+    """
+    Adds or updates a standard and records a new catalog revision.
+
+    Args:
+        standard_name: Standard name (e.g. 'ASVS')
+        controls: {tag_id: {title, description, category, ...}} in display order
+        version: Standard version (kept as-is if None)
+        replace: Replace every control of the standard (False: update/append)
+        created_by: User making the change
+
+    Returns:
+        int: The new catalog revision
+    """
+    revision = models.CatalogRevision(
+        created_by=created_by,
+        detail=f"{'Replace' if replace else 'Update'} {standard_name} ({len(controls)} controls)",
+    )
+    db.add(revision)
+    db.flush()
+
+    standard = db.query(models.CatalogStandard).filter(models.CatalogStandard.name == standard_name).first()
+    if standard is None:
+        last_position = db.query(func.max(models.CatalogStandard.position)).scalar()
+        standard = models.CatalogStandard(
+            name=standard_name,
+            position=0 if last_position is None else last_position + 1,
+            revision_id=revision.id,
+        )
+        db.add(standard)
+        db.flush()
+    if version is not None:
+        standard.version = version
+    standard.revision_id = revision.id
+
+    controls_query = db.query(models.CatalogControl).filter(models.CatalogControl.standard_name == standard_name)
+    if replace:
+        controls_query.delete(synchronize_session=False)
+        db.flush()
+        db.add_all([
+            _catalog_control_row(standard_name, tag_id, info, position)
+            for position, (tag_id, info) in enumerate(controls.items())
+        ])
+    else:
+        existing = {row.tag_id: row for row in controls_query.all()}
+        next_position = max((row.position for row in existing.values()), default=-1) + 1
+        for tag_id, info in controls.items():
+            row = existing.get(tag_id)
+            if row is None:
+                db.add(_catalog_control_row(standard_name, tag_id, info, next_position))
+                next_position += 1
+                continue
+            for field, value in _catalog_control_fields(info).items():
+                setattr(row, field, value)
+    db.commit()
+    return revision.id
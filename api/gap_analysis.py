@@ -0,0 +1,134 @@
+# Compliance gap analysis over control-catalog bitsets
+"""
+Answers "which controls of a standard are not covered by any remediation?"
+for a project or a single information system.
+
+Every catalog control has a bit position (its ordinal in ALL_CONTROLS, see
+standards.control_tags_bitset), so the tags of a remediation become one int
+and a system's coverage is the OR of its remediations' bitsets. Two bitsets
+are kept per system: every remediation (covered) and only the completed ones
+(remediated). Project coverage is the OR of its systems, and the gaps of a
+standard are bitwise differences against the standard's own bitset.
+"""
+
+import json
+
+import standards
+
+
+def _tags_of(control_tags):
+    """Stored control_tags JSON -> list (bad or empty values count as no tags)."""
+    if not control_tags or control_tags == "[]":
+        return []
+    try:
+        tags = json.loads(control_tags)
+    except (json.JSONDecodeError, TypeError):
+        return []
+    return tags if isinstance(tags, list) else []
+
+
+def system_bitsets(rows, crosswalk: bool = False) -> dict:
+    """
+    Coverage bitsets per information system.
+
+    Args:
+        rows: (system_id, title, threat_id, control_tags JSON, remediation status)
+            as returned by crud.get_remediation_tags_by_system
+        crosswalk: Also cover the equivalent controls of other standards
+
+    Returns:
+        dict: {system_id: {"title", "threats", "covered", "remediated"}} in row order
+    """
+    systems = {}
+    bitsets = {}  # control_tags JSON -> bitset (remediations often repeat their tags)
+    for system_id, title, threat_id, control_tags, status in rows:
+        system = systems.get(system_id)
+        if system is None:
+            system = systems[system_id] = {"title": title, "threats": 0, "covered": 0, "remediated": 0}
+        if threat_id is None:
+            continue
+        system["threats"] += 1
+        if not control_tags:
+            continue
+        bits = bitsets.get(control_tags)
+        if bits is None:
+            bits = bitsets[control_tags] = standards.control_tags_bitset(_tags_of(control_tags), crosswalk)
+        system["covered"] |= bits
+        if status:
+            system["remediated"] |= bits
+    return systems
+
+
+def _percent(part: int, total: int) -> float:
+    return round(part / total * 100, 2) if total else 0.0
+
+
+def standard_gaps(standard: str, covered: int, remediated: int, detail: bool = True) -> dict:
+    """
+    Coverage of one standard by a pair of bitsets.
+
+    Args:
+        standard: Standard name
+        covered: Bitset of the controls of every remediation
+        remediated: Bitset of the controls of completed remediations
+        detail: Include the tag lists (uncovered / pending), not only counts
+
+    Returns:
+        dict: Counts, percentages and, with detail, the uncovered controls
+            (no remediation at all) and the pending ones (only open remediations)
+    """
+    mask = standards.standard_bitset(standard)
+    total = mask.bit_count()
+    covered &= mask
+    remediated &= mask
+    result = {
+        "standard": standard,
+        "total_controls": total,
+        "covered": covered.bit_count(),
+        "remediated": remediated.bit_count(),
+        "coverage": _percent(covered.bit_count(), total),
+        "remediated_coverage": _percent(remediated.bit_count(), total),
+    }
+    if detail:
+        result["uncovered"] = standards.bitset_tags(mask & ~covered)
+        result["pending"] = standards.bitset_tags(covered & ~remediated)
+    return result
+
+
+def gap_analysis(systems: dict, standard_names: list, include_systems: bool = True) -> dict:
+    """
+    Gap analysis of a set of systems (e.g. a project).
+
+    Args:
+        systems: Output of system_bitsets
+        standard_names: Standards to analyse
+        include_systems: Add the per-system counts
+
+    Returns:
+        dict: {"systems_count", "threats_count", "standards": [...], "systems": [...]}
+    """
+    covered = remediated = 0
+    for system in systems.values():
+        covered |= system["covered"]
+        remediated |= system["remediated"]
+
+    result = {
+        "systems_count": len(systems),
+        "threats_count": sum(system["threats"] for system in systems.values()),
+        "standards": [standard_gaps(name, covered, remediated) for name in standard_names],
+        "systems": [],
+    }
+    if include_systems:
+        result["systems"] = [
+            {
+                "id": system_id,
+                "title": system["title"],
+                "threats": system["threats"],
+                "standards": [
+                    standard_gaps(name, system["covered"], system["remediated"], detail=False)
+                    for name in standard_names
+                ],
+            }
+            for system_id, system in systems.items()
+        ]
+    return result
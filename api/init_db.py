@@ -86,6 +86,9 @@ def init_db():
         print("👤 Checking existing users...")
         create_default_user(db)
         db.commit()
+        print("📚 Checking standards catalog...")
+        if crud.seed_standards_catalog(db):
+            print("📚 Standards catalog seeded from api/standards modules")
     except Exception as e:
         print(f"❌ Error during initialization: {e}")
         db.rollback()
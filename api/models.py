@@ -2,15 +2,32 @@ import datetime
 import uuid
 import json
 
-from sqlalchemy import Boolean, Column, ForeignKey, Integer, String, UUID, DateTime, Text, Float
-from sqlalchemy.orm import relationship
+from sqlalchemy import Boolean, Column, ForeignKey, Index, Integer, String, UUID, DateTime, Text, Float, event, inspect, or_, select
+from sqlalchemy.orm import Session, object_session, relationship
 from sqlalchemy.ext.hybrid import hybrid_property
 
 from database import Base
 
 
+def risk_level(score) -> str:
+    """OWASP level of a 0-9 risk score."""
+    if score < 3:
+        return "LOW"
+    elif score < 6:
+        return "MEDIUM"
+    elif score < 9:
+        return "HIGH"
+    else:
+        return "CRITICAL"
+
+
 class Risk(Base):
     __tablename__ = "risks"
+    # Filtering and sorting by risk read the stored columns below through these indexes
+    __table_args__ = (
+        Index("ix_risks_inherent_level", "inherent_level"),
+        Index("ix_risks_risk_score", "risk_score"),
+    )
     id = Column(UUID, primary_key=True, default=uuid.uuid4)
     
     # OWASP Risk Rating - Likelihood Factors
@@ -41,6 +58,13 @@ class Risk(Base):
     
     # Residual Risk (calculated or manually set)
     residual_risk = Column(Float)  # 1-9 scale (allows decimal values)
+
+    # Stored copies of the scores below, rewritten on every flush (_keep_stored_risk_levels);
+    # the hybrids' SQL side reads them instead of recomputing 16 factors per row
+    likelihood = Column(Float, nullable=True)
+    impact = Column(Float, nullable=True)
+    risk_score = Column(Float, nullable=True)
+    inherent_level = Column(String(8), nullable=True)
     
     @hybrid_property
     def likelihood_score(self):
@@ -54,6 +78,10 @@ class Risk(Base):
         threat_agent = (self.skill_level + self.motive + self.opportunity + self.size) / 4
         vulnerability = (self.ease_of_discovery + self.ease_of_exploit + self.awareness + self.intrusion_detection) / 4
         return (threat_agent + vulnerability) / 2
+
+    @likelihood_score.expression
+    def likelihood_score(cls):
+        return cls.likelihood
     
     @hybrid_property
     def impact_score(self):
@@ -69,52 +97,38 @@ class Risk(Base):
         business_impact = (self.financial_damage + self.reputation_damage + 
                           self.non_compliance + self.privacy_violation) / 4
         return (technical_impact + business_impact) / 2
+
+    @impact_score.expression
+    def impact_score(cls):
+        return cls.impact
     
     @hybrid_property
     def overall_risk_score(self):
         """Calculate overall OWASP risk score"""
         return (self.likelihood_score + self.impact_score) / 2
+
+    @overall_risk_score.expression
+    def overall_risk_score(cls):
+        return cls.risk_score
     
     @hybrid_property
     def inherit_risk(self):
         """Calculate inherent risk level based on OWASP methodology"""
-        score = self.overall_risk_score
-        
-        if score < 3:
-            return "LOW"
-        elif score < 6:
-            return "MEDIUM" 
-        elif score < 9:
-            return "HIGH"
-        else:
-            return "CRITICAL"
+        return risk_level(self.overall_risk_score)
     
     @inherit_risk.expression
     def inherit_risk(cls):
-        """SQL expression for risk level calculation"""
-        from sqlalchemy import case, and_
-        
-        # Calculate likelihood score (average of threat agent + vulnerability factors)
-        threat_agent = (cls.skill_level + cls.motive + cls.opportunity + cls.size) / 4.0
-        vulnerability = (cls.ease_of_discovery + cls.ease_of_exploit + cls.awareness + cls.intrusion_detection) / 4.0
-        likelihood = (threat_agent + vulnerability) / 2.0
-        
-        # Calculate impact score (average of technical + business impact factors)  
-        technical_impact = (cls.loss_of_confidentiality + cls.loss_of_integrity + 
-                           cls.loss_of_availability + cls.loss_of_accountability) / 4.0
-        business_impact = (cls.financial_damage + cls.reputation_damage + 
-                          cls.non_compliance + cls.privacy_violation) / 4.0
-        impact = (technical_impact + business_impact) / 2.0
-        
-        # Calculate overall score
-        overall_score = (likelihood + impact) / 2.0
-        
-        return case(
-            (overall_score < 3, "LOW"),
-            (overall_score < 6, "MEDIUM"),
-            (overall_score < 9, "HIGH"),
-            else_="CRITICAL"
-        )
+        """SQL expression for risk level: the stored, indexed level"""
+        return cls.inherent_level
+
+    def stored_scores(self) -> dict:
+        """Values of the stored score columns for the current factors."""
+        return {
+            "likelihood": self.likelihood_score,
+            "impact": self.impact_score,
+            "risk_score": self.overall_risk_score,
+            "inherent_level": self.inherit_risk,
+        }
     
     def current_risk(self, remediation_status=False):
         """
@@ -124,14 +138,7 @@ class Risk(Base):
         """
         if remediation_status and self.residual_risk is not None:
             # Convert residual_risk (float) to risk level
-            if self.residual_risk < 3:
-                return "LOW"
-            elif self.residual_risk < 6:
-                return "MEDIUM"
-            elif self.residual_risk < 9:
-                return "HIGH"
-            else:
-                return "CRITICAL"
+            return risk_level(self.residual_risk)
         else:
             # Return inherent risk if no remediation applied
             return self.inherit_risk
@@ -145,7 +152,11 @@ class Remediation(Base):
     # Tags flexibles para controles de seguridad (JSON array de strings)
     # Ejemplos: ["ASVS-V2.1.1", "MASVS-MSTG-AUTH-1", "SBS-Circular-G-140-2009", "ISO27001-A.9.1.1"]
     control_tags = Column(Text)  # JSON string array
+    # standards.CATALOG_VERSION the tags were normalized against (None = never normalized)
+    control_tags_version = Column(String(16), nullable=True)
     created_by = Column(UUID, ForeignKey("users.id"), nullable=True)
+    # Copia normalizada de control_tags, una fila por tag (crud.sync_remediation_control_tags)
+    control_tag_rows = relationship("RemediationControlTag", cascade="all, delete-orphan")
     
     @hybrid_property
     def control_tags_list(self):
@@ -166,8 +177,24 @@ class Remediation(Base):
             self.control_tags = json.dumps(value)
     
 
+class RemediationControlTag(Base):
+    """One row per control tag of a remediation, so standard/tag filters are index lookups."""
+    __tablename__ = "remediation_control_tags"
+    # Per-tag analytics and "which remediations cite this control" (the PK covers per-remediation lookups)
+    __table_args__ = (Index("ix_remediation_control_tags_standard_tag", "standard", "tag_id"),)
+    remediation_id = Column(UUID, ForeignKey("remediations.id", ondelete="CASCADE"), primary_key=True)
+    standard = Column(String, primary_key=True)  # e.g. 'ASVS'
+    tag_id = Column(String, primary_key=True)    # e.g. 'V2.1.1'
+
+
 class Threat(Base):
     __tablename__ = "threats"
+    # Keyset pagination sort key: newest first, id breaks ties (crud.get_all_threats);
+    # the current_risk filter of /report keeps the same order within one level
+    __table_args__ = (
+        Index("ix_threats_created_at_id", "created_at", "id"),
+        Index("ix_threats_current_level_created_at_id", "current_level", "created_at", "id"),
+    )
     id = Column(UUID, primary_key=True, default=uuid.uuid4)
     title = Column(String)
     type = Column(String)
@@ -176,6 +203,9 @@ class Threat(Base):
     remediation_id = Column(UUID,ForeignKey("remediations.id"))  
     risk_id = Column(UUID,ForeignKey("risks.id"))  
     created_by = Column(UUID, ForeignKey("users.id"), nullable=True)
+    created_at = Column(DateTime, default=datetime.datetime.utcnow, nullable=False)
+    # Stored current_risk_level (kept by _keep_stored_risk_levels); None without a risk
+    current_level = Column(String(8), nullable=True)
     information_system = relationship("InformationSystem", back_populates="threats")
     remediation = relationship("Remediation")
     risk = relationship("Risk")
@@ -193,6 +223,46 @@ class Threat(Base):
             return self.risk.inherit_risk
         else:
             return "UNKNOWN"
+
+
+def _risk_columns_changed(session, obj) -> bool:
+    return obj in session.new or session.is_modified(obj, include_collections=False)
+
+
+@event.listens_for(Session, "before_flush")
+def _keep_stored_risk_levels(session, flush_context, instances):
+    """
+    Keeps Risk's stored scores and Threat.current_level in step with every ORM
+    write: new or modified risks get their scores recomputed, and threats whose
+    risk, remediation or links changed get their current level again.
+    (crud.bulk_create_threats inserts with Core and fills them itself.)
+    """
+    pending = [obj for obj in (*session.new, *session.dirty) if _risk_columns_changed(session, obj)]
+    risks = [obj for obj in pending if isinstance(obj, Risk)]
+    remediations = [obj for obj in pending if isinstance(obj, Remediation)]
+    threats = {obj for obj in pending if isinstance(obj, Threat)}
+
+    for risk in risks:
+        for column, value in risk.stored_scores().items():
+            setattr(risk, column, value)
+
+    risk_ids = [risk.id for risk in risks if risk.id is not None]
+    remediation_ids = [remediation.id for remediation in remediations if remediation.id is not None]
+    if risk_ids or remediation_ids:
+        threats.update(session.query(Threat).filter(or_(
+            Threat.risk_id.in_(risk_ids),
+            Threat.remediation_id.in_(remediation_ids),
+        )))
+
+    for threat in threats:
+        # Pending threats may only carry the foreign keys
+        risk = threat.risk or (session.get(Risk, threat.risk_id) if threat.risk_id else None)
+        remediation = threat.remediation or (
+            session.get(Remediation, threat.remediation_id) if threat.remediation_id else None
+        )
+        level = risk.current_risk(bool(remediation and remediation.status)) if risk else None
+        if threat.current_level != level:
+            threat.current_level = level
     
     
 class Project(Base):
@@ -275,3 +345,150 @@ class AuditLog(Base):
     timestamp = Column(DateTime, default=datetime.datetime.utcnow)
     detail = Column(Text, nullable=True)
 
+
+
+# =====================================================
+# STANDARDS CATALOG (seeded from the api/standards modules)
+# =====================================================
+
+class CatalogRevision(Base):
+    """One row per change of the standards catalog; workers reload when max(id) moves."""
+    __tablename__ = "catalog_revisions"
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    created_at = Column(DateTime, default=datetime.datetime.utcnow)
+    created_by = Column(UUID, ForeignKey("users.id"), nullable=True)
+    detail = Column(Text, nullable=True)
+    # Re-normalization of stored control tags against this revision: claimed by one worker, then done
+    renormalize_claimed_at = Column(DateTime, nullable=True)
+    renormalized_at = Column(DateTime, nullable=True)
+
+
+class CatalogStandard(Base):
+    __tablename__ = "catalog_standards"
+    name = Column(String, primary_key=True)          # e.g. 'ASVS'
+    version = Column(String, nullable=True)          # e.g. '4.0.3'
+    position = Column(Integer, nullable=False)       # Load order (TAG_TO_STANDARD: first wins)
+    revision_id = Column(Integer, ForeignKey("catalog_revisions.id"), nullable=False)  # Last change
+
+
+class CatalogControl(Base):
+    __tablename__ = "catalog_controls"
+    standard_name = Column(String, ForeignKey("catalog_standards.name"), primary_key=True)
+    tag_id = Column(String, primary_key=True)
+    position = Column(Integer, nullable=False)       # Order within the standard
+    title = Column(Text, nullable=False, default="")
+    description = Column(Text, nullable=False, default="")
+    category = Column(String, nullable=False, default="")
+    extra = Column(Text, nullable=True)              # JSON with any other control fields
+
+
+# =====================================================
+# REPORT DATA VERSION
+# =====================================================
+
+class DataVersion(Base):
+    """
+    Write counters of the report data; cached report artifacts and snapshots are keyed by them.
+
+    Writers only bump the rows of the projects they touch, so they never
+    contend on a shared row: the global version is the sum of all rows
+    (crud.get_data_version).
+    """
+    __tablename__ = "data_versions"
+    scope = Column(String, primary_key=True)  # project_scope: 'project:<uuid>' or 'project:none'
+    version = Column(Integer, nullable=False, default=0)
+
+
+def project_scope(project_id) -> str:
+    """Data version scope of a project's report data (None: systems without a project)."""
+    return f"project:{project_id}" if project_id is not None else "project:none"
+
+
+def bump_data_version(connection, scope: str):
+    """
+    Increments a data version in the caller's transaction (Core writes call it themselves).
+    One upsert: concurrent first writes of a scope cannot collide on its primary key.
+    """
+    if connection.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    table = DataVersion.__table__
+    connection.execute(
+        insert(table).values(scope=scope, version=1).on_conflict_do_update(
+            index_elements=[table.c.scope], set_={"version": table.c.version + 1}
+        )
+    )
+
+
+def _current_and_previous(obj, attribute) -> set:
+    """Value of an attribute plus the one it replaced in this flush (if any)."""
+    history = inspect(obj).attrs[attribute].history
+    return {getattr(obj, attribute), *(history.deleted or ())}
+
+
+def _changed_project_ids(session, changed) -> set:
+    """Projects whose report data the flushed objects belong to (None: no project)."""
+    project_ids, system_ids, risk_ids, remediation_ids = set(), set(), set(), set()
+    for obj in changed:
+        if isinstance(obj, Project):
+            project_ids.add(obj.id)
+        elif isinstance(obj, InformationSystem):
+            project_ids |= _current_and_previous(obj, "project_id")  # Also the project it left
+        elif isinstance(obj, Threat):
+            system_ids |= _current_and_previous(obj, "information_system_id")
+        elif isinstance(obj, Risk):
+            risk_ids.add(obj.id)
+        elif isinstance(obj, Remediation):
+            remediation_ids.add(obj.id)
+        elif isinstance(obj, RemediationControlTag):
+            remediation_ids.add(obj.remediation_id)
+
+    connection = session.connection()
+    if risk_ids or remediation_ids:
+        system_ids |= set(connection.execute(select(Threat.information_system_id).where(or_(
+            Threat.risk_id.in_(risk_ids),
+            Threat.remediation_id.in_(remediation_ids),
+        ))).scalars())
+    system_ids.discard(None)
+    if system_ids:
+        project_ids |= set(connection.execute(
+            select(InformationSystem.project_id).where(InformationSystem.id.in_(system_ids))
+        ).scalars())
+    return project_ids or {None}
+
+
+# Models whose writes make cached reports stale
+_REPORT_MODELS = (Threat, Risk, Remediation, RemediationControlTag, InformationSystem, Project)
+
+
+def _record_report_write(mapper, connection, target):
+    """Mapper hook of the report models: collects the flushed objects for _bump_report_data_version."""
+    object_session(target).info.setdefault("report_writes", []).append(target)
+
+
+def _record_report_update(mapper, connection, target):
+    # Also called for dirty objects without a net change
+    if object_session(target).is_modified(target, include_collections=False):
+        _record_report_write(mapper, connection, target)
+
+
+for _model in _REPORT_MODELS:
+    event.listen(_model, "after_insert", _record_report_write)
+    event.listen(_model, "after_update", _record_report_update)
+    event.listen(_model, "after_delete", _record_report_write)
+
+
+@event.listens_for(Session, "after_flush")
+def _bump_report_data_version(session, flush_context):
+    """
+    Any write to the data shown in reports makes their cached artifacts stale:
+    bumps the version of every project it touches.
+    """
+    changed = session.info.pop("report_writes", None)
+    if not changed:
+        return
+    connection = session.connection()
+    # Sorted: concurrent writers lock the counter rows in the same order
+    for project_id in sorted(_changed_project_ids(session, changed), key=str):
+        bump_data_version(connection, project_scope(project_id))
@@ -0,0 +1,255 @@
+# Streaming export of the threat report
+"""
+Serializes the threats of /report one row at a time (NDJSON or CSV) for
+/report/export. Rows come from crud.iter_report_threats (a server-side
+cursor read in batches), so memory stays flat and the first bytes are sent
+before the last threats are read.
+
+The text formats share EXPORT_COLUMNS: one flat row per threat with the
+system it belongs to, its risk and its remediation.
+
+The columnar formats (Parquet, Arrow IPC) are for analytics loads (pandas,
+DuckDB): typed COLUMNAR_SCHEMA columns with every OWASP factor and stored
+score, one row per control tag (crud.iter_report_rows), written in record
+batches of BATCH_ROWS rows with pyarrow.
+"""
+
+import csv
+import io
+import json
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.file",
+}
+
+COLUMNAR_FORMATS = ("parquet", "arrow")
+
+EXPORT_COLUMNS = (
+    "id",
+    "created_at",
+    "information_system_id",
+    "information_system_title",
+    "project_id",
+    "type",
+    "title",
+    "description",
+    "inherit_risk",
+    "residual_risk",
+    "current_risk_level",
+    "remediation_status",
+    "remediation_description",
+    "control_tags",
+)
+
+# Rows per chunk written to the response (a chunk is flushed as soon as it is full)
+CHUNK_ROWS = 200
+
+# Rows per record batch of the columnar formats (a Parquet row group each)
+BATCH_ROWS = 5000
+
+# Cells starting with these are formulas for spreadsheet applications
+_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def export_row(threat) -> dict:
+    """
+    Flat export row of a threat (EXPORT_COLUMNS order).
+
+    Args:
+        threat: models.Threat with risk, remediation and information_system loaded
+
+    Returns:
+        dict: JSON-compatible values
+    """
+    system = threat.information_system
+    risk = threat.risk
+    remediation = threat.remediation
+    return {
+        "id": str(threat.id),
+        "created_at": threat.created_at.isoformat() if threat.created_at else None,
+        "information_system_id": str(system.id) if system else None,
+        "information_system_title": system.title if system else None,
+        "project_id": str(system.project_id) if system and system.project_id else None,
+        "type": threat.type,
+        "title": threat.title,
+        "description": threat.description,
+        "inherit_risk": risk.inherit_risk if risk else None,
+        "residual_risk": risk.residual_risk if risk else None,
+        "current_risk_level": threat.current_risk_level,
+        "remediation_status": bool(remediation.status) if remediation else False,
+        "remediation_description": remediation.description if remediation else None,
+        "control_tags": remediation.control_tags_list if remediation else [],
+    }
+
+
+def iter_ndjson(threats):
+    """One JSON object per line, in chunks of CHUNK_ROWS rows (bytes)."""
+    lines = []
+    for threat in threats:
+        lines.append(json.dumps(export_row(threat), ensure_ascii=False))
+        if len(lines) >= CHUNK_ROWS:
+            yield ("\n".join(lines) + "\n").encode("utf-8")
+            lines = []
+    if lines:
+        yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def _csv_cell(value):
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        value = "; ".join(value)
+    elif isinstance(value, bool):
+        value = "true" if value else "false"
+    elif not isinstance(value, str):
+        return value
+    # Neutralize formula injection when the file is opened in a spreadsheet
+    return f"'{value}" if value.startswith(_FORMULA_PREFIXES) else value
+
+
+def iter_csv(threats):
+    """Header plus one CSV record per threat, in chunks of CHUNK_ROWS rows (bytes)."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    # The header goes out at once: the client sees the download start immediately
+    yield ("\ufeff" + buffer.getvalue()).encode("utf-8")  # BOM: Excel reads UTF-8
+    buffer.seek(0)
+    buffer.truncate()
+
+    rows = 0
+    for threat in threats:
+        row = export_row(threat)
+        writer.writerow([_csv_cell(row[column]) for column in EXPORT_COLUMNS])
+        rows += 1
+        if rows >= CHUNK_ROWS:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+            rows = 0
+    if rows:
+        yield buffer.getvalue().encode("utf-8")
+
+
+def columnar_schema():
+    """Arrow schema of the columnar export (column names as in crud.iter_report_rows)."""
+    from crud import OWASP_RISK_FACTORS
+
+    return pa.schema([
+        ("id", pa.string()),
+        ("created_at", pa.timestamp("us")),
+        ("information_system_id", pa.string()),
+        ("information_system_title", pa.string()),
+        ("project_id", pa.string()),
+        ("project_name", pa.string()),
+        ("type", pa.string()),
+        ("title", pa.string()),
+        ("description", pa.string()),
+        *((factor, pa.int8()) for factor in OWASP_RISK_FACTORS),  # 0-9 scale
+        ("likelihood", pa.float64()),
+        ("impact", pa.float64()),
+        ("risk_score", pa.float64()),
+        ("inherent_level", pa.string()),
+        ("residual_risk", pa.float64()),
+        ("current_level", pa.string()),
+        ("remediation_status", pa.bool_()),
+        ("remediation_description", pa.string()),
+        ("control_tag_standard", pa.string()),
+        ("control_tag_id", pa.string()),
+    ])
+
+
+# Columns holding UUIDs (exported as their string form)
+_UUID_COLUMNS = ("id", "information_system_id", "project_id")
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file collecting what the Arrow writers emit until it is drained."""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        chunk = bytes(data)
+        self._chunks.append(chunk)
+        self._position += len(chunk)
+        return len(chunk)
+
+    def tell(self):
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _record_batches(rows, schema):
+    """Record batches of BATCH_ROWS rows, built column by column."""
+    names = schema.names
+    positions = {name: names.index(name) for name in _UUID_COLUMNS}
+    columns = [[] for _ in names]
+    count = 0
+    for row in rows:
+        for values, value in zip(columns, row):
+            values.append(value)
+        count += 1
+        if count >= BATCH_ROWS:
+            yield _to_batch(columns, positions, schema)
+            columns = [[] for _ in names]
+            count = 0
+    if count:
+        yield _to_batch(columns, positions, schema)
+
+
+def _to_batch(columns, positions, schema):
+    for position in positions.values():
+        columns[position] = [str(value) if value is not None else None for value in columns[position]]
+    return pa.RecordBatch.from_arrays(
+        [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+        schema=schema,
+    )
+
+
+def _iter_columnar(rows, open_writer):
+    schema = columnar_schema()
+    sink = _ChunkSink()
+    writer = open_writer(pa.PythonFile(sink, mode="w"), schema)
+    for batch in _record_batches(rows, schema):
+        writer.write_batch(batch)
+        chunk = sink.drain()
+        if chunk:
+            yield chunk
+    writer.close()  # Footer (and the schema alone when there are no rows)
+    yield sink.drain()
+
+
+def iter_parquet(rows):
+    """
+    Parquet file of the report (zstd compressed, one row group per record batch).
+
+    Args:
+        rows: crud.iter_report_rows
+    """
+    return _iter_columnar(rows, lambda sink, schema: pq.ParquetWriter(sink, schema, compression="zstd"))
+
+
+def iter_arrow(rows):
+    """
+    Arrow IPC file (Feather v2) of the report, one record batch at a time.
+
+    Args:
+        rows: crud.iter_report_rows
+    """
+    return _iter_columnar(rows, lambda sink, schema: pa.ipc.new_file(sink, schema))
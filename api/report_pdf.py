@@ -0,0 +1,288 @@
+# Server-side PDF rendering of the threat report
+"""
+Renders the threats of /report (same filters) as a PDF in a background
+worker pool, so the browser no longer downloads the whole report and every
+diagram to build it with jsPDF.
+
+Finished files are written to REPORT_CACHE_DIR under a key made of a digest
+of the filter set and the data version (crud.get_data_version): while no
+threat, risk, remediation or system changes, the same report is served from
+disk without rendering it again. A newer version of a filter set replaces
+the older file, and the oldest files are evicted once the cache outgrows
+REPORT_CACHE_MAX_BYTES.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from xml.sax.saxutils import escape
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib.units import mm
+from reportlab.platypus import Image, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+logger = logging.getLogger(__name__)
+
+REPORT_CACHE_DIR = os.getenv("REPORT_CACHE_DIR", "report_cache")
+DIAGRAMS_DIR = "diagrams"
+PDF_WORKERS = int(os.getenv("REPORT_PDF_WORKERS", "2"))
+# Size cap of REPORT_CACHE_DIR across filter sets: the oldest PDFs are evicted past it
+REPORT_CACHE_MAX_BYTES = int(os.getenv("REPORT_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+
+# Bump when the layout changes: artifacts rendered with the old one stop matching
+RENDERER_VERSION = 1
+
+_KEY_RE = re.compile(r"^[0-9a-f]{32}-v\d+$")
+_DIAGRAM_EXTENSIONS = (".png", ".jpg", ".jpeg", ".gif", ".bmp", ".webp")
+
+_executor = None
+_jobs = {}  # key -> Future of the render in progress (or failed, until reported)
+_jobs_lock = threading.Lock()
+
+
+def artifact_key(filters: dict, data_version: int) -> str:
+    """
+    Cache key of a report: digest of the filter set plus the data version.
+
+    Args:
+        filters: crud.iter_report_threats keyword arguments
+        data_version: crud.get_data_version when the report was requested
+
+    Returns:
+        str: '<digest>-v<version>'
+    """
+    payload = json.dumps([RENDERER_VERSION, filters], sort_keys=True, default=str)
+    digest = hashlib.sha256(payload.encode()).hexdigest()[:32]
+    return f"{digest}-v{data_version}"
+
+
+def is_valid_key(key: str) -> bool:
+    return bool(_KEY_RE.match(key))
+
+
+def artifact_path(key: str) -> str:
+    return os.path.join(REPORT_CACHE_DIR, f"{key}.pdf")
+
+
+def job_status(key: str):
+    """
+    A failure is reported once: the failed render is forgotten afterwards.
+
+    Returns:
+        str: 'ready', 'pending' or 'failed', or None for an unknown key
+    """
+    if os.path.exists(artifact_path(key)):
+        return "ready"
+    with _jobs_lock:
+        future = _jobs.get(key)
+        if future is None:
+            return None
+        if not future.done():
+            return "pending"
+        if future.exception():
+            del _jobs[key]
+            return "failed"
+    return "ready"
+
+
+def submit(key: str, filters: dict) -> str:
+    """
+    Queues the render of a report unless it is already on disk or in progress
+    (a failed render is retried).
+
+    Returns:
+        str: 'ready' or 'pending'
+    """
+    global _executor
+    if os.path.exists(artifact_path(key)):
+        return "ready"
+    with _jobs_lock:
+        future = _jobs.get(key)
+        if future is None or (future.done() and future.exception()):
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=max(1, PDF_WORKERS), thread_name_prefix="report-pdf")
+            _jobs[key] = _executor.submit(_render_job, key, filters)
+    return "pending"
+
+
+def _render_job(key: str, filters: dict):
+    import crud
+    import database
+
+    path = artifact_path(key)
+    cache_dir = os.path.dirname(path)
+    os.makedirs(cache_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=cache_dir, prefix=f"{key}.", suffix=".tmp")
+    os.close(fd)
+    db = database.SessionLocal()
+    try:
+        render_pdf(crud.iter_report_threats(db, **filters), tmp_path, filters)
+        os.replace(tmp_path, path)
+    except Exception:
+        logger.exception("Report PDF rendering failed (%s)", key)
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    finally:
+        db.close()
+
+    # Older versions of the same filter set are stale now
+    digest = key.rsplit("-v", 1)[0]
+    for name in os.listdir(cache_dir):
+        if name.startswith(f"{digest}-v") and name.endswith(".pdf") and name != f"{key}.pdf":
+            try:
+                os.remove(os.path.join(cache_dir, name))
+            except OSError:
+                pass
+    _prune_cache(cache_dir, keep=f"{key}.pdf")
+    with _jobs_lock:
+        _jobs.pop(key, None)
+
+
+def _prune_cache(cache_dir: str, keep: str):
+    """Evicts the oldest PDFs of the cache until it fits REPORT_CACHE_MAX_BYTES."""
+    entries = []
+    for entry in os.scandir(cache_dir):
+        if entry.name.endswith(".pdf") and entry.name != keep:
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+    try:
+        total = os.path.getsize(os.path.join(cache_dir, keep))
+    except OSError:
+        total = 0
+    for _, size, path in sorted(entries, reverse=True):
+        total += size
+        if total > REPORT_CACHE_MAX_BYTES:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def _diagram_path(system):
+    """Diagram image of a system in the diagrams/ store, if there is one."""
+    name = os.path.basename(system.diagram or "")
+    if not name.lower().endswith(_DIAGRAM_EXTENSIONS):
+        return None
+    path = os.path.join(DIAGRAMS_DIR, name)
+    return path if os.path.isfile(path) else None
+
+
+def _filters_text(filters: dict) -> str:
+    parts = []
+    if filters.get("standards"):
+        parts.append(f"Standards: {', '.join(filters['standards'])}")
+    if filters.get("control_tags"):
+        parts.append("Controls: " + ", ".join(f"{tag} ({std})" for std, tag in filters["control_tags"]))
+    if filters.get("inherit_risk"):
+        parts.append(f"Inherent risk: {filters['inherit_risk']}")
+    if filters.get("current_risk"):
+        parts.append(f"Current risk: {filters['current_risk']}")
+    return " | ".join(parts) or "None"
+
+
+def render_pdf(threats, path: str, filters: dict):
+    """
+    Writes the PDF of a report: a summary by current risk level, then one
+    section per information system with its diagram and its threats.
+
+    Args:
+        threats: models.Threat rows in report order (risk, remediation and system loaded)
+        path: Output file
+        filters: Filter set of the report (shown on the first page)
+    """
+    # Agrupar por sistema (orden de aparición); solo se guarda lo que se imprime
+    systems = {}
+    levels = {}
+    for threat in threats:
+        system = threat.information_system
+        entry = systems.get(system.id)
+        if entry is None:
+            entry = systems[system.id] = {
+                "title": system.title,
+                "project": system.project_name,
+                "description": system.description,
+                "diagram": _diagram_path(system),
+                "rows": [],
+            }
+        level = threat.current_risk_level
+        levels[level] = levels.get(level, 0) + 1
+        remediation = threat.remediation
+        entry["rows"].append((
+            threat.title,
+            threat.type,
+            threat.risk.inherit_risk if threat.risk else "",
+            level,
+            "Yes" if remediation and remediation.status else "No",
+            ", ".join(remediation.control_tags_list) if remediation else "",
+        ))
+
+    styles = getSampleStyleSheet()
+    cell = styles["BodyText"].clone("cell", fontSize=7, leading=8.5)
+    head = cell.clone("head", fontName="Helvetica-Bold")
+    width = A4[0] - 30 * mm
+
+    story = [
+        Paragraph("Threat Modeling Analysis Report", styles["Title"]),
+        Paragraph(f"Generated on: {datetime.now(timezone.utc):%Y-%m-%d %H:%M} UTC", styles["Normal"]),
+        Paragraph(escape(f"Filters: {_filters_text(filters)}"), styles["Normal"]),
+        Spacer(1, 6 * mm),
+        Paragraph("Summary", styles["Heading2"]),
+        Paragraph(
+            f"{sum(levels.values())} threats in {len(systems)} information systems. "
+            + ", ".join(f"{name}: {levels.get(name, 0)}" for name in ("CRITICAL", "HIGH", "MEDIUM", "LOW")),
+            styles["Normal"],
+        ),
+    ]
+
+    columns = ("Threat", "STRIDE", "Inherent", "Current", "Remediated", "Controls")
+    col_widths = [width * f for f in (0.30, 0.14, 0.10, 0.10, 0.10, 0.26)]
+    for entry in systems.values():
+        story.append(Spacer(1, 6 * mm))
+        story.append(Paragraph(escape(entry["title"] or ""), styles["Heading2"]))
+        if entry["project"]:
+            story.append(Paragraph(escape(f"Project: {entry['project']}"), styles["Normal"]))
+        if entry["description"]:
+            story.append(Paragraph(escape(entry["description"]), styles["Normal"]))
+        if entry["diagram"]:
+            try:
+                image = Image(entry["diagram"])
+                scale = min(1.0, width / image.imageWidth, (120 * mm) / image.imageHeight)
+                image.drawWidth, image.drawHeight = image.imageWidth * scale, image.imageHeight * scale
+                story.extend([Spacer(1, 3 * mm), image])
+            except Exception:
+                logger.warning("Diagram could not be embedded: %s", entry["diagram"])
+        table = Table(
+            [[Paragraph(c, head) for c in columns]]
+            + [[Paragraph(escape(str(value or "")), cell) for value in row] for row in entry["rows"]],
+            colWidths=col_widths,
+            repeatRows=1,
+        )
+        table.setStyle(TableStyle([
+            ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#e0e7ff")),
+            ("GRID", (0, 0), (-1, -1), 0.25, colors.grey),
+            ("VALIGN", (0, 0), (-1, -1), "TOP"),
+        ]))
+        story.extend([Spacer(1, 3 * mm), table])
+
+    def footer(canvas, doc):
+        canvas.saveState()
+        canvas.setFont("Helvetica-Oblique", 7)
+        canvas.drawCentredString(A4[0] / 2, 8 * mm, f"Generated by Threat Zero Utility (TZU) - {doc.page}")
+        canvas.restoreState()
+
+    SimpleDocTemplate(
+        path, pagesize=A4, leftMargin=15 * mm, rightMargin=15 * mm,
+        topMargin=15 * mm, bottomMargin=15 * mm, title="Threat Modeling Analysis Report",
+    ).build(story, onFirstPage=footer, onLaterPages=footer)
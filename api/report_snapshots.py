@@ -0,0 +1,208 @@
+# Materialized report snapshots per project
+"""
+Project leads pull the same filtered report of their project many times a
+day while its data barely changes. /report/export materializes its response
+per (project, request) in SNAPSHOT_DIR and tags it with the project's data
+version (models.project_scope; bumped on every threat, risk, remediation or
+system write of the project). Only whole, cursor-less responses are
+materialized: a snapshot page followed by live keyset pages could mix two
+versions of the data.
+
+Only a snapshot of the current version is served. Otherwise the caller
+answers live while a background worker rebuilds it. A first build waits for
+the second request of a key, so one-off filter sets are never materialized,
+and SNAPSHOT_MAX_KEYS caps the snapshots on disk (least recently served
+first).
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_DIR = os.getenv("REPORT_SNAPSHOT_DIR", "report_snapshots")
+SNAPSHOT_WORKERS = int(os.getenv("REPORT_SNAPSHOT_WORKERS", "2"))
+SNAPSHOT_MAX_KEYS = int(os.getenv("REPORT_SNAPSHOT_MAX_KEYS", "256"))
+
+_executor = None
+_jobs = {}  # key -> Future of the build in progress
+_jobs_lock = threading.Lock()
+_requested = OrderedDict()  # Keys asked for once without a snapshot (bounded, oldest first)
+
+
+def snapshot_key(project_id, request: dict) -> str:
+    """
+    Key of a snapshot: the project plus everything that shapes the response.
+
+    Args:
+        project_id: Project the report is filtered by
+        request: Endpoint name and its validated parameters
+    """
+    payload = json.dumps([str(project_id), request], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+
+def _meta_path(key: str) -> str:
+    return os.path.join(SNAPSHOT_DIR, f"{key}.json")
+
+
+def load(key: str):
+    """
+    Metadata of the current snapshot of a key, or None.
+
+    Returns:
+        dict: version, built_at, media_type, headers and body (file path)
+    """
+    try:
+        with open(_meta_path(key), encoding="utf-8") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    meta["body"] = os.path.join(SNAPSHOT_DIR, meta["body"])
+    return meta if os.path.exists(meta["body"]) else None
+
+
+def _write_atomically(path: str, chunks):
+    """Writes chunks to a unique temporary file next to path, then moves it in place."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=f"{os.path.basename(path)}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for chunk in chunks:
+                f.write(chunk)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _remove(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def build(db, key: str, scope: str, build_body):
+    """
+    Builds a snapshot and makes it current.
+
+    The version is read before the data: a write during the build leaves
+    the snapshot one version behind, so the next request rebuilds it.
+
+    Args:
+        db: Database session
+        key: snapshot_key
+        scope: Data version scope of the project
+        build_body: callable(db) -> (media_type, headers, iterable of bytes)
+    """
+    import crud
+
+    version = crud.get_data_version(db, scope)
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    body_name = f"{key}-v{version}.body"
+    media_type, headers, chunks = build_body(db)
+    _write_atomically(os.path.join(SNAPSHOT_DIR, body_name), chunks)
+
+    previous = load(key)
+    meta = {
+        "version": version,
+        "built_at": datetime.now(timezone.utc).isoformat(),
+        "media_type": media_type,
+        "headers": headers,
+        "body": body_name,
+    }
+    _write_atomically(_meta_path(key), [json.dumps(meta).encode("utf-8")])
+
+    # The body before the previous one can go (the previous may still be being sent)
+    keep = {body_name, os.path.basename(previous["body"]) if previous else None}
+    for name in os.listdir(SNAPSHOT_DIR):
+        if name.startswith(f"{key}-v") and name.endswith(".body") and name not in keep:
+            _remove(os.path.join(SNAPSHOT_DIR, name))
+    _prune(keep=key)
+
+
+def _prune(keep: str):
+    """Drops the least recently served snapshots beyond SNAPSHOT_MAX_KEYS (serve touches their metadata)."""
+    metas = []
+    for entry in os.scandir(SNAPSHOT_DIR):
+        if entry.name.endswith(".json") and entry.name != f"{keep}.json":
+            try:
+                metas.append((entry.stat().st_mtime, entry.name[:-len(".json")]))
+            except OSError:
+                continue
+    for _, key in sorted(metas, reverse=True)[max(0, SNAPSHOT_MAX_KEYS - 1):]:
+        _remove(_meta_path(key))
+        for name in os.listdir(SNAPSHOT_DIR):
+            if name.startswith(f"{key}-v") and name.endswith(".body"):
+                _remove(os.path.join(SNAPSHOT_DIR, name))
+
+
+def _build_job(key: str, scope: str, build_body):
+    import database
+
+    db = database.SessionLocal()
+    try:
+        build(db, key, scope, build_body)
+    except Exception:
+        logger.exception("Report snapshot build failed (%s)", key)
+        raise
+    finally:
+        db.close()
+        with _jobs_lock:
+            _jobs.pop(key, None)
+
+
+def refresh(key: str, scope: str, build_body):
+    """Queues a background build of a snapshot unless one is already running."""
+    global _executor
+    with _jobs_lock:
+        if key in _jobs:
+            return
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=max(1, SNAPSHOT_WORKERS), thread_name_prefix="report-snapshot")
+        _jobs[key] = _executor.submit(_build_job, key, scope, build_body)
+
+
+def serve(db, key: str, scope: str, build_body):
+    """
+    Snapshot to answer with when it is of the current data version.
+
+    A stale snapshot is rebuilt in the background; a missing one is built
+    once its key is requested a second time.
+
+    Args:
+        db: Database session (reads the current data version)
+        key: snapshot_key
+        scope: Data version scope of the project
+        build_body: See build; runs in a worker with its own session
+
+    Returns:
+        dict: Snapshot metadata (see load), or None to answer live
+    """
+    import crud
+
+    meta = load(key)
+    if meta is not None and meta["version"] == crud.get_data_version(db, scope):
+        try:
+            os.utime(_meta_path(key))  # Recently served: kept by _prune
+        except OSError:
+            pass
+        return meta
+    if meta is None:
+        with _jobs_lock:
+            first_request = _requested.pop(key, None) is None
+            if first_request:
+                _requested[key] = True
+                while len(_requested) > SNAPSHOT_MAX_KEYS:
+                    _requested.popitem(last=False)
+        if first_request:
+            return None
+    refresh(key, scope, build_body)
+    return None
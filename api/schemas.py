@@ -1,7 +1,7 @@
 from typing import Optional
-from typing import List, Optional, Literal
+from typing import Dict, List, Optional, Literal
 from uuid import UUID
-from pydantic import BaseModel, FilePath, field_validator, Field
+from pydantic import BaseModel, FilePath, field_validator, model_validator, Field
 from datetime import datetime
 import json
 
@@ -45,16 +45,41 @@ class RemediationUpdate(BaseModel):
     status: Optional[bool] = None
     control_tags: Optional[List[str]] = None
 
+class _StoredControlTags(list):
+    """Tags already normalized against the current catalog version."""
+
+
 class Remediation(RemediationBase):
     model_config = {"from_attributes": True}
     
     id: UUID
+
+    @model_validator(mode='before')
+    @classmethod
+    def trust_normalized_control_tags(cls, data):
+        """Skip re-validation when the ORM row was normalized against the current catalog."""
+        version = getattr(data, 'control_tags_version', None)
+        if not version or isinstance(data, dict):
+            return data
+        import standards
+        if version != standards.CATALOG_VERSION:
+            return data
+        try:
+            stored = json.loads(data.control_tags) if data.control_tags else []
+        except (json.JSONDecodeError, TypeError):
+            return data
+        values = {name: getattr(data, name) for name in cls.model_fields if hasattr(data, name)}
+        values['control_tags'] = _StoredControlTags(stored)
+        return values
     
     @field_validator('control_tags', mode='before')
     @classmethod
     def parse_control_tags(cls, v):
         """Parse control_tags from JSON string or return as-is if already a list.
-        Also validates and corrects tags (fixes orphans from old LLM output)."""
+        Also validates and corrects tags (fixes orphans from old LLM output)
+        unless they were normalized at write time."""
+        if isinstance(v, _StoredControlTags):
+            return list(v)
         if v is None:
             return []
         elif isinstance(v, str):
@@ -126,6 +151,7 @@ class Threat(BaseModel):
     remediation: Remediation
     risk: Risk
     current_risk_level: Optional[str] = None
+    created_at: Optional[datetime] = None
 
 class InformationSystem(InformationSystemBase):
     model_config = {"from_attributes": True}
@@ -137,6 +163,21 @@ class InformationSystem(InformationSystemBase):
     archived: bool = False
     threats: List[Threat] = []
 
+class InformationSystemSummary(InformationSystemBase):
+    """Sistema del listado: metadatos y conteos agregados, sin la lista de amenazas"""
+    model_config = {"from_attributes": True}
+
+    datetime: datetime
+    threat_count: int = 0
+    risk_counts: Dict[str, int] = {}  # Amenazas por nivel de riesgo actual
+    remediated_count: int = 0
+    remediation_ratio: float = 0.0
+
+
+class InformationSystemSummaryPage(BaseModel):
+    total: int
+    items: List[InformationSystemSummary]
+
 class ThreatWithSystem(BaseModel):
     model_config = {"from_attributes": True}
     
@@ -148,6 +189,32 @@ class ThreatWithSystem(BaseModel):
     risk: Risk
     information_system: InformationSystem  # Usar la clase ya definida arriba
     current_risk_level: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+
+class ReportSystem(BaseModel):
+    """Sistema de una fila del reporte: solo lo necesario para identificarlo (sin sus amenazas)"""
+    model_config = {"from_attributes": True}
+
+    id: UUID
+    title: str
+    project_id: Optional[UUID] = None
+    project_name: Optional[str] = None
+
+
+class ThreatReportRow(BaseModel):
+    """Fila slim de /report (view=slim o fields=): el sistema no arrastra sus amenazas hermanas"""
+    model_config = {"from_attributes": True}
+
+    id: UUID
+    type: str
+    title: str
+    description: str
+    remediation: Remediation
+    risk: Risk
+    information_system: ReportSystem
+    current_risk_level: Optional[str] = None
+    created_at: Optional[datetime] = None
 
 
 class UserBase(BaseModel):
@@ -324,3 +391,59 @@ class DashboardStats(BaseModel):
     standards_coverage: StandardsCoverage
     standards_remediation: StandardsRemediation
     filtered_by_project: Optional[str] = None
+    crosswalk: bool = False  # Coverage includes standards reached through the crosswalk
+
+
+# =====================================================
+# GAP ANALYSIS SCHEMAS
+# =====================================================
+
+class GapAnalysisStandard(BaseModel):
+    standard: str
+    total_controls: int
+    covered: int  # Controls referenced by any remediation
+    remediated: int  # Controls referenced by completed remediations
+    coverage: float
+    remediated_coverage: float
+    uncovered: Optional[List[str]] = None  # No remediation at all
+    pending: Optional[List[str]] = None  # Only open remediations
+
+
+class GapAnalysisSystem(BaseModel):
+    id: UUID
+    title: Optional[str] = None
+    threats: int
+    standards: List[GapAnalysisStandard]
+
+
+class GapAnalysis(BaseModel):
+    project_id: Optional[UUID] = None
+    information_system_id: Optional[UUID] = None
+    catalog_version: str
+    crosswalk: bool = False
+    systems_count: int
+    threats_count: int
+    standards: List[GapAnalysisStandard]
+    systems: List[GapAnalysisSystem] = []
+
+
+class CatalogControlIn(BaseModel):
+    """One control of a standard; any extra field is kept with the control."""
+    title: str
+    description: str = ""
+    category: str = ""
+    model_config = {"extra": "allow"}
+
+
+class CatalogStandardUpsert(BaseModel):
+    version: Optional[str] = None
+    controls: Dict[str, CatalogControlIn]
+    replace: bool = True  # False: merge into the existing controls
+
+
+class CatalogStandardResponse(BaseModel):
+    standard: str
+    version: Optional[str] = None
+    controls_count: int
+    revision: int
+    catalog_version: str
@@ -0,0 +1,133 @@
+# Section-level diff for incremental re-evaluation
+"""
+Compares two versions of a textual system description at section level so
+that only what changed has to be sent back to the model.
+
+A section starts at a Markdown heading (``# ...``) or, when the document has
+no headings, at each blank-line separated paragraph.
+"""
+
+import difflib
+import re
+import unicodedata
+
+_HEADING_RE = re.compile(r'^\s{0,3}#{1,6}\s+\S')
+_BLANK_SPLIT_RE = re.compile(r'\n\s*\n')
+_WS_RE = re.compile(r'\s+')
+
+
+def split_sections(text):
+    """
+    Splits a description into sections.
+
+    Args:
+        text (str): Full description
+
+    Returns:
+        list: Section strings in document order (empty sections removed)
+    """
+    if not text or not text.strip():
+        return []
+
+    lines = text.replace('\r\n', '\n').split('\n')
+    if any(_HEADING_RE.match(line) for line in lines):
+        sections, current = [], []
+        for line in lines:
+            if _HEADING_RE.match(line) and current:
+                sections.append('\n'.join(current))
+                current = []
+            current.append(line)
+        if current:
+            sections.append('\n'.join(current))
+    else:
+        sections = _BLANK_SPLIT_RE.split(text.replace('\r\n', '\n'))
+
+    return [s.strip() for s in sections if s.strip()]
+
+
+def _section_key(section):
+    """Whitespace-insensitive key so reflowed text does not count as a change."""
+    return _WS_RE.sub(' ', section).strip().lower()
+
+
+def diff_sections(old_text, new_text):
+    """
+    Returns the indexes (in the new document) of sections that were added or modified.
+
+    Args:
+        old_text (str): Previously analyzed description
+        new_text (str): New description
+
+    Returns:
+        tuple: (new_sections, changed_indexes)
+    """
+    old_sections = split_sections(old_text)
+    new_sections = split_sections(new_text)
+
+    matcher = difflib.SequenceMatcher(
+        a=[_section_key(s) for s in old_sections],
+        b=[_section_key(s) for s in new_sections],
+        autojunk=False,
+    )
+    changed = []
+    for tag, _i1, _i2, j1, j2 in matcher.get_opcodes():
+        if tag in ('replace', 'insert'):
+            changed.extend(range(j1, j2))
+    return new_sections, changed
+
+
+def _first_line(section):
+    return section.split('\n', 1)[0].strip()
+
+
+def build_incremental_content(old_text, new_text, context=1):
+    """
+    Builds the text sent to the model when re-evaluating a description.
+
+    Only changed sections are included verbatim; up to ``context`` neighbouring
+    sections on each side are included by their first line so the model knows
+    where the change sits in the document.
+
+    Args:
+        old_text (str): Previously analyzed description
+        new_text (str): New description
+        context (int): Neighbouring sections to reference around each change
+
+    Returns:
+        tuple: (content or None when nothing changed, number of changed sections)
+    """
+    sections, changed = diff_sections(old_text, new_text)
+    if not changed:
+        return None, 0
+
+    changed_set = set(changed)
+    context_set = set()
+    for idx in changed:
+        for offset in range(1, context + 1):
+            for neighbour in (idx - offset, idx + offset):
+                if 0 <= neighbour < len(sections) and neighbour not in changed_set:
+                    context_set.add(neighbour)
+
+    parts = [
+        "Esta es una re-evaluación incremental. Solo las secciones marcadas como "
+        "MODIFICADA cambiaron desde el último análisis; las secciones de contexto "
+        "ya fueron analizadas. Identifica únicamente amenazas introducidas o "
+        "afectadas por las secciones modificadas."
+    ]
+    for idx in sorted(changed_set | context_set):
+        if idx in changed_set:
+            parts.append(f"[MODIFICADA]\n{sections[idx]}")
+        else:
+            parts.append(f"[CONTEXTO] {_first_line(sections[idx])}")
+
+    return "\n\n".join(parts), len(changed)
+
+
+def threat_signature(title, stride_type):
+    """
+    Accent-, case- and whitespace-insensitive identity of a threat, used to
+    reconcile model output against threats that already exist.
+    """
+    folded = unicodedata.normalize('NFKD', title or '')
+    folded = ''.join(c for c in folded if not unicodedata.combining(c))
+    return (str(stride_type or '').lower(), _WS_RE.sub(' ', folded).strip().lower())
@@ -8,32 +8,108 @@ Convention:
 - File: standard_name.py  
 - Variable: STANDARD_NAME_CONTROLS (uppercase)
 - Example: asvs.py -> ASVS_CONTROLS, iso27001.py -> ISO27001_CONTROLS
+- Files whose name is not a Python identifier (e.g. sbs.backup.py) or that
+  start with '_' (helper modules) are not standards and are skipped.
+
+The standards are compiled (controls plus every derived index) into one
+compact binary snapshot next to this module (see _compact.py), keyed by a
+hash of the source files. Workers and CLI scripts memory-map it instead of
+importing and indexing every standard, and all worker processes share the
+same physical pages. ALL_CONTROLS, STANDARDS_MAP, TAGS_MAP, STANDARDS_VERSIONS,
+TAG_TO_STANDARD and TAG_RECORDS are read-only Mapping views over it.
+Rebuild explicitly with: python -m standards
+
+The API stores the catalog in the database (the modules are only the seed
+data, see crud.seed_standards_catalog) and hands it over with
+install_catalog(). A catalog and its derived indexes are immutable once
+installed; a change installs a new one with a single reference swap, and
+code running under pinned_catalog() keeps a consistent view meanwhile.
 """
 
 import os
 import re
+import json
+import hashlib
 import importlib
+from bisect import bisect_left
+from functools import cached_property, lru_cache
 from pathlib import Path
+from typing import Iterator
+
+from ._compact import (
+    CatalogReader, CatalogRef, CatalogWriter, CompactCatalog, TagRecord,
+    ControlsView, StandardsView, TagsMapView, StandardsVersionsView,
+    TagToStandardView, TagRecordsView, write_catalog,
+)
+from ._search import TagSearchIndex, Bm25Index, write_search_index, write_bm25_index
+from ._autocomplete import AutocompleteIndex
+from ._crosswalk import CrosswalkIndex, write_crosswalk
 
 # Get current directory path
 current_dir = Path(__file__).parent
 
-# Dictionaries that will be filled automatically
-ALL_CONTROLS = {}
-STANDARDS_MAP = {}
-TAGS_MAP = {}
-STANDARDS_VERSIONS = {}  # standard_name -> version string
+# Compiled catalog snapshot; TZU_CATALOG_SNAPSHOT="" disables the file (in-memory only)
+SNAPSHOT_FORMAT = 3  # Bump when the snapshot layout changes
+SNAPSHOT_PATH = os.environ.get("TZU_CATALOG_SNAPSHOT", str(current_dir / ".catalog_snapshot.bin"))
 
-def _load_standards_automatically():
+# Active compiled catalog; every view below reads through this reference
+_CATALOG_REF = CatalogRef()
+
+# Read-only views filled automatically (same interface as the former dicts)
+ALL_CONTROLS = ControlsView(_CATALOG_REF)
+STANDARDS_MAP = StandardsView(_CATALOG_REF)
+TAGS_MAP = TagsMapView(_CATALOG_REF)
+STANDARDS_VERSIONS = StandardsVersionsView(_CATALOG_REF)  # standard_name -> version string
+
+# Reverse indexes precomputed in the compiled catalog
+TAG_TO_STANDARD = TagToStandardView(_CATALOG_REF)  # tag_id -> standard_name
+TAG_RECORDS = TagRecordsView(_CATALOG_REF)         # tag_id -> TagRecord
+
+# Memoized helpers whose results depend on the catalog; cleared on every rebuild
+_CATALOG_CACHES = []
+
+# CATALOG_VERSION is the stamp stored with normalized control tags. It changes
+# whenever the catalog (tag IDs, standards, versions) or the correction rules
+# below change, and is read from the active catalog (see __getattr__).
+_TAG_RULES_VERSION = "1"  # Bump when validate_and_correct_control_tags changes behavior
+
+# 'V2.1.1 (ASVS)' -> ('V2.1.1', 'ASVS')
+_FORMATTED_TAG_RE = re.compile(r'^(.+?)\s*\(([^)]+)\)\s*$')
+_SBS_SUBPOINT_RE = re.compile(r'^(SBS-\d+-\d+)\.\d+$')
+_SBS_TAG_RE = re.compile(r'^SBS-(\d+)-(\d+)$')
+
+
+def _discover_standard_files() -> list:
+    """Standard modules in a stable order: public identifiers only."""
+    return sorted(
+        f for f in os.listdir(current_dir)
+        if f.endswith('.py') and not f.startswith('_') and f[:-3].isidentifier()
+    )
+
+
+def _catalog_source_hash(standard_files: list) -> str:
     """
-    Automatically loads all standards from .py files in the standards/ folder
+    Hash of every file the compiled catalog depends on: the standard modules
+    and every module of the package (index builders such as _search.py and
+    _autocomplete.py included, whether they exist now or are added later).
     """
-    global ALL_CONTROLS, STANDARDS_MAP, TAGS_MAP, STANDARDS_VERSIONS
-    
-    # Find all .py files except __init__.py
-    standard_files = [f for f in os.listdir(current_dir) 
-                     if f.endswith('.py') and not f.startswith('__')]
-    
+    digest = hashlib.sha256(f"snapshot-format:{SNAPSHOT_FORMAT}".encode())
+    package_files = sorted(f for f in os.listdir(current_dir) if f.startswith('_') and f.endswith('.py'))
+    for file_name in [*standard_files, *package_files]:
+        digest.update(f"\n{file_name}\n".encode())
+        digest.update((current_dir / file_name).read_bytes())
+    return digest.hexdigest()
+
+
+def _import_standard_modules(standard_files: list):
+    """
+    Imports every standard module (source of truth for the compiled catalog).
+
+    Returns:
+        tuple: (standards_map, standards_versions, loaded_standards)
+    """
+    standards_map = {}
+    standards_versions = {}
     loaded_standards = []
     
     for file_name in standard_files:
@@ -55,16 +131,10 @@ def _load_standards_automatically():
                 
                 # Load version if defined in the module
                 if hasattr(module, 'VERSION'):
-                    STANDARDS_VERSIONS[standard_name] = module.VERSION
+                    standards_versions[standard_name] = module.VERSION
                 
                 # Add to standards mapping
-                STANDARDS_MAP[standard_name] = controls
-                
-                # Create tags list
-                TAGS_MAP[f"{standard_name}_TAGS"] = list(controls.keys())
-                
-                # Add to ALL_CONTROLS
-                ALL_CONTROLS.update(controls)
+                standards_map[standard_name] = controls
                 
                 loaded_standards.append(f"{standard_name} ({len(controls)} controls)")
                 
@@ -74,19 +144,276 @@ def _load_standards_automatically():
                 
         except Exception as e:
             print(f"❌ Error loading {file_name}: {e}")
-    
+
+    return standards_map, standards_versions, loaded_standards
+
+
+def _compile_catalog(standards_map: dict, standards_versions: dict, loaded_standards: list,
+                     source_hash: str = "") -> bytes:
+    """Compiles the controls and every derived index into the compact layout."""
+    writer = CatalogWriter()
+    all_controls = write_catalog(writer, standards_map, standards_versions)
+    write_search_index(writer, all_controls)
+    write_bm25_index(writer, all_controls)
+    write_crosswalk(writer, standards_map, all_controls)
+
+    digest = hashlib.sha256(_TAG_RULES_VERSION.encode())
+    for standard_name, controls in standards_map.items():
+        digest.update(f"\n{standard_name}:{standards_versions.get(standard_name, '')}".encode())
+        for tag_id in controls:
+            digest.update(f"|{tag_id}".encode())
+
+    return writer.to_bytes({
+        "format": SNAPSHOT_FORMAT,
+        "source_hash": source_hash,
+        "catalog_version": digest.hexdigest()[:16],
+        "loaded_standards": loaded_standards,
+    })
+
+
+class _LoadedCatalog(CompactCatalog):
+    """
+    A compiled catalog with the indexes derived from it. Never mutated after
+    construction, so a reader holding it sees one consistent catalog.
+    """
+
+    def __init__(self, reader: CatalogReader):
+        super().__init__(reader)
+        self.version = self.meta["catalog_version"]
+        self.search = TagSearchIndex(self)
+        self.bm25 = Bm25Index(self)  # rag_lite_suggest
+        self.crosswalk = CrosswalkIndex(self)
+        self._tag_bits = {}  # (tag_id, crosswalk) -> bitset, filled on use
+
+        # SBS nearest-number correction: per resolution, control numbers sorted for bisect
+        by_resolution = {}
+        if "SBS" in self.standard_index:
+            for ordinal in self.standard_ordinals("SBS"):
+                tag_id = self.tag_ids[ordinal]
+                m = _SBS_TAG_RE.match(tag_id)
+                if m:
+                    by_resolution.setdefault(m.group(1), []).append((int(m.group(2)), tag_id))
+        self.sbs_by_resolution = {}  # resolution -> (sorted control numbers, matching tag IDs)
+        for resolution, entries in sorted(by_resolution.items()):
+            entries.sort()
+            self.sbs_by_resolution[resolution] = (
+                [number for number, _ in entries],
+                [tag_id for _, tag_id in entries],
+            )
+
+    @cached_property
+    def standard_bits(self) -> dict:
+        """Standard name -> bitset of its controls (bit n = ordinal n)."""
+        masks = {}
+        for name in self.standard_index:
+            mask = 0
+            for ordinal in self.standard_ordinals(name):
+                mask |= 1 << ordinal
+            masks[name] = mask
+        return masks
+
+    def tag_bits(self, tag_id: str, crosswalk: bool = False) -> int:
+        """Bitset of a tag (plus its crosswalk controls); 0 if unknown."""
+        bits = self._tag_bits.get((tag_id, crosswalk))
+        if bits is None:
+            ordinal = self.ordinal(tag_id)
+            if ordinal is None:
+                return 0
+            bits = 1 << ordinal
+            if crosswalk:
+                for related in self.crosswalk.related(tag_id):
+                    bits |= 1 << related
+            self._tag_bits[(tag_id, crosswalk)] = bits
+        return bits
+
+    @cached_property
+    def autocomplete(self) -> AutocompleteIndex:
+        # Built on first use: only the API's tag picker needs it
+        return AutocompleteIndex(self)
+
+
+# Attributes of the module that are read from the active (or pinned) catalog
+_CATALOG_ATTRIBUTES = {
+    "CATALOG_VERSION": "version",
+    "_SEARCH_INDEX": "search",
+    "_BM25_INDEX": "bm25",
+    "_SBS_BY_RESOLUTION": "sbs_by_resolution",
+}
+
+
+# Per-standard names kept for backward compatibility: ASVS_CONTROLS, ASVS_TAGS...
+_STANDARD_ATTRIBUTE_RE = re.compile(r'^([A-Z][A-Z0-9_]*)_(CONTROLS|TAGS)$')
+
+
+def __getattr__(name):
+    if name in _CATALOG_ATTRIBUTES:
+        return getattr(_CATALOG_REF.catalog, _CATALOG_ATTRIBUTES[name])
+    # Resolved on every access, so they follow install_catalog() and pinned_catalog()
+    m = _STANDARD_ATTRIBUTE_RE.match(name)
+    if m and m.group(1) in STANDARDS_MAP:
+        controls = STANDARDS_MAP[m.group(1)]
+        return controls if m.group(2) == "CONTROLS" else list(controls)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    names = [f"{std}_{suffix}" for std in STANDARDS_MAP for suffix in ("CONTROLS", "TAGS")]
+    return sorted([*globals(), *_CATALOG_ATTRIBUTES, *names])
+
+
+def _install_catalog(reader: CatalogReader):
+    """
+    Makes reader the active catalog (views, search/BM25 indexes, SBS
+    correction index and CATALOG_VERSION) and clears catalog-dependent caches.
+    Contexts under pinned_catalog() keep the previous one until they exit.
+    """
+    _CATALOG_REF.catalog = _LoadedCatalog(reader)
+    for cached in _CATALOG_CACHES:
+        cached.cache_clear()
+
+
+def pinned_catalog(latest: bool = False):
+    """
+    Context manager that keeps the current catalog for the current context
+    (e.g. one request), so a catalog installed meanwhile is not observed
+    halfway through it.
+
+    Args:
+        latest: Pin the latest installed catalog instead (e.g. to answer with
+            a change made by the same request)
+    """
+    return _CATALOG_REF.pinned(latest)
+
+
+def _read_snapshot(path: str, source_hash: str):
+    """Memory-maps the snapshot at path if it matches the current sources, else None."""
+    try:
+        reader = CatalogReader.open(path)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f"⚠️  Ignoring unreadable catalog snapshot {path}: {e}")
+        return None
+    if reader.meta.get("format") != SNAPSHOT_FORMAT or reader.meta.get("source_hash") != source_hash:
+        return None
+    return reader
+
+
+def _write_snapshot(path: str, data: bytes) -> bool:
+    """Writes the snapshot atomically; failures (read-only FS) are not fatal."""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        return True
+    except OSError as e:
+        print(f"⚠️  Could not write catalog snapshot {path}: {e}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        return False
+
+
+def build_catalog_snapshot(path: str = None) -> list:
+    """
+    Imports the standard modules, compiles the catalog, writes the snapshot
+    and installs it (memory-mapped from the file when it could be written).
+
+    Args:
+        path: Snapshot file (defaults to SNAPSHOT_PATH; empty = in memory only)
+
+    Returns:
+        list: Loaded standards, e.g. ['ASVS (94 controls)', ...]
+    """
+    standard_files = _discover_standard_files()
+    standards_map, standards_versions, loaded_standards = _import_standard_modules(standard_files)
+    source_hash = _catalog_source_hash(standard_files)
+    data = _compile_catalog(standards_map, standards_versions, loaded_standards, source_hash)
+
+    path = path if path is not None else SNAPSHOT_PATH
+    reader = None
+    if path and _write_snapshot(path, data):
+        reader = _read_snapshot(path, source_hash)
+    _install_catalog(reader or CatalogReader(data))
+    return loaded_standards
+
+
+def _catalog_data_hash(standards_map: dict, standards_versions: dict) -> str:
+    """Hash of the catalog contents (for catalogs that do not come from the modules)."""
+    digest = hashlib.sha256(_catalog_source_hash([]).encode())  # indexing code
+    for standard_name, controls in standards_map.items():
+        digest.update(json.dumps(
+            [standard_name, standards_versions.get(standard_name), controls],
+            ensure_ascii=False, sort_keys=True,
+        ).encode())
+    return digest.hexdigest()
+
+
+def install_catalog(standards_map: dict, standards_versions: dict) -> str:
+    """
+    Compiles and installs a catalog given as data (e.g. loaded from the
+    database) instead of the standard modules.
+
+    The compiled file is named after a hash of the contents, next to
+    SNAPSHOT_PATH, so the first worker that sees a change compiles it and the
+    others memory-map the same file.
+
+    Args:
+        standards_map: {standard_name: {tag_id: {title, description, category, ...}}}
+        standards_versions: {standard_name: version}
+
+    Returns:
+        str: CATALOG_VERSION of the installed catalog
+    """
+    data_hash = _catalog_data_hash(standards_map, standards_versions)
+    path = f"{SNAPSHOT_PATH}.{data_hash[:16]}" if SNAPSHOT_PATH else ""
+
+    reader = _read_snapshot(path, data_hash) if path else None
+    if reader is None:
+        loaded_standards = [f"{name} ({len(controls)} controls)" for name, controls in standards_map.items()]
+        data = _compile_catalog(standards_map, standards_versions, loaded_standards, data_hash)
+        if path and _write_snapshot(path, data):
+            _remove_stale_data_snapshots(path)
+            reader = _read_snapshot(path, data_hash)
+        reader = reader or CatalogReader(data)
+    _install_catalog(reader)
+    return _CATALOG_REF.catalog.version
+
+
+def _remove_stale_data_snapshots(current_path: str):
+    """Deletes files of previous data catalogs (processes still mapping them keep their pages)."""
+    current = Path(current_path)
+    for path in current.parent.glob(f"{Path(SNAPSHOT_PATH).name}.*"):
+        if path != current and not path.name.endswith(".tmp"):
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+
+def _load_standards_automatically():
+    """
+    Loads all standards from .py files in the standards/ folder, from the
+    compiled snapshot when it is up to date with the sources.
+    """
+    if SNAPSHOT_PATH:
+        reader = _read_snapshot(SNAPSHOT_PATH, _catalog_source_hash(_discover_standard_files()))
+        if reader is not None:
+            _install_catalog(reader)
+            loaded_standards = reader.meta["loaded_standards"]
+            print(f"🎯 Catalog snapshot loaded: {len(ALL_CONTROLS)} controls from {len(loaded_standards)} standards")
+            return loaded_standards
+
+    loaded_standards = build_catalog_snapshot()
+
     print(f"\n🎯 Automatic system loaded: {len(ALL_CONTROLS)} controls from {len(loaded_standards)} standards")
     return loaded_standards
 
 # Load all standards automatically
 _loaded_standards = _load_standards_automatically()
 
-# Create dynamic variables for backward compatibility
-for standard_name in STANDARDS_MAP.keys():
-    # Create variables like ASVS_CONTROLS, MASVS_CONTROLS, etc.
-    globals()[f"{standard_name}_CONTROLS"] = STANDARDS_MAP[standard_name]
-    globals()[f"{standard_name}_TAGS"] = list(STANDARDS_MAP[standard_name].keys())
-
 # STRIDE Control Examples — one real tag per relevant standard per category
 STRIDE_CONTROL_EXAMPLES = {
     "SPOOFING": ["V2.1.1", "V2.2.1", "AUTH-1", "A.9.1.1", "PR.AC-1", "SBS-504-8"],
@@ -111,10 +438,7 @@ def get_standard_from_tag_id(tag_id: str) -> str:
     Returns:
         str: Standard name (e.g.: 'ASVS', 'MASVS')
     """
-    for standard_name, controls in STANDARDS_MAP.items():
-        if tag_id in controls:
-            return standard_name
-    return ""  # If not found
+    return TAG_TO_STANDARD.get(tag_id, "")  # "" if not found
 
 def normalize_tag_for_lookup(tag: str) -> str:
     """
@@ -133,8 +457,7 @@ def normalize_tag_for_lookup(tag: str) -> str:
     
     tag = tag.strip()
     # Strip standard suffix like " (ASVS)" or "(ISO27001)"
-    import re as _re_local
-    m = _re_local.match(r'^(.+?)\s*\([^)]+\)\s*$', tag)
+    m = _FORMATTED_TAG_RE.match(tag)
     if m:
         tag = m.group(1).strip()
     # Normalize MASVS v2.0 prefix: "MASVS-AUTH-2" → "AUTH-2"
@@ -156,23 +479,13 @@ def get_tag_details(tag: str) -> dict:
     Returns:
         dict: Dictionary with title, description, category and standard, or None if not found
     """
-    normalized_tag = normalize_tag_for_lookup(tag)
-    control_details = ALL_CONTROLS.get(normalized_tag)
-    
-    if control_details is None:
+    catalog = _CATALOG_REF.catalog
+    ordinal = catalog.ordinal(normalize_tag_for_lookup(tag))
+    if ordinal is None:
         return None
-    
-    # Find which standard this tag belongs to
-    standard = None
-    for standard_name, controls in STANDARDS_MAP.items():
-        if normalized_tag in controls:
-            standard = standard_name
-            break
-    
-    # Create a copy of the dictionary and add the standard field
-    result = control_details.copy()
-    result["standard"] = standard
-    return result
+    details = catalog.control(catalog.controls[ordinal])
+    details["standard"] = catalog.standard_of(ordinal)
+    return details
 
 def format_tag_for_display(tag: str) -> str:
     """
@@ -184,12 +497,9 @@ def format_tag_for_display(tag: str) -> str:
     Returns:
         str: Tag formatted with standard name in parentheses (e.g., "V2.1.1 (ASVS)")
     """
-    normalized_tag = normalize_tag_for_lookup(tag)
-    
-    # Find which standard this tag belongs to
-    for standard_name, controls in STANDARDS_MAP.items():
-        if normalized_tag in controls:
-            return f"{tag} ({standard_name})"
+    standard_name = TAG_TO_STANDARD.get(normalize_tag_for_lookup(tag))
+    if standard_name:
+        return f"{tag} ({standard_name})"
     
     # If not found in any standard, return tag as-is
     return tag
@@ -223,16 +533,13 @@ def get_suggested_tags_for_stride(stride_category: str) -> list:
     # Create complete objects for each tag
     results = []
     for tag_id in raw_tags:
-        tag_info = ALL_CONTROLS.get(tag_id, {})
-        formatted_tag = format_tag_for_display(tag_id)
-        if formatted_tag:
+        record = TAG_RECORDS.get(tag_id)
+        if record is not None:
+            results.append(record._asdict())
+        else:
             results.append({
-                "tag": formatted_tag,
-                "tag_id": tag_id,
-                "title": tag_info.get('title', ''),
-                "description": tag_info.get('description', ''),
-                "category": tag_info.get('category', ''),
-                "standard": get_standard_from_tag_id(tag_id)  # Extract automatically
+                "tag": tag_id, "tag_id": tag_id, "title": '',
+                "description": '', "category": '', "standard": ''
             })
     return results
 
@@ -250,16 +557,9 @@ def categorize_tags(tags: list) -> dict:
     categorized['UNKNOWN'] = []
     
     for tag in tags:
-        found = False
-        
-        for standard_name, controls in STANDARDS_MAP.items():
-            if tag in controls:
-                categorized[standard_name].append(tag)
-                found = True
-                break
-        
-        if not found:
-            categorized['UNKNOWN'].append(tag)
+        # 'V2.1.1 (ASVS)' and 'V2.1.1' belong to the same control
+        standard_name = TAG_TO_STANDARD.get(normalize_tag_for_lookup(tag))
+        categorized[standard_name or 'UNKNOWN'].append(tag)
     
     # Remove empty categories
     return {k: v for k, v in categorized.items() if v}
@@ -267,7 +567,8 @@ def categorize_tags(tags: list) -> dict:
 def search_predefined_tags(query: str) -> list:
     """
     Search predefined tags that match the query.
-    Searches in: tag ID, title, description and also by standard.
+    Searches in: tag ID, title, description, category and also by standard,
+    using the n-gram index built at catalog load.
     
     Args:
         query: Search term
@@ -279,9 +580,7 @@ def search_predefined_tags(query: str) -> list:
         return []
     
     # If the query is already formatted (contains parentheses), extract the base tag
-    import re
-    formatted_pattern = r'^(.+?)\s*\([^)]+\)$'
-    match = re.match(formatted_pattern, query.strip())
+    match = _FORMATTED_TAG_RE.match(query.strip())
     if match:
         # It's a formatted tag like "V2.1.1 (ASVS)", extract the base part
         base_query = match.group(1).strip()
@@ -289,44 +588,105 @@ def search_predefined_tags(query: str) -> list:
     else:
         query_lower = query.lower()
     
-    all_tags = list(ALL_CONTROLS.keys())
-    
-    # Search for exact matches first, then partial matches
-    exact_matches = [tag for tag in all_tags if query_lower == tag.lower()]
-    partial_matches = [tag for tag in all_tags if query_lower in tag.lower() and tag not in exact_matches]
-    
-    # Search by standard (e.g.: searching "ASVS" returns all ASVS tags)
-    standard_matches = []
-    query_upper = query.upper()
-    if query_upper in STANDARDS_MAP:
-        # If the query is exactly a standard, return all its tags
-        standard_matches = list(STANDARDS_MAP[query_upper])
-    else:
-        # If the query contains part of a standard, search tags from that standard
-        for standard_name, tags in STANDARDS_MAP.items():
-            if query_upper in standard_name:
-                standard_matches.extend(tags)
-    
-    # Also search in titles and descriptions
-    content_matches = []
-    for tag, info in ALL_CONTROLS.items():
-        if tag not in exact_matches and tag not in partial_matches and tag not in standard_matches:
-            if (query_lower in info.get("title", "").lower() or 
-                query_lower in info.get("description", "").lower()):
-                content_matches.append(tag)
-    
-    # Combine results with priority: exact, partial, by standard, by content
-    results = exact_matches + partial_matches + standard_matches + content_matches
-    
-    # Remove duplicates maintaining order
-    seen = set()
-    unique_results = []
-    for tag in results:
-        if tag not in seen:
-            seen.add(tag)
-            unique_results.append(tag)
-    
-    return unique_results[:50]  # Increase limit for standard searches
+    # Priority: exact, partial (tag ID), by standard (e.g.: "ASVS" returns
+    # all ASVS tags), by content (title, description, category)
+    return _CATALOG_REF.catalog.search.search(query_lower, query.upper(), limit=50)
+
+def autocomplete_tags(query: str, limit: int = 10) -> list:
+    """
+    Autocomplete for the tag picker: tags whose ID or title words start with
+    what the user typed, ignoring accents and tolerating small typos
+    (see standards._autocomplete).
+
+    Args:
+        query: Text typed so far (e.g. 'V2.1', 'auth-', 'autenticacion')
+        limit: Maximum number of results
+
+    Returns:
+        list: Matching tag IDs, best first
+    """
+    return _CATALOG_REF.catalog.autocomplete.complete(query or '', limit=limit)
+
+def get_crosswalk(tag: str, standards: list = None) -> dict:
+    """
+    Equivalent controls of other standards (see standards._crosswalk), e.g.
+    which NIST CSF and ISO 27001 controls an ASVS control also covers.
+
+    Args:
+        tag: Tag ID, plain or formatted (e.g. 'V2.1.1', 'V2.1.1 (ASVS)')
+        standards: Only these standards (all when None)
+
+    Returns:
+        dict: {standard_name: [tag IDs]} in catalog order, {} if the tag is
+            unknown or not mapped
+    """
+    catalog = _CATALOG_REF.catalog
+    wanted = {s.upper() for s in standards} if standards else None
+    result = {}
+    for ordinal in catalog.crosswalk.related(normalize_tag_for_lookup(tag)):
+        standard_name = catalog.standard_of(ordinal)
+        if wanted is None or standard_name in wanted:
+            result.setdefault(standard_name, []).append(catalog.tag_ids[ordinal])
+    return result
+
+def crosswalk_standards(tags: list) -> set:
+    """
+    Standards covered by a list of tags, directly or through the crosswalk
+    (used by the dashboard coverage).
+
+    Args:
+        tags: Tag IDs, plain or formatted
+
+    Returns:
+        set: Standard names
+    """
+    crosswalk = _CATALOG_REF.catalog.crosswalk
+    covered = set()
+    for tag in tags or []:
+        covered |= crosswalk.standards_of(normalize_tag_for_lookup(tag))
+    return covered
+
+def control_tags_bitset(tags: list, crosswalk: bool = False) -> int:
+    """
+    Bitset of the controls referenced by tags: bit n is the control at
+    ordinal n of ALL_CONTROLS (used by the gap analysis).
+
+    Args:
+        tags: Tag IDs, plain or formatted; unknown tags are ignored
+        crosswalk: Also set the bits of the equivalent controls of other standards
+
+    Returns:
+        int: Bitset
+    """
+    catalog = _CATALOG_REF.catalog
+    bits = 0
+    for tag in tags or []:
+        bits |= catalog.tag_bits(normalize_tag_for_lookup(tag), crosswalk)
+    return bits
+
+def standard_bitset(standard: str) -> int:
+    """
+    Bitset of every control of a standard (0 if the standard does not exist).
+
+    Args:
+        standard: Standard name (e.g. 'ASVS')
+    """
+    return _CATALOG_REF.catalog.standard_bits.get(standard.upper(), 0)
+
+def bitset_tags(bits: int) -> list:
+    """
+    Tag IDs of the bits set in a bitset, in catalog order.
+
+    Args:
+        bits: Bitset built with control_tags_bitset / standard_bitset
+    """
+    tag_ids = _CATALOG_REF.catalog.tag_ids
+    result = []
+    while bits:
+        lowest = bits & -bits
+        result.append(tag_ids[lowest.bit_length() - 1])
+        bits ^= lowest
+    return result
 
 def get_all_predefined_tags() -> list:
     """
@@ -335,19 +695,7 @@ def get_all_predefined_tags() -> list:
     Returns:
         list: List of objects with complete tag information
     """
-    results = []
-    for tag_id, tag_info in ALL_CONTROLS.items():
-        formatted_tag = format_tag_for_display(tag_id)
-        if formatted_tag:
-            results.append({
-                "tag": formatted_tag,
-                "tag_id": tag_id,
-                "title": tag_info.get('title', ''),
-                "description": tag_info.get('description', ''),
-                "category": tag_info.get('category', ''),
-                "standard": get_standard_from_tag_id(tag_id)  # Extract automatically
-            })
-    return results
+    return [record._asdict() for record in TAG_RECORDS.values()]
 
 def get_tags_by_standard(standard: str) -> list:
     """
@@ -402,10 +750,12 @@ def get_standards_catalog_for_prompt() -> str:
 
 def rag_lite_suggest(context_text: str, top_n_per_standard: int = 4) -> dict:
     """
-    Keyword-based pre-filter (RAG lite): scores every control in ALL_CONTROLS
-    against the query text and returns the top N per standard.
+    Keyword-based pre-filter (RAG lite): ranks every control in ALL_CONTROLS
+    against the query text with BM25 and returns the top N per standard.
 
-    No external dependencies — pure Python token-overlap scoring.
+    No external dependencies — the corpus is tokenized once at catalog load
+    (see standards._search.Bm25Index), each call only walks the postings of
+    the query terms.
 
     Args:
         context_text: Combined threat context (system description, STRIDE hints, etc.)
@@ -414,47 +764,23 @@ def rag_lite_suggest(context_text: str, top_n_per_standard: int = 4) -> dict:
     Returns:
         dict: {standard_name: [{"tag": formatted, "title": str}, ...]}
     """
-    from collections import Counter
-
-    # Minimal stopwords (ES + EN)
-    _STOP = {
-        'de','la','el','en','y','a','los','del','se','las','por','un','para',
-        'con','una','su','al','lo','como','más','o','pero','sus','le','ha',
-        'me','si','sin','sobre','ser','e','no','que','es','son','muy','te',
-        'ya','ni','este','esta','son','fue','the','of','and','in','is','to',
-        'it','for','on','are','an','or','not','this','that','with','all',
-    }
-
-    def _tok(text):
-        return [t for t in re.findall(r'[a-záéíóúüña-z]{3,}', text.lower()) if t not in _STOP]
-
-    query_counter = Counter(_tok(context_text))
-    if not query_counter:
+    catalog = _CATALOG_REF.catalog
+    scores = catalog.bm25.scores(context_text or '')
+    if not scores:
         return {}
 
     per_standard: dict = {}
-
-    for tag_id, entry in ALL_CONTROLS.items():
-        ctrl_text = f"{entry.get('title','')} {entry.get('description','')} {entry.get('category','')}"
-        ctrl_counter = Counter(_tok(ctrl_text))
-        score = sum(min(query_counter[t], ctrl_counter[t]) for t in query_counter if t in ctrl_counter)
-        if score == 0:
-            continue
-        # Normalize by sqrt of control length to avoid bias toward long descriptions
-        ctrl_len = sum(ctrl_counter.values()) or 1
-        norm_score = score / (ctrl_len ** 0.5)
-
-        std = get_standard_from_tag_id(tag_id)
-        if not std:
-            continue
-        per_standard.setdefault(std, []).append((norm_score, tag_id, entry))
+    # Catalog order first, so equal scores keep the catalog order after the stable sort
+    for ordinal in sorted(scores):
+        record = catalog.record(ordinal)
+        per_standard.setdefault(record.standard, []).append((scores[ordinal], record))
 
     result = {}
     for std, items in per_standard.items():
         items.sort(key=lambda x: x[0], reverse=True)
         result[std] = [
-            {"tag": format_tag_for_display(tag_id) or tag_id, "title": entry.get("title", "")}
-            for _, tag_id, entry in items[:top_n_per_standard]
+            {"tag": record.tag, "title": record.title}
+            for _, record in items[:top_n_per_standard]
         ]
     return result
 
@@ -521,15 +847,13 @@ def get_standard_info(standard_name: str = None) -> dict:
 # CONTROL TAG VALIDATION & CORRECTION (Option B)
 # =====================================================
 
-import re as _re
-
 # Regex patterns that identify each standard's tag format
 _STANDARD_PATTERNS = {
-    "ASVS":     _re.compile(r'^V\d+\.\d+\.\d+$'),
-    "MASVS":    _re.compile(r'^[A-Z]+-\d+$'),
-    "NIST":     _re.compile(r'^([A-Z]{2,3}\.[A-Z]{2,3}-\d+|[A-Z]{2,3}-\d+(\(\d+\))?)$'),  # CSF and SP 800-53
-    "ISO27001": _re.compile(r'^(ISO27001-)?A\.\d+\.\d+\.\d+$'),
-    "SBS":      _re.compile(r'^SBS-\d{3,4}-\d+(\.\d+)?$'),  # 3 o 4 dígitos: SBS-504-1, SBS-2158-1
+    "ASVS":     re.compile(r'^V\d+\.\d+\.\d+$'),
+    "MASVS":    re.compile(r'^[A-Z]+-\d+$'),
+    "NIST":     re.compile(r'^([A-Z]{2,3}\.[A-Z]{2,3}-\d+|[A-Z]{2,3}-\d+(\(\d+\))?)$'),  # CSF and SP 800-53
+    "ISO27001": re.compile(r'^(ISO27001-)?A\.\d+\.\d+\.\d+$'),
+    "SBS":      re.compile(r'^SBS-\d{3,4}-\d+(\.\d+)?$'),  # 3 o 4 dígitos: SBS-504-1, SBS-2158-1
 }
 
 
@@ -538,7 +862,7 @@ def _parse_formatted_tag(formatted_tag: str):
     Parses 'V2.1.1 (ASVS)' → (tag_id='V2.1.1', standard_hint='ASVS').
     Also handles bare IDs like 'V2.1.1'.
     """
-    m = _re.match(r'^(.+?)\s*\(([^)]+)\)\s*$', formatted_tag.strip())
+    m = _FORMATTED_TAG_RE.match(formatted_tag.strip())
     if m:
         return m.group(1).strip(), m.group(2).strip().upper()
     return formatted_tag.strip(), None
@@ -552,7 +876,7 @@ def _detect_standard_from_pattern(tag_id: str) -> str:
     return ""
 
 
-def _closest_sbs_tag(tag_id: str) -> str | None:
+def _closest_sbs_tag(tag_id: str, catalog) -> str | None:
     """
     Given an invalid SBS tag, tries to find the closest valid SBS tag.
     Returns None if the resolution doesn't exist in our dict (caller will keep as-is).
@@ -562,39 +886,93 @@ def _closest_sbs_tag(tag_id: str) -> str | None:
     2. Same resolution → pick the one with the nearest control number.
     3. If the resolution is not in our dict at all → return None (keep original tag).
     """
-    sbs_tags = list(STANDARDS_MAP.get("SBS", {}).keys())
-    if not sbs_tags:
+    if "SBS" not in catalog.standard_index:
         return None
 
     # Strip dotted subpoints: SBS-2158-3.2 → SBS-2158-3
-    stripped = _re.sub(r'^(SBS-\d+-\d+)\.\d+$', r'\1', tag_id)
-    if stripped in STANDARDS_MAP.get("SBS", {}):
+    stripped = _SBS_SUBPOINT_RE.sub(r'\1', tag_id)
+    if catalog.entry_of("SBS", stripped) is not None:
         return stripped  # Direct hit after stripping subpoint
 
-    # Use stripped form for further matching (or original if unchanged)
-    candidate = stripped if stripped != tag_id else tag_id
-
     # Extract resolution and control number
-    m = _re.match(r'^SBS-(\d+)-(\d+)$', candidate)
-    if m:
-        resolution = m.group(1)
-        requested_num = int(m.group(2))
-        # Collect tags with the same resolution
-        same_res = []
-        for t in sbs_tags:
-            tm = _re.match(r'^SBS-(\d+)-(\d+)$', t)
-            if tm and tm.group(1) == resolution:
-                same_res.append((int(tm.group(2)), t))
-        if same_res:
-            # Resolution exists in our dict → correct to nearest control number
-            same_res.sort(key=lambda x: abs(x[0] - requested_num))
-            return same_res[0][1]
+    m = _SBS_TAG_RE.match(stripped)
+    if not m:
+        return None
+    indexed = catalog.sbs_by_resolution.get(m.group(1))
+    if not indexed:
         # Resolution not in our dict → return None to keep the tag as-is
         return None
 
+    # Resolution exists in our dict → correct to nearest control number
+    # (on a tie, the lower number wins)
+    numbers, tag_ids = indexed
+    requested_num = int(m.group(2))
+    pos = bisect_left(numbers, requested_num)
+    if pos == len(numbers):
+        return tag_ids[-1]
+    if pos > 0 and requested_num - numbers[pos - 1] <= numbers[pos] - requested_num:
+        return tag_ids[pos - 1]
+    return tag_ids[pos]
+
+
+def _display_tag(tag_id: str, catalog) -> str:
+    """format_tag_for_display against a given catalog."""
+    ordinal = catalog.ordinal(normalize_tag_for_lookup(tag_id))
+    if ordinal is None:
+        return tag_id
+    return f"{tag_id} ({catalog.standard_of(ordinal)})"
+
+
+@lru_cache(maxsize=4096)
+def _correct_control_tag(raw: str, catalog=None):
+    """
+    Validates/corrects a single raw tag (see validate_and_correct_control_tags).
+    Memoized: the same tags are seen over and over when serializing remediations.
+
+    Args:
+        raw: Raw tag
+        catalog: Catalog to check against (part of the cache key); the active one if None
+
+    Returns:
+        str | None: Tag in 'ID (STANDARD)' format, or None if it must be discarded
+    """
+    catalog = catalog or _CATALOG_REF.catalog
+    tag_id, standard_hint = _parse_formatted_tag(raw)
+
+    # 1. Exact match in our dictionary
+    if catalog.ordinal(tag_id) is not None:
+        return _display_tag(tag_id, catalog)
+
+    # 2. Determine effective standard, trusting the hint when provided.
+    # Without this, MAVSV's broad pattern ^[A-Z]+-\d+$ would match NIST SP 800-53
+    # tags like SC-8, AC-2, etc. before the NIST pattern is checked.
+    if standard_hint and standard_hint in _STANDARD_PATTERNS:
+        if _STANDARD_PATTERNS[standard_hint].match(tag_id):
+            detected_std = standard_hint  # hint is plausible — trust it
+        else:
+            detected_std = _detect_standard_from_pattern(tag_id)
+    else:
+        detected_std = _detect_standard_from_pattern(tag_id)
+    effective_std = detected_std or standard_hint or ""
+
+    if effective_std == "SBS":
+        # SBS is custom: try to correct to a real tag
+        corrected_id = _closest_sbs_tag(tag_id, catalog)
+        if corrected_id:
+            # Known resolution: use the corrected tag from our dict
+            return _display_tag(corrected_id, catalog)
+        # Unknown resolution: keep as-is (like NIST SP 800-53 tags not in our dict)
+        return f"{tag_id} (SBS)"
+    if effective_std in ("ASVS", "NIST", "ISO27001", "MASVS"):
+        # Well-known standard: accept the tag even if not in our mapping
+        return f"{tag_id} ({effective_std})"
+    # Unknown format → discard
     return None
 
 
+_CATALOG_CACHES.append(_correct_control_tag)
+
+
 def validate_and_correct_control_tags(tags: list) -> list:
     """
     Validates and corrects control tags returned by the LLM.
@@ -615,69 +993,77 @@ def validate_and_correct_control_tags(tags: list) -> list:
     """
     result = []
     seen = set()
+    catalog = _CATALOG_REF.catalog
 
     for raw in tags:
         if not isinstance(raw, str) or not raw.strip():
             continue
+        formatted = _correct_control_tag(raw, catalog)
+        if formatted and formatted not in seen:
+            seen.add(formatted)
+            result.append(formatted)
 
-        tag_id, standard_hint = _parse_formatted_tag(raw)
+    return result
 
-        # 1. Exact match in our dictionary
-        if tag_id in ALL_CONTROLS:
-            formatted = format_tag_for_display(tag_id)
-            if formatted and formatted not in seen:
-                seen.add(formatted)
-                result.append(formatted)
-            continue
 
-        # 2. Determine effective standard, trusting the hint when provided.
-        # Without this, MAVSV's broad pattern ^[A-Z]+-\d+$ would match NIST SP 800-53
-        # tags like SC-8, AC-2, etc. before the NIST pattern is checked.
-        if standard_hint and standard_hint in _STANDARD_PATTERNS:
-            if _STANDARD_PATTERNS[standard_hint].match(tag_id):
-                detected_std = standard_hint  # hint is plausible — trust it
-            else:
-                detected_std = _detect_standard_from_pattern(tag_id)
-        else:
-            detected_std = _detect_standard_from_pattern(tag_id)
-        effective_std = detected_std or standard_hint or ""
-
-        if effective_std == "SBS":
-            # SBS is custom: try to correct to a real tag
-            corrected_id = _closest_sbs_tag(tag_id)
-            if corrected_id:
-                # Known resolution: use the corrected tag from our dict
-                formatted = format_tag_for_display(corrected_id)
-            else:
-                # Unknown resolution: keep as-is (like NIST SP 800-53 tags not in our dict)
-                formatted = f"{tag_id} (SBS)"
-            if formatted and formatted not in seen:
-                seen.add(formatted)
-                result.append(formatted)
-        elif effective_std in ("ASVS", "NIST", "ISO27001", "MASVS"):
-            # Well-known standard: accept the tag even if not in our mapping
-            formatted = f"{tag_id} ({effective_std})"
-            if formatted not in seen:
-                seen.add(formatted)
-                result.append(formatted)
-        # else: unknown format → discard silently
 
-    return result
+def classify_control_tags(tags) -> Iterator[dict]:
+    """
+    Batch version of validate_and_correct_control_tags that reports what
+    happened to every distinct input tag (for bulk clean-ups).
+
+    The catalog is captured when called, so a lazily consumed (streamed)
+    result is consistent even if the catalog changes meanwhile.
+
+    Args:
+        tags: Iterable of raw tags (duplicates are reported once, non-strings skipped)
+
+    Returns:
+        Iterator[dict]: One item per distinct tag, in input order:
+            {"tag": raw, "normalized": 'ID (STANDARD)' or None,
+             "standard": str or None, "status": str} where status is
+            - 'valid': the control exists in the catalog
+            - 'corrected': replaced by the closest control of the catalog
+            - 'external': well-formed tag of a known standard, not in the catalog
+            - 'unknown': unrecognized format, discarded
+    """
+    catalog = _CATALOG_REF.catalog
+    unique = dict.fromkeys(tag for tag in tags if isinstance(tag, str) and tag.strip())
+    return _classify_control_tags(unique, catalog)
+
 
+def _classify_control_tags(tags, catalog):
+    for raw in tags:
+        normalized = _correct_control_tag(raw, catalog)
+        if normalized is None:
+            yield {"tag": raw, "normalized": None, "standard": None, "status": "unknown"}
+            continue
+        tag_id, standard = _parse_formatted_tag(normalized)
+        if catalog.ordinal(normalize_tag_for_lookup(tag_id)) is None:
+            status = "external"
+        elif tag_id == _parse_formatted_tag(raw)[0]:
+            status = "valid"
+        else:
+            status = "corrected"
+        yield {"tag": raw, "normalized": normalized, "standard": standard, "status": status}
 
 
 __all__ = [
     # Main dictionaries
     'ALL_CONTROLS', 'STANDARDS_MAP', 'STRIDE_CONTROL_EXAMPLES',
+    'TAG_TO_STANDARD', 'TAG_RECORDS', 'TagRecord', 'CATALOG_VERSION',
     
-    # Dynamic variables per standard (created automatically)
-    *[f"{std}_CONTROLS" for std in STANDARDS_MAP.keys()],
-    *[f"{std}_TAGS" for std in STANDARDS_MAP.keys()],
+    # Per-standard names (ASVS_CONTROLS, ASVS_TAGS...) are not listed: they
+    # depend on the installed catalog and are resolved by __getattr__
     
     # Utility functions
     'normalize_tag_for_lookup', 'get_tag_details', 'format_tag_for_display',
     'validate_control_tag', 'get_suggested_tags_for_stride', 'categorize_tags',
-    'search_predefined_tags', 'get_all_predefined_tags', 'get_tags_by_standard',
+    'search_predefined_tags', 'autocomplete_tags', 'get_crosswalk', 'crosswalk_standards',
+    'control_tags_bitset', 'standard_bitset', 'bitset_tags',
+    'get_all_predefined_tags', 'get_tags_by_standard',
     'get_available_standards', 'get_standards_catalog_for_prompt',
-    'get_standard_info', 'validate_and_correct_control_tags'
+    'get_standard_info', 'validate_and_correct_control_tags', 'classify_control_tags',
+    'get_standard_from_tag_id', 'build_catalog_snapshot',
+    'install_catalog', 'pinned_catalog'
 ]
@@ -0,0 +1,20 @@
+"""
+Build step for the compiled standards catalog.
+
+Usage:
+    python -m standards                  # writes the default snapshot
+    python -m standards /path/to/file    # writes it elsewhere
+"""
+
+import sys
+
+from . import build_catalog_snapshot, SNAPSHOT_PATH, ALL_CONTROLS
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else SNAPSHOT_PATH
+    if not path:
+        sys.exit("❌ No snapshot path (TZU_CATALOG_SNAPSHOT is empty)")
+    loaded = build_catalog_snapshot(path)
+    from . import CATALOG_VERSION
+    print(f"📦 Catalog snapshot written to {path}: {len(ALL_CONTROLS)} controls, "
+          f"{len(loaded)} standards, version {CATALOG_VERSION}")
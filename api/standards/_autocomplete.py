@@ -0,0 +1,163 @@
+"""
+Typo-tolerant prefix autocomplete over the catalog
+==================================================
+Helper module (not a standard). Used by the tag picker through
+/control-tags/search?mode=autocomplete.
+
+A character trie holds every accent-folded, lowercased tag ID ('v2.1.1',
+'auth-1', 'a.9.4.1') and title word ('autenticacion', 'session'). Every node
+keeps the ordinals (catalog positions) of the controls below it, so a prefix
+lookup is one walk down the trie.
+
+Words are matched as prefixes within a bounded edit distance: the trie is
+walked with one Levenshtein row per node and a branch is abandoned as soon as
+no prefix under it can be within the bound. Tag IDs (anything with a digit)
+are matched exactly: 'V2.1.2' one typo away from 'V2.1.1' is a different
+control, not a typo.
+"""
+
+import re
+import unicodedata
+
+_NON_WORD_RE = re.compile(r'[^a-z0-9]+')
+_FORMATTED_SUFFIX_RE = re.compile(r'\s*\([^)]*\)\s*$')
+
+# Kind of term a word matched, ranks ID matches before title matches
+ID_TERM, TITLE_TERM = 0, 1
+
+
+def fold(text: str) -> str:
+    """Lowercase without accents: 'Autenticación' -> 'autenticacion'."""
+    decomposed = unicodedata.normalize('NFKD', text.lower())
+    return ''.join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def max_typos(word: str) -> int:
+    """Edit distance allowed for a query word: none for IDs and short words."""
+    if any(c.isdigit() for c in word) or len(word) < 4:
+        return 0
+    return 1 if len(word) < 8 else 2
+
+
+class _Node:
+    __slots__ = ('children', 'ordinals')
+
+    def __init__(self):
+        self.children = {}
+        self.ordinals = {}  # ordinal -> best (lowest) term kind in the subtree
+
+
+class AutocompleteIndex:
+    """Prefix trie over the tag IDs and title words of a catalog."""
+
+    def __init__(self, catalog):
+        self.tag_ids = catalog.tag_ids
+        self._root = _Node()
+        for ordinal, tag_id in enumerate(self.tag_ids):
+            self._insert(fold(tag_id), ordinal, ID_TERM)
+            for word in _NON_WORD_RE.split(fold(catalog.record(ordinal).title)):
+                if len(word) >= 2:
+                    self._insert(word, ordinal, TITLE_TERM)
+
+    def _insert(self, term: str, ordinal: int, kind: int):
+        node = self._root
+        for char in term:
+            node = node.children.setdefault(char, _Node())
+            if node.ordinals.get(ordinal, kind + 1) > kind:
+                node.ordinals[ordinal] = kind
+
+    def _match_prefix(self, word: str) -> dict:
+        """{ordinal: (0, kind)} of the controls with a term starting exactly with word."""
+        node = self._root
+        for char in word:
+            node = node.children.get(char)
+            if node is None:
+                return {}
+        return {ordinal: (0, kind) for ordinal, kind in node.ordinals.items()}
+
+    def _match_word(self, word: str, enough: int) -> dict:
+        """
+        {ordinal: (edit distance, kind)} of the controls with a term starting
+        like word. The fuzzy walk only runs when the exact prefix finds fewer
+        than enough controls (typo matches would rank after them anyway).
+        """
+        exact = self._match_prefix(word)
+        typos = max_typos(word)
+        if typos == 0 or len(exact) >= enough:
+            return exact
+
+        size = len(word)
+        cap = typos + 1  # Any larger distance is just "too far"
+        first = self._root.children.get(word[0])
+        if first is None:
+            return {}
+
+        matches = {}
+        # Depth-first walk from the first character (typos there are rare and
+        # it keeps the walk small). Each entry carries the Levenshtein row of
+        # its parent prefix, only computed within the band |i - depth| <= typos.
+        stack = [(first, word[0], 1, [min(i, cap) for i in range(size + 1)])]
+        while stack:
+            node, char, depth, previous = stack.pop()
+            row = [min(depth, cap)] + [cap] * size
+            for i in range(max(1, depth - typos), min(size, depth + typos) + 1):
+                cost = previous[i - 1] + (word[i - 1] != char)
+                if row[i - 1] + 1 < cost:
+                    cost = row[i - 1] + 1
+                if previous[i] + 1 < cost:
+                    cost = previous[i] + 1
+                row[i] = cost if cost < cap else cap
+            distance = row[-1]
+            if distance <= typos:
+                # The whole word matched a prefix: every term below completes it
+                for ordinal, kind in node.ordinals.items():
+                    best = matches.get(ordinal)
+                    if best is None or (distance, kind) < best:
+                        matches[ordinal] = (distance, kind)
+            if min(row) <= typos:
+                depth += 1
+                for child_char, child in node.children.items():
+                    stack.append((child, child_char, depth, row))
+        return matches
+
+    def complete(self, query: str, limit: int = 10) -> list:
+        """
+        Tag IDs whose ID or title words start with every word of the query.
+
+        Ranked by total edit distance, then ID matches before title matches,
+        then catalog order.
+
+        Args:
+            query: Raw text typed by the user ('V2.1', 'auth-', 'autenticacion')
+            limit: Maximum number of results
+
+        Returns:
+            list: Matching tag IDs
+        """
+        query = fold(_FORMATTED_SUFFIX_RE.sub('', query)).strip()
+        if query.startswith('masvs-'):
+            query = query[6:]
+        elif query.startswith('mstg-'):
+            query = query[5:]
+        words = query.split()
+        if not words:
+            return []
+
+        # A single word needs only limit matches; with several, the intersection decides
+        enough = limit if len(words) == 1 else len(self.tag_ids)
+        scores = None
+        for word in words:
+            matches = self._match_word(word, enough)
+            if scores is None:
+                scores = matches
+            else:
+                scores = {
+                    ordinal: (distance + matches[ordinal][0], kind + matches[ordinal][1])
+                    for ordinal, (distance, kind) in scores.items()
+                    if ordinal in matches
+                }
+            if not scores:
+                return []
+
+        ranked = sorted(scores, key=lambda ordinal: (*scores[ordinal], ordinal))
+        return [self.tag_ids[ordinal] for ordinal in ranked[:limit]]
@@ -0,0 +1,621 @@
+"""
+Compact, memory-mappable layout for the compiled standards catalog
+==================================================================
+Helper module (not a standard). The compiled catalog is one binary file:
+
+    MAGIC | header length (uint32 LE) | JSON header | padding | sections
+
+The JSON header holds free-form metadata (source hash, catalog version...)
+and the section table {name: [offset, nbytes, typecode]}. Sections are flat
+arrays (uint32 'I', float64 'd') or raw bytes, 8-byte aligned, read through
+memoryview casts over a read-only mmap. Every worker process maps the same
+file, so the catalog and its indexes live in shared page-cache pages instead
+of per-process dicts. Lookups read the mapping directly (CompactCatalog):
+only the strings a caller asks for are decoded, and nothing is kept.
+
+Building blocks:
+- string table: every string stored once (UTF-8 blob + offsets)
+- hash index: open-addressing table (crc32, linear probing) key -> row
+- postings: hash index + offsets + values (+ optional weights) per key
+
+Catalog sections (see write_catalog):
+- entries:  5 string ids per (standard, control): tag, title, description,
+            category, extra JSON (any other keys of the control dict)
+- standards: 4 uint32 per standard: name, version (or EMPTY), entry range
+- controls: ALL_CONTROLS order, ordinal -> entry (hash index 'controls'
+            maps tag ID -> ordinal; 'controls.keys' are the tag IDs in order)
+- tag_standard: ordinal -> standard (first loaded standard wins)
+- entry_ordinal: entry -> ordinal
+- standard_entries: hash index 'STANDARD\\0TAG' -> entry
+"""
+
+import contextvars
+import json
+import mmap
+import sys
+import zlib
+from array import array
+from collections.abc import Mapping, Sequence
+from contextlib import contextmanager
+from typing import NamedTuple
+
+MAGIC = b"TZUCAT\x00\x01"
+EMPTY = 0xFFFFFFFF
+_ALIGN = 8
+_ENTRY_WIDTH = 5
+_STANDARD_WIDTH = 4
+_FIELD_POSITIONS = {'title': 1, 'description': 2, 'category': 3}
+_EXTRA_POSITION = 4
+
+
+class TagRecord(NamedTuple):
+    """Immutable, precomputed view of a catalog control."""
+    tag: str          # Formatted for display, e.g. 'V2.1.1 (ASVS)'
+    tag_id: str
+    title: str
+    description: str
+    category: str
+    standard: str
+
+
+# =====================================================
+# WRITER
+# =====================================================
+
+class CatalogWriter:
+    """Accumulates strings and sections, then serializes the file."""
+
+    def __init__(self):
+        self._string_ids = {}
+        self._string_offsets = array('I', [0])
+        self._blob = bytearray()
+        self._sections = {}  # name -> (typecode, bytes)
+
+    def intern(self, text: str) -> int:
+        idx = self._string_ids.get(text)
+        if idx is None:
+            idx = len(self._string_ids)
+            self._string_ids[text] = idx
+            self._blob += text.encode('utf-8')
+            self._string_offsets.append(len(self._blob))
+        return idx
+
+    def add_array(self, name: str, typecode: str, values):
+        self._sections[name] = (typecode, array(typecode, values).tobytes())
+
+    def add_hash_index(self, name: str, keys: list):
+        """Maps each key (unique strings) to its position in keys."""
+        size = 1
+        while size < 2 * max(len(keys), 1):
+            size <<= 1
+        mask = size - 1
+        slots = array('I', [EMPTY]) * size
+        key_ids = array('I')
+        for row, key in enumerate(keys):
+            key_ids.append(self.intern(key))
+            slot = zlib.crc32(key.encode('utf-8')) & mask
+            while slots[slot] != EMPTY:
+                slot = (slot + 1) & mask
+            slots[slot] = row
+        self._sections[f"{name}.slots"] = ('I', slots.tobytes())
+        self._sections[f"{name}.keys"] = ('I', key_ids.tobytes())
+
+    def add_postings(self, name: str, postings: dict, weights: dict = None):
+        """key -> list of uint32 values (and parallel float64 weights)."""
+        keys = list(postings)
+        self.add_hash_index(name, keys)
+        offsets = array('I', [0])
+        values = array('I')
+        weight_values = array('d')
+        for key in keys:
+            values.extend(postings[key])
+            offsets.append(len(values))
+            if weights is not None:
+                weight_values.extend(weights[key])
+        self._sections[f"{name}.offsets"] = ('I', offsets.tobytes())
+        self._sections[f"{name}.values"] = ('I', values.tobytes())
+        if weights is not None:
+            self._sections[f"{name}.weights"] = ('d', weight_values.tobytes())
+
+    def to_bytes(self, meta: dict) -> bytes:
+        sections = dict(self._sections)
+        sections['strings.offsets'] = ('I', self._string_offsets.tobytes())
+        sections['strings.blob'] = ('B', bytes(self._blob))
+
+        layout = {}
+        body = bytearray()
+        for name, (typecode, data) in sections.items():
+            body += b'\0' * (-len(body) % _ALIGN)
+            layout[name] = [len(body), len(data), typecode]
+            body += data
+
+        header = json.dumps(
+            {"meta": meta, "byteorder": sys.byteorder, "sections": layout},
+            ensure_ascii=False,
+        ).encode('utf-8')
+        prefix = MAGIC + len(header).to_bytes(4, 'little') + header
+        prefix += b'\0' * (-len(prefix) % _ALIGN)
+        return prefix + bytes(body)
+
+
+# =====================================================
+# READER
+# =====================================================
+
+class CatalogReader:
+    """Read-only access to a compiled catalog held in bytes or an mmap."""
+
+    def __init__(self, buffer):
+        view = memoryview(buffer)
+        if bytes(view[:len(MAGIC)]) != MAGIC:
+            raise ValueError("Not a compiled standards catalog")
+        header_start = len(MAGIC) + 4
+        header_len = int.from_bytes(view[len(MAGIC):header_start], 'little')
+        header = json.loads(bytes(view[header_start:header_start + header_len]))
+        if header.get("byteorder") != sys.byteorder:
+            raise ValueError("Compiled catalog has a different byte order")
+
+        body_start = header_start + header_len
+        body_start += -body_start % _ALIGN
+        self.meta = header.get("meta", {})
+        self._buffer = buffer  # Keeps the mmap alive as long as the reader
+        self._sections = {}
+        for name, (offset, length, typecode) in header["sections"].items():
+            section = view[body_start + offset:body_start + offset + length]
+            self._sections[name] = section if typecode == 'B' else section.cast(typecode)
+        self._blob = self._sections['strings.blob']
+        self._offsets = self._sections['strings.offsets']
+
+    @classmethod
+    def open(cls, path: str):
+        """Memory-maps a compiled catalog file (pages shared between processes)."""
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(mapped)
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._buffer)
+
+    def section(self, name: str):
+        return self._sections[name]
+
+    def has_section(self, name: str) -> bool:
+        return name in self._sections
+
+    def string(self, idx: int) -> str:
+        return str(self._blob[self._offsets[idx]:self._offsets[idx + 1]], 'utf-8')
+
+    def lookup(self, name: str, key: str):
+        """Row of key in hash index name, or None."""
+        slots = self._sections[f"{name}.slots"]
+        keys = self._sections[f"{name}.keys"]
+        blob, offsets = self._blob, self._offsets
+        key_bytes = key.encode('utf-8')
+        mask = len(slots) - 1
+        slot = zlib.crc32(key_bytes) & mask
+        while True:
+            row = slots[slot]
+            if row == EMPTY:
+                return None
+            key_id = keys[row]
+            if blob[offsets[key_id]:offsets[key_id + 1]] == key_bytes:
+                return row
+            slot = (slot + 1) & mask
+
+    def postings(self, name: str, key: str):
+        """(values, weights or None) memoryviews for key, or None if absent."""
+        row = self.lookup(name, key)
+        if row is None:
+            return None
+        offsets = self._sections[f"{name}.offsets"]
+        start, end = offsets[row], offsets[row + 1]
+        weights = self._sections.get(f"{name}.weights")
+        return (
+            self._sections[f"{name}.values"][start:end],
+            weights[start:end] if weights is not None else None,
+        )
+
+
+class StringSequence(Sequence):
+    """Sequence of strings backed by an array of string ids."""
+
+    __slots__ = ('_reader', '_ids')
+
+    def __init__(self, reader: CatalogReader, ids):
+        self._reader = reader
+        self._ids = ids
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._reader.string(i) for i in self._ids[index]]
+        return self._reader.string(self._ids[index])
+
+    def __len__(self):
+        return len(self._ids)
+
+
+# =====================================================
+# CATALOG
+# =====================================================
+
+def write_catalog(writer: CatalogWriter, standards_map: dict, standards_versions: dict) -> dict:
+    """
+    Writes the catalog sections with the same semantics as the former dicts:
+    ALL_CONTROLS keeps the first insertion position and the last loaded value
+    of a tag, TAG_TO_STANDARD keeps the first loaded standard.
+
+    Returns:
+        dict: {tag_id: control dict} in ALL_CONTROLS order (input for the indexes)
+    """
+    entries = array('I')
+    entry_ordinal = array('I')
+    standard_rows = array('I')
+    standard_keys = []
+    all_controls = {}
+    ordinal_entry = {}
+    tag_standard = {}
+
+    for std_index, (standard_name, controls) in enumerate(standards_map.items()):
+        start = len(entries) // _ENTRY_WIDTH
+        for tag_id, info in controls.items():
+            entry = len(entries) // _ENTRY_WIDTH
+            extra = {k: v for k, v in info.items() if k not in _FIELD_POSITIONS}
+            entries.extend((
+                writer.intern(tag_id),
+                writer.intern(info.get('title', '')),
+                writer.intern(info.get('description', '')),
+                writer.intern(info.get('category', '')),
+                writer.intern(json.dumps(extra, ensure_ascii=False) if extra else ''),
+            ))
+            all_controls[tag_id] = info
+            ordinal_entry[tag_id] = entry
+            tag_standard.setdefault(tag_id, std_index)
+            standard_keys.append(f"{standard_name}\0{tag_id}")
+        end = len(entries) // _ENTRY_WIDTH
+        version = standards_versions.get(standard_name)
+        standard_rows.extend((
+            writer.intern(standard_name),
+            writer.intern(str(version)) if version is not None else EMPTY,
+            start,
+            end,
+        ))
+
+    # Entries were appended in the same order as standard_keys
+    ordinal_of = {tag_id: ordinal for ordinal, tag_id in enumerate(all_controls)}
+    for key in standard_keys:
+        entry_ordinal.append(ordinal_of[key.split('\0', 1)[1]])
+
+    writer.add_array('entries', 'I', entries)
+    writer.add_array('standards', 'I', standard_rows)
+    writer.add_array('entry_ordinal', 'I', entry_ordinal)
+    writer.add_array('controls', 'I', (ordinal_entry[tag_id] for tag_id in all_controls))
+    writer.add_array('tag_standard', 'I', (tag_standard[tag_id] for tag_id in all_controls))
+    writer.add_hash_index('controls', list(all_controls))
+    writer.add_hash_index('standard_entries', standard_keys)
+    return all_controls
+
+
+class CompactCatalog:
+    """
+    Accessors over the catalog sections of a CatalogReader.
+
+    Lookups resolve straight from the mapping (hash index, string table):
+    nothing per control is decoded into per-process dicts, so a worker's
+    heap stays flat however much of the catalog it reads.
+    """
+
+    def __init__(self, reader: CatalogReader):
+        self.reader = reader
+        self.entries = reader.section('entries')
+        self.controls = reader.section('controls')
+        self.tag_standard = reader.section('tag_standard')
+        self.entry_ordinal = reader.section('entry_ordinal')
+        self.tag_ids = StringSequence(reader, reader.section('controls.keys'))
+        rows = reader.section('standards')
+        # A handful of standards: decoded once
+        self.standards = []
+        for i in range(0, len(rows), _STANDARD_WIDTH):
+            name_id, version_id, start, end = rows[i:i + _STANDARD_WIDTH]
+            self.standards.append((
+                reader.string(name_id),
+                reader.string(version_id) if version_id != EMPTY else None,
+                start,
+                end,
+            ))
+        self.standard_index = {name: i for i, (name, _, _, _) in enumerate(self.standards)}
+
+    @property
+    def meta(self) -> dict:
+        return self.reader.meta
+
+    def ordinal(self, tag_id: str):
+        return self.reader.lookup('controls', tag_id)
+
+    def entry_of(self, standard_name: str, tag_id: str):
+        return self.reader.lookup('standard_entries', f"{standard_name}\0{tag_id}")
+
+    def entry_field(self, entry: int, position: int) -> str:
+        return self.reader.string(self.entries[entry * _ENTRY_WIDTH + position])
+
+    def entry_extra(self, entry: int) -> dict:
+        """Control keys beyond title, description and category."""
+        raw = self.entry_field(entry, _EXTRA_POSITION)
+        return json.loads(raw) if raw else {}
+
+    def standard_of(self, ordinal: int) -> str:
+        return self.standards[self.tag_standard[ordinal]][0]
+
+    def control(self, entry: int) -> dict:
+        """Fields of an entry as a new dict: {'title', 'description', 'category', ...extra}."""
+        fields = {name: self.entry_field(entry, position) for name, position in _FIELD_POSITIONS.items()}
+        fields.update(self.entry_extra(entry))
+        return fields
+
+    def record(self, ordinal: int) -> TagRecord:
+        entry = self.controls[ordinal]
+        tag_id = self.entry_field(entry, 0)
+        standard_name = self.standard_of(ordinal)
+        return TagRecord(
+            tag=f"{tag_id} ({standard_name})",
+            tag_id=tag_id,
+            title=self.entry_field(entry, 1),
+            description=self.entry_field(entry, 2),
+            category=self.entry_field(entry, 3),
+            standard=standard_name,
+        )
+
+    def records(self) -> list:
+        """TagRecord of every control, by ordinal."""
+        return [self.record(ordinal) for ordinal in range(len(self.controls))]
+
+    def versions(self) -> dict:
+        """Standard name -> version, for the standards defining one."""
+        return {name: version for name, version, _, _ in self.standards if version is not None}
+
+    def standard_ordinals(self, standard_name: str):
+        """ALL_CONTROLS ordinals of a standard's controls, in the standard's order."""
+        _, _, start, end = self.standards[self.standard_index[standard_name]]
+        return self.entry_ordinal[start:end]
+
+
+class CatalogRef:
+    """
+    Holder of the active catalog; views read through it so a swap is one
+    assignment. Inside pinned() the current context (request, thread) keeps
+    seeing the catalog that was active when it started, even if another one
+    is installed meanwhile.
+    """
+
+    __slots__ = ('_active', '_pinned')
+
+    def __init__(self, catalog=None):
+        self._active = catalog
+        self._pinned = contextvars.ContextVar(f"pinned_catalog_{id(self)}", default=None)
+
+    @property
+    def catalog(self):
+        return self._pinned.get() or self._active
+
+    @catalog.setter
+    def catalog(self, catalog):
+        self._active = catalog
+
+    @contextmanager
+    def pinned(self, latest: bool = False):
+        """Fixes the catalog seen by the current context (or the latest one) until exit."""
+        token = self._pinned.set(self._active if latest else self.catalog)
+        try:
+            yield self._pinned.get()
+        finally:
+            self._pinned.reset(token)
+
+
+# =====================================================
+# MAPPING VIEWS (drop-in replacements for the former dicts)
+# =====================================================
+
+class ControlView(Mapping):
+    """One control, read lazily: {'title', 'description', 'category', ...extra}."""
+
+    __slots__ = ('_catalog', '_entry')
+
+    def __init__(self, catalog: CompactCatalog, entry: int):
+        self._catalog = catalog
+        self._entry = entry
+
+    def __getitem__(self, key):
+        position = _FIELD_POSITIONS.get(key)
+        if position is not None:
+            return self._catalog.entry_field(self._entry, position)
+        return self._catalog.entry_extra(self._entry)[key]
+
+    def __iter__(self):
+        yield from _FIELD_POSITIONS
+        yield from self._catalog.entry_extra(self._entry)
+
+    def __len__(self):
+        return len(_FIELD_POSITIONS) + len(self._catalog.entry_extra(self._entry))
+
+    def copy(self) -> dict:
+        return self._catalog.control(self._entry)
+
+    def __repr__(self):
+        return repr(self.copy())
+
+
+class ControlsView(Mapping):
+    """ALL_CONTROLS: tag_id -> ControlView, in catalog order."""
+
+    __slots__ = ('_ref',)
+
+    def __init__(self, ref: CatalogRef):
+        self._ref = ref
+
+    def __getitem__(self, tag_id):
+        catalog = self._ref.catalog
+        ordinal = catalog.ordinal(tag_id) if isinstance(tag_id, str) else None
+        if ordinal is None:
+            raise KeyError(tag_id)
+        return ControlView(catalog, catalog.controls[ordinal])
+
+    def __contains__(self, tag_id):
+        return isinstance(tag_id, str) and self._ref.catalog.ordinal(tag_id) is not None
+
+    def __iter__(self):
+        return iter(self._ref.catalog.tag_ids)
+
+    def __len__(self):
+        return len(self._ref.catalog.tag_ids)
+
+    def __repr__(self):
+        return f"<ControlsView: {len(self)} controls>"
+
+
+class StandardControlsView(Mapping):
+    """STANDARDS_MAP[name]: tag_id -> ControlView for one standard."""
+
+    __slots__ = ('_catalog', '_name', '_start', '_end')
+
+    def __init__(self, catalog: CompactCatalog, name: str):
+        self._catalog = catalog
+        self._name = name
+        _, _, self._start, self._end = catalog.standards[catalog.standard_index[name]]
+
+    def __getitem__(self, tag_id):
+        entry = self._catalog.entry_of(self._name, tag_id) if isinstance(tag_id, str) else None
+        if entry is None:
+            raise KeyError(tag_id)
+        return ControlView(self._catalog, entry)
+
+    def __contains__(self, tag_id):
+        return isinstance(tag_id, str) and self._catalog.entry_of(self._name, tag_id) is not None
+
+    def __iter__(self):
+        for entry in range(self._start, self._end):
+            yield self._catalog.entry_field(entry, 0)
+
+    def __len__(self):
+        return self._end - self._start
+
+    def __repr__(self):
+        return f"<StandardControlsView {self._name}: {len(self)} controls>"
+
+
+class StandardsView(Mapping):
+    """STANDARDS_MAP: standard name -> StandardControlsView, in load order."""
+
+    __slots__ = ('_ref',)
+
+    def __init__(self, ref: CatalogRef):
+        self._ref = ref
+
+    def __getitem__(self, name):
+        catalog = self._ref.catalog
+        if name not in catalog.standard_index:
+            raise KeyError(name)
+        return StandardControlsView(catalog, name)
+
+    def __contains__(self, name):
+        return name in self._ref.catalog.standard_index
+
+    def __iter__(self):
+        return iter(list(self._ref.catalog.standard_index))
+
+    def __len__(self):
+        return len(self._ref.catalog.standards)
+
+
+class TagsMapView(Mapping):
+    """TAGS_MAP: '<STANDARD>_TAGS' -> list of tag IDs."""
+
+    __slots__ = ('_ref',)
+
+    def __init__(self, ref: CatalogRef):
+        self._ref = ref
+
+    def __getitem__(self, key):
+        name = key[:-5] if isinstance(key, str) and key.endswith('_TAGS') else None
+        if name not in self._ref.catalog.standard_index:
+            raise KeyError(key)
+        return list(StandardControlsView(self._ref.catalog, name))
+
+    def __iter__(self):
+        return iter([f"{name}_TAGS" for name in self._ref.catalog.standard_index])
+
+    def __len__(self):
+        return len(self._ref.catalog.standards)
+
+
+class StandardsVersionsView(Mapping):
+    """STANDARDS_VERSIONS: standard name -> version (only standards defining VERSION)."""
+
+    __slots__ = ('_ref',)
+
+    def __init__(self, ref: CatalogRef):
+        self._ref = ref
+
+    def __getitem__(self, name):
+        return self._ref.catalog.versions()[name]
+
+    def __repr__(self):
+        return repr(self._ref.catalog.versions())
+
+    def __iter__(self):
+        return iter(self._ref.catalog.versions())
+
+    def __len__(self):
+        return len(self._ref.catalog.versions())
+
+
+class TagToStandardView(Mapping):
+    """TAG_TO_STANDARD: tag_id -> standard name (first loaded standard wins)."""
+
+    __slots__ = ('_ref',)
+
+    def __init__(self, ref: CatalogRef):
+        self._ref = ref
+
+    def __getitem__(self, tag_id):
+        catalog = self._ref.catalog
+        ordinal = catalog.ordinal(tag_id) if isinstance(tag_id, str) else None
+        if ordinal is None:
+            raise KeyError(tag_id)
+        return catalog.standard_of(ordinal)
+
+    def __contains__(self, tag_id):
+        return isinstance(tag_id, str) and self._ref.catalog.ordinal(tag_id) is not None
+
+    def __iter__(self):
+        return iter(self._ref.catalog.tag_ids)
+
+    def __len__(self):
+        return len(self._ref.catalog.tag_ids)
+
+
+class TagRecordsView(Mapping):
+    """TAG_RECORDS: tag_id -> TagRecord, in catalog order."""
+
+    __slots__ = ('_ref',)
+
+    def __init__(self, ref: CatalogRef):
+        self._ref = ref
+
+    def __getitem__(self, tag_id):
+        catalog = self._ref.catalog
+        ordinal = catalog.ordinal(tag_id) if isinstance(tag_id, str) else None
+        if ordinal is None:
+            raise KeyError(tag_id)
+        return catalog.record(ordinal)
+
+    def __contains__(self, tag_id):
+        return isinstance(tag_id, str) and self._ref.catalog.ordinal(tag_id) is not None
+
+    def __iter__(self):
+        return iter(self._ref.catalog.tag_ids)
+
+    def __len__(self):
+        return len(self._ref.catalog.tag_ids)
+
+    def values(self):
+        return self._ref.catalog.records()
@@ -0,0 +1,268 @@
+"""
+Crosswalk between standards
+===========================
+Helper module (not a standard). Answers "which NIST CSF / ISO 27001 controls
+does this ASVS-tagged remediation also satisfy?" and lets the dashboard count
+a standard as covered through equivalent controls of another standard.
+
+CROSSWALK_GROUPS lists groups of equivalent controls, one theme per group.
+Two controls of different standards are related when they share a group.
+The NIST <-> ISO27001 pairs follow the informative references of NIST CSF
+1.1 (limited to the Annex A controls in iso27001.py); ASVS, MASVS and SBS
+G-504 controls are placed by security domain. Tags missing from the
+installed catalog are skipped, so the table also applies to catalogs
+edited through the API.
+
+write_crosswalk adds the adjacency (tag -> related ordinals of other
+standards) to the compiled catalog (see _compact.py); CrosswalkIndex reads
+it straight from the shared, memory-mapped file.
+"""
+
+from ._compact import CatalogWriter
+
+CROSSWALK_GROUPS = {
+    # --- Gobierno y organización -------------------------------------------
+    "Políticas de seguridad": (
+        "ID.GV-1", "ID.GV-4",
+        "A.5.1.1", "A.5.1.2", "ISO27001-A.5.1.1",
+        "SBS-504-1", "SBS-504-4",
+    ),
+    "Roles y responsabilidades": (
+        "ID.AM-6", "ID.GV-2", "PR.AT-2", "PR.AT-4", "PR.AT-5", "DE.DP-1", "RS.CO-1",
+        "A.6.1.1", "A.6.1.2", "A.7.2.1",
+        "SBS-504-2", "SBS-504-3",
+    ),
+    "Concientización y capacitación": (
+        "PR.AT-1", "PR.AT-3", "PR.IP-11",
+        "A.7.1.1", "A.7.1.2", "A.7.2.2", "A.7.2.3", "A.7.3.1",
+        "SBS-504-12",
+    ),
+    "Gestión de riesgos": (
+        "ID.RA-3", "ID.RA-4", "ID.RA-5", "ID.RA-6", "ID.RM-1", "ID.RM-2", "ID.RM-3",
+        "V1.1.2",
+        "ARCH-1",
+        "SBS-504-1", "SBS-504-6",
+    ),
+    "Terceros y cadena de suministro": (
+        "ID.BE-1", "ID.SC-1", "ID.SC-2", "ID.SC-3", "ID.SC-4", "ID.SC-5",
+        "V14.2.2",
+        "SBS-504-20",
+    ),
+
+    # --- Activos y datos ---------------------------------------------------
+    "Inventario y clasificación de activos": (
+        "ID.AM-1", "ID.AM-2", "ID.AM-4", "ID.AM-5", "PR.PT-2",
+        "A.8.1.1", "A.8.1.2", "A.8.1.3", "A.8.2.1", "A.8.2.2",
+        "V6.1.1", "V14.2.3",
+        "SBS-504-5",
+    ),
+    "Flujos de datos y arquitectura": (
+        "ID.AM-3",
+        "V1.1.1", "V1.2.1",
+        "ARCH-1", "ARCH-4",
+    ),
+    "Datos en reposo": (
+        "PR.DS-1", "PR.DS-5",
+        "A.8.2.3",
+        "V8.1.1", "V8.1.2", "V8.1.3", "V8.2.1", "V8.2.2", "V8.3.1",
+        "STORAGE-1", "STORAGE-2", "STORAGE-3",
+        "SBS-504-11",
+    ),
+    "Datos en tránsito": (
+        "PR.DS-2",
+        "V1.4.1", "V9.1.1", "V9.1.2", "V9.1.3", "V9.2.1", "V14.1.3",
+        "NETWORK-1", "NETWORK-2", "NETWORK-3", "NETWORK-4",
+        "SBS-504-11",
+    ),
+    "Criptografía y gestión de claves": (
+        "PR.DS-1",
+        "A.10.1.1", "A.10.1.2",
+        "V6.1.2", "V6.2.1", "V6.2.2", "V6.3.1", "V6.4.1",
+        "CRYPTO-1", "CRYPTO-2", "CRYPTO-3", "CRYPTO-4", "ARCH-3",
+        "SBS-504-11",
+    ),
+    "Medios y eliminación de datos": (
+        "PR.DS-3", "PR.IP-6",
+        "A.8.1.4", "A.8.3.1", "A.8.3.2", "A.8.3.3", "A.11.2.5", "A.11.2.7",
+        "STORAGE-4",
+    ),
+    "Fuga de información en errores": (
+        "PR.DS-5",
+        "V7.2.1", "V7.2.2", "V14.3.1", "V14.3.2",
+        "STORAGE-2",
+    ),
+
+    # --- Identidad y acceso ------------------------------------------------
+    "Credenciales": (
+        "PR.AC-1",
+        "A.9.2.4", "A.9.3.1", "A.9.4.3",
+        "V2.1.1", "V2.1.2", "V2.1.3", "V2.3.1", "V2.5.1",
+        "AUTH-4",
+        "SBS-504-8",
+    ),
+    "Autenticación": (
+        "PR.AC-6", "PR.AC-7",
+        "A.9.2.1", "A.9.4.2",
+        "V2.2.1", "V2.2.2", "V2.2.3", "V2.4.1", "V13.1.2",
+        "AUTH-1", "AUTH-2", "AUTH-5",
+        "SBS-504-8",
+    ),
+    "Sesiones": (
+        "PR.AC-7",
+        "A.9.4.2", "A.11.2.8",
+        "V3.1.1", "V3.2.1", "V3.2.2", "V3.2.3", "V3.3.1", "V3.3.2",
+        "AUTH-3", "AUTH-6", "AUTH-7", "AUTH-8",
+    ),
+    "Gestión de usuarios y derechos de acceso": (
+        "PR.AC-1", "PR.AC-4",
+        "A.9.2.1", "A.9.2.2", "A.9.2.3", "A.9.2.5", "A.9.2.6",
+        "SBS-504-8",
+    ),
+    "Control de acceso y mínimo privilegio": (
+        "PR.AC-4", "PR.PT-3",
+        "A.9.1.1", "ISO27001-A.9.1.1", "A.9.4.1", "A.9.4.4",
+        "V4.1.1", "V4.1.2", "V4.1.3", "V4.1.4", "V4.1.5", "V4.2.1", "V4.2.2", "V4.3.1", "V4.3.2",
+        "ARCH-2", "PLATFORM-2",
+        "SBS-504-8",
+    ),
+    "Acceso remoto y dispositivos móviles": (
+        "PR.AC-3",
+        "A.6.2.1", "A.6.2.2", "A.11.2.6",
+    ),
+    "Segmentación de red": (
+        "PR.AC-5", "PR.PT-4",
+        "A.9.1.2",
+        "SBS-504-10",
+    ),
+
+    # --- Desarrollo y configuración ----------------------------------------
+    "Desarrollo seguro": (
+        "PR.IP-2", "PR.DS-7",
+        "A.6.1.5", "A.9.4.5",
+        "V1.1.1", "V1.14.1", "V14.1.1", "V14.1.2",
+        "CODE-2",
+        "SBS-504-9",
+    ),
+    "Validación de entradas y codificación": (
+        "V5.1.1", "V5.1.2", "V5.1.3", "V5.1.4", "V5.1.5", "V5.2.1", "V5.2.2",
+        "V5.3.1", "V5.3.2", "V5.3.3", "V12.1.1", "V13.2.1", "V13.3.1", "V13.4.1", "V14.4.1",
+        "PLATFORM-1", "PLATFORM-3", "PLATFORM-4",
+        "SBS-504-9",
+    ),
+    "Lógica de negocio y archivos": (
+        "V11.1.1", "V11.1.2", "V12.1.2", "V12.1.3", "V12.2.1", "V13.1.1", "V13.2.2",
+    ),
+    "Integridad del software": (
+        "PR.DS-6", "PR.DS-8", "DE.CM-4", "DE.CM-5",
+        "V10.1.1", "V10.2.1", "V10.3.1",
+        "CODE-1", "RESILIENCE-1", "RESILIENCE-2", "RESILIENCE-3", "RESILIENCE-4",
+    ),
+    "Configuración segura": (
+        "PR.IP-1", "PR.IP-3",
+        "V14.1.1", "V14.4.2", "V14.5.1",
+        "CODE-2",
+    ),
+    "Gestión de vulnerabilidades": (
+        "ID.RA-1", "PR.IP-12", "DE.CM-8", "RS.AN-5", "RS.MI-3",
+        "V14.2.1",
+        "CODE-3",
+        "SBS-504-7",
+    ),
+    "Disponibilidad y anti-automatización": (
+        "PR.DS-4", "PR.PT-5",
+        "V11.1.3", "V11.1.4",
+    ),
+
+    # --- Detección, respuesta y recuperación -------------------------------
+    "Registro y monitoreo": (
+        "PR.PT-1", "DE.AE-3", "DE.CM-1", "DE.CM-3", "DE.CM-6", "DE.CM-7",
+        "V7.1.1", "V7.1.2", "V7.1.3", "V7.3.1", "V7.4.1", "V7.5.1", "V7.5.2", "V7.5.3", "V7.5.4",
+        "SBS-504-13", "SBS-504-14",
+    ),
+    "Detección y análisis de eventos": (
+        "DE.AE-1", "DE.AE-2", "DE.AE-4", "DE.AE-5",
+        "DE.DP-2", "DE.DP-3", "DE.DP-4", "DE.DP-5", "RS.AN-1",
+        "SBS-504-13", "SBS-504-14",
+    ),
+    "Inteligencia de amenazas": (
+        "ID.RA-2",
+        "A.6.1.4",
+        "SBS-504-15",
+    ),
+    "Respuesta a incidentes": (
+        "PR.IP-9", "RS.RP-1", "RS.CO-2", "RS.CO-3", "RS.CO-4", "RS.CO-5",
+        "RS.AN-2", "RS.AN-3", "RS.AN-4", "RS.MI-1", "RS.MI-2", "RS.IM-1", "RS.IM-2",
+        "A.6.1.3",
+        "SBS-504-16", "SBS-504-17",
+    ),
+    "Continuidad y recuperación": (
+        "ID.BE-4", "ID.BE-5", "PR.IP-4", "PR.IP-10",
+        "RC.RP-1", "RC.IM-1", "RC.IM-2", "RC.CO-1", "RC.CO-2", "RC.CO-3",
+        "SBS-504-18", "SBS-504-19",
+    ),
+
+    # --- Seguridad física --------------------------------------------------
+    "Seguridad física y de equipos": (
+        "PR.AC-2", "PR.IP-5", "PR.MA-1", "PR.MA-2", "DE.CM-2",
+        "A.11.1.1", "ISO27001-A.11.1.1", "A.11.1.2", "A.11.1.3", "A.11.1.4", "A.11.1.5", "A.11.1.6",
+        "A.11.2.1", "A.11.2.2", "A.11.2.3", "A.11.2.4", "A.11.2.9",
+    ),
+}
+
+
+def write_crosswalk(writer: CatalogWriter, standards_map: dict, all_controls: dict):
+    """
+    Adds the crosswalk adjacency: for every mapped tag, the ordinals of the
+    related controls of other standards, in catalog order.
+
+    Args:
+        writer: Writer of the compiled catalog
+        standards_map: standard_name -> controls, as compiled
+        all_controls: tag_id -> control, in catalog (ordinal) order
+    """
+    ordinals = {tag_id: ordinal for ordinal, tag_id in enumerate(all_controls)}
+    tag_standard = {}  # First loaded standard, like TAG_TO_STANDARD
+    for standard_name, controls in standards_map.items():
+        for tag_id in controls:
+            tag_standard.setdefault(tag_id, standard_name)
+    related = {}
+    for tags in CROSSWALK_GROUPS.values():
+        members = [tag_id for tag_id in tags if tag_id in ordinals]
+        for tag_id in members:
+            related.setdefault(tag_id, set()).update(
+                ordinals[other] for other in members
+                if tag_standard[other] != tag_standard[tag_id]
+            )
+    writer.add_postings("crosswalk", {
+        tag_id: sorted(others) for tag_id, others in related.items() if others
+    })
+
+
+class CrosswalkIndex:
+    """Crosswalk lookups over the postings stored in the compiled catalog."""
+
+    __slots__ = ('_catalog', '_coverage')
+
+    def __init__(self, catalog):
+        self._catalog = catalog
+        self._coverage = {}  # tag_id -> frozenset of standards (filled on use)
+
+    def related(self, tag_id: str) -> list:
+        """Ordinals of the controls of other standards equivalent to tag_id."""
+        posting = self._catalog.reader.postings("crosswalk", tag_id)
+        return list(posting[0]) if posting is not None else []
+
+    def standards_of(self, tag_id: str) -> frozenset:
+        """The tag's own standard plus every standard reachable through the crosswalk."""
+        standards = self._coverage.get(tag_id)
+        if standards is None:
+            catalog = self._catalog
+            ordinal = catalog.ordinal(tag_id)
+            if ordinal is None:
+                standards = frozenset()
+            else:
+                standards = frozenset(
+                    catalog.standard_of(o) for o in (ordinal, *self.related(tag_id))
+                )
+            self._coverage[tag_id] = standards
+        return standards
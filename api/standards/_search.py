@@ -0,0 +1,226 @@
+"""
+Search indexes over the compiled catalog
+========================================
+Helper module (not a standard: files starting with '_' are skipped by the
+automatic loader). write_search_index / write_bm25_index add their sections
+to the compiled catalog (see _compact.py); TagSearchIndex / Bm25Index read
+them straight from the shared, memory-mapped file.
+
+Every control gets an ordinal (its position in ALL_CONTROLS) so results keep
+the catalog order. Three text fields are indexed:
+- ids: the lowercased tag ID
+- content: lowercased title and description
+- categories: lowercased category, only used as a fallback when nothing
+  else matches (e.g. "cryptography" finds the controls of that category)
+
+For each field we keep bigram and trigram postings. A substring query is
+answered by intersecting the postings of its n-grams and verifying the few
+surviving candidates, instead of lowercasing and scanning the whole catalog.
+
+Bm25Index (used by rag_lite_suggest) stores the corpus as a sparse
+term-document matrix with precomputed BM25 weights.
+"""
+
+import math
+import re
+from collections import Counter
+
+from ._compact import CatalogReader, CatalogWriter, StringSequence
+
+# Fields are joined with a separator that never appears in a query, so a match
+# cannot span the end of the title and the start of the description.
+_FIELD_SEPARATOR = '\x00'
+_FIELDS = ('ids', 'content', 'categories')
+
+
+def _grams(text: str, n: int) -> set:
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+def _field_texts(all_controls: dict) -> dict:
+    return {
+        'ids': [tag_id.lower() for tag_id in all_controls],
+        'content': [
+            _FIELD_SEPARATOR.join((info.get('title', ''), info.get('description', ''))).lower()
+            for info in all_controls.values()
+        ],
+        'categories': [info.get('category', '').lower() for info in all_controls.values()],
+    }
+
+
+def write_search_index(writer: CatalogWriter, all_controls: dict):
+    """Adds the n-gram postings of every field (ordinals in ascending order)."""
+    for field, texts in _field_texts(all_controls).items():
+        writer.add_array(f"search.{field}.texts", 'I', (writer.intern(text) for text in texts))
+        for n in (2, 3):
+            postings = {}
+            for ordinal, text in enumerate(texts):
+                for gram in _grams(text, n):
+                    postings.setdefault(gram, []).append(ordinal)
+            writer.add_postings(f"search.{field}.{n}", postings)
+
+
+class _NGramField:
+    """Bigram/trigram postings over one lowercased text per ordinal."""
+
+    __slots__ = ('_reader', '_name', 'texts')
+
+    def __init__(self, reader: CatalogReader, field: str):
+        self._reader = reader
+        self._name = f"search.{field}"
+        self.texts = StringSequence(reader, reader.section(f"{self._name}.texts"))
+
+    def candidates(self, query: str) -> set:
+        """Ordinals whose text may contain query (superset, must be verified)."""
+        if len(query) < 2:
+            return set(range(len(self.texts)))
+        n = 3 if len(query) >= 3 else 2
+        postings = []
+        for gram in _grams(query, n):
+            posting = self._reader.postings(f"{self._name}.{n}", gram)
+            if posting is None:
+                return set()
+            postings.append(posting[0])
+        postings.sort(key=len)
+        result = set(postings[0])
+        for posting in postings[1:]:
+            result.intersection_update(posting)
+            if not result:
+                break
+        return result
+
+    def matches(self, query: str) -> list:
+        """Sorted ordinals whose text contains query."""
+        texts = self.texts
+        return sorted(o for o in self.candidates(query) if query in texts[o])
+
+
+class TagSearchIndex:
+    """Search structures over the catalog, in ALL_CONTROLS order."""
+
+    def __init__(self, catalog):
+        self.tag_ids = catalog.tag_ids
+        self.ids, self.content, self.categories = (_NGramField(catalog.reader, field) for field in _FIELDS)
+        # Standard name -> ordinals in the standard's own order
+        self.by_standard = {
+            name: catalog.standard_ordinals(name)
+            for name in catalog.standard_index
+        }
+
+    def search(self, query_lower: str, query_upper: str, limit: int = 50) -> list:
+        """
+        Ranked search: exact ID > partial ID > standard name > content
+        (title/description). Category matches are a fallback for queries
+        that match nothing else.
+
+        Args:
+            query_lower: Lowercased query (base tag if it was formatted)
+            query_upper: Uppercased raw query, matched against standard names
+            limit: Maximum number of results
+
+        Returns:
+            list: Matching tag IDs
+        """
+        seen = set()
+        results = []
+
+        def take(ordinals):
+            for ordinal in ordinals:
+                if ordinal not in seen:
+                    seen.add(ordinal)
+                    results.append(self.tag_ids[ordinal])
+                    if len(results) >= limit:
+                        return True
+            return False
+
+        partial = self.ids.matches(query_lower)
+        id_texts = self.ids.texts
+        if take([o for o in partial if id_texts[o] == query_lower]):
+            return results
+        if take(partial):
+            return results
+
+        if query_upper in self.by_standard:
+            if take(self.by_standard[query_upper]):
+                return results
+        else:
+            for name, standard_ordinals in self.by_standard.items():
+                if query_upper in name and take(standard_ordinals):
+                    return results
+
+        take(self.content.matches(query_lower))
+        if not results:
+            take(self.categories.matches(query_lower))
+        return results
+
+
+# =====================================================
+# BM25 INDEX (rag_lite_suggest)
+# =====================================================
+
+# Minimal stopwords (ES + EN)
+_STOPWORDS = frozenset({
+    'de', 'la', 'el', 'en', 'y', 'a', 'los', 'del', 'se', 'las', 'por', 'un', 'para',
+    'con', 'una', 'su', 'al', 'lo', 'como', 'más', 'o', 'pero', 'sus', 'le', 'ha',
+    'me', 'si', 'sin', 'sobre', 'ser', 'e', 'no', 'que', 'es', 'son', 'muy', 'te',
+    'ya', 'ni', 'este', 'esta', 'fue', 'the', 'of', 'and', 'in', 'is', 'to',
+    'it', 'for', 'on', 'are', 'an', 'or', 'not', 'this', 'that', 'with', 'all',
+})
+_TOKEN_RE = re.compile(r'[a-záéíóúüña-z]{3,}')
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def tokenize(text: str) -> list:
+    """Lowercased word tokens (3+ letters) without stopwords."""
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in _STOPWORDS]
+
+
+def write_bm25_index(writer: CatalogWriter, all_controls: dict):
+    """
+    Adds the BM25 postings: for every term, the documents (control ordinals)
+    containing it and idf * saturated term frequency, so scoring a query is
+    a sparse dot product over the postings of the query terms.
+    """
+    size = len(all_controls)
+    doc_terms = [
+        Counter(tokenize(f"{entry.get('title', '')} {entry.get('description', '')} {entry.get('category', '')}"))
+        for entry in all_controls.values()
+    ]
+    lengths = [sum(terms.values()) for terms in doc_terms]
+    avg_length = (sum(lengths) / size) if size else 0.0
+
+    postings, weights = {}, {}
+    for ordinal, terms in enumerate(doc_terms):
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths[ordinal] / avg_length) if avg_length else BM25_K1
+        for term, tf in terms.items():
+            postings.setdefault(term, []).append(ordinal)
+            weights.setdefault(term, []).append(tf * (BM25_K1 + 1) / (tf + norm))
+
+    for term, ordinals in postings.items():
+        df = len(ordinals)
+        idf = math.log(1 + (size - df + 0.5) / (df + 0.5))
+        weights[term] = [idf * weight for weight in weights[term]]
+    writer.add_postings("bm25", postings, weights)
+
+
+class Bm25Index:
+    """BM25 scoring over the postings stored in the compiled catalog."""
+
+    __slots__ = ('_reader',)
+
+    def __init__(self, catalog):
+        self._reader = catalog.reader
+
+    def scores(self, text: str) -> dict:
+        """BM25 score per matching ordinal for the query text."""
+        scores = {}
+        for term, qtf in Counter(tokenize(text)).items():
+            posting = self._reader.postings("bm25", term)
+            if posting is None:
+                continue
+            ordinals, weights = posting
+            for ordinal, weight in zip(ordinals, weights):
+                scores[ordinal] = scores.get(ordinal, 0.0) + qtf * weight
+        return scores
@@ -0,0 +1,112 @@
+"""
+Tests for the offline bulk-evaluation CLI
+"""
+import json
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+import models
+import bulk_evaluate
+from bulk_evaluate import BulkEvaluator, load_state, STATE_FILE_NAME
+
+
+def _fake_ai(content, content_type="text"):
+    risk = SimpleNamespace(**{field: 5 for field in (
+        "skill_level", "motive", "opportunity", "size",
+        "ease_of_discovery", "ease_of_exploit", "awareness", "intrusion_detection",
+        "loss_of_confidentiality", "loss_of_integrity", "loss_of_availability", "loss_of_accountability",
+        "financial_damage", "reputation_damage", "non_compliance", "privacy_violation",
+    )})
+    return SimpleNamespace(threats=[SimpleNamespace(
+        title=f"Threat for {content[:10]}",
+        description="desc",
+        type="tampering",
+        remediation=SimpleNamespace(description="fix", control_tags=["V2.1.1 (ASVS)"]),
+        risk=risk,
+    )])
+
+
+@pytest.fixture
+def input_dir(tmp_path):
+    src = tmp_path / "in"
+    (src / "nested").mkdir(parents=True)
+    (src / "a.md").write_text("# System A\nLogin form", encoding="utf-8")
+    (src / "nested" / "b.txt").write_text("System B uses an API gateway", encoding="utf-8")
+    (src / "ignored.exe").write_bytes(b"\x00")
+    return src
+
+
+class TestBulkEvaluateJson:
+    def test_writes_json_results_and_state(self, input_dir, tmp_path):
+        out_dir = tmp_path / "out"
+        with patch.object(bulk_evaluate, "clientAI", side_effect=_fake_ai) as mocked:
+            failures = BulkEvaluator(input_dir, "json", out_dir=out_dir).run(workers=2)
+        assert failures == 0
+        assert mocked.call_count == 2
+
+        result = json.loads((out_dir / "nested" / "b.txt.json").read_text(encoding="utf-8"))
+        assert result["source"] == "nested/b.txt"
+        assert result["threats"][0]["remediation"]["control_tags"] == ["V2.1.1 (ASVS)"]
+        assert set(load_state(str(out_dir / STATE_FILE_NAME))) == {"a.md", "nested/b.txt"}
+
+    def test_resume_skips_unchanged_files(self, input_dir, tmp_path):
+        out_dir = tmp_path / "out"
+        with patch.object(bulk_evaluate, "clientAI", side_effect=_fake_ai):
+            BulkEvaluator(input_dir, "json", out_dir=out_dir).run(workers=2)
+
+        (input_dir / "a.md").write_text("# System A\nLogin form with MFA", encoding="utf-8")
+        with patch.object(bulk_evaluate, "clientAI", side_effect=_fake_ai) as mocked:
+            BulkEvaluator(input_dir, "json", out_dir=out_dir).run(workers=2)
+        assert mocked.call_count == 1
+        assert "MFA" in mocked.call_args[0][0]
+
+    def test_failures_are_reported_and_retried(self, input_dir, tmp_path):
+        out_dir = tmp_path / "out"
+        with patch.object(bulk_evaluate, "clientAI", side_effect=ValueError("bad response")):
+            failures = BulkEvaluator(input_dir, "json", out_dir=out_dir).run(workers=1)
+        assert failures == 2
+        assert load_state(str(out_dir / STATE_FILE_NAME)) == {}
+
+    def test_image_copies_go_to_out_dir(self, input_dir, tmp_path, monkeypatch):
+        from PIL import Image
+
+        Image.new("RGB", (20, 10), "white").save(input_dir / "diagram.png")
+        monkeypatch.chdir(tmp_path)
+        out_dir = tmp_path / "out"
+        with patch.object(bulk_evaluate, "clientAI", side_effect=_fake_ai):
+            BulkEvaluator(input_dir, "json", out_dir=out_dir).run(workers=1)
+
+        result = json.loads((out_dir / "diagram.png.json").read_text(encoding="utf-8"))
+        assert (out_dir / "diagrams" / result["diagram"]).is_file()
+        assert not (tmp_path / "diagrams").exists()  # The API's diagram store is left alone
+
+    def test_text_copies_go_to_out_dir(self, input_dir, tmp_path, monkeypatch):
+        workdir = tmp_path / "work"  # No diagrams/ here
+        workdir.mkdir()
+        monkeypatch.chdir(workdir)
+        out_dir = tmp_path / "out"
+        with patch.object(bulk_evaluate, "clientAI", side_effect=_fake_ai):
+            failures = BulkEvaluator(input_dir, "json", out_dir=out_dir).run(workers=1)
+        assert failures == 0
+
+        result = json.loads((out_dir / "a.md.json").read_text(encoding="utf-8"))
+        assert (out_dir / "diagrams" / result["diagram"]).read_text(encoding="utf-8").startswith("# System A")
+        assert not (workdir / "diagrams").exists()
+
+
+class TestBulkEvaluateDatabase:
+    def test_creates_system_per_file(self, input_dir, tmp_path, db_session, analyst_user):
+        with patch.object(bulk_evaluate, "clientAI", side_effect=_fake_ai):
+            failures = BulkEvaluator(
+                input_dir, "db", state_path=str(tmp_path / "state.jsonl"), username=analyst_user.username
+            ).run(workers=2)
+        assert failures == 0
+
+        systems = db_session.query(models.InformationSystem).all()
+        assert sorted(s.title for s in systems) == ["a", "b"]
+        threats = db_session.query(models.Threat).all()
+        assert len(threats) == 2
+        assert all(t.type == "Tampering" for t in threats)
+        assert all(str(t.created_by) == str(analyst_user.id) for t in threats)
@@ -0,0 +1,176 @@
+"""
+Tests for the database-backed standards catalog and its hot reload
+"""
+import json
+import mmap
+from datetime import datetime
+
+import pytest
+
+import api
+import crud
+import models
+import standards
+from tests.conftest import client
+
+
+NEW_CONTROLS = {
+    "PCI-1.1": {"title": "Firewall configuration", "description": "Network controls", "category": "Network"},
+    "PCI-3.4": {"title": "Render PAN unreadable", "description": "Cifrado de datos", "category": "Cryptography"},
+}
+
+
+@pytest.fixture
+def db_catalog(db_session, tmp_path, monkeypatch):
+    """Seeded catalog tables; the module catalog is restored afterwards."""
+    monkeypatch.setattr(standards, "SNAPSHOT_PATH", str(tmp_path / "catalog.bin"))
+    previous = standards._CATALOG_REF.catalog
+    crud.seed_standards_catalog(db_session)
+    yield db_session
+    standards._CATALOG_REF.catalog = previous
+    standards._correct_control_tag.cache_clear()
+    api._loaded_catalog_revision = None
+
+
+class TestCatalogTables:
+    def test_seed_round_trip_keeps_the_catalog(self, db_catalog):
+        before = standards.CATALOG_VERSION
+        revision, standards_map, versions = crud.get_standards_catalog(db_catalog)
+        assert revision == 1
+        assert list(standards_map) == list(standards.STANDARDS_MAP)
+        assert standards_map["ASVS"] == {t: dict(c) for t, c in standards.STANDARDS_MAP["ASVS"].items()}
+        assert versions == dict(standards.STANDARDS_VERSIONS)
+        assert standards.install_catalog(standards_map, versions) == before
+        assert crud.seed_standards_catalog(db_catalog) is False
+
+    def test_upsert_new_standard_and_merge(self, db_catalog):
+        revision = crud.upsert_catalog_standard(db_catalog, "PCIDSS", NEW_CONTROLS, version="4.0")
+        assert revision == 2
+        merged = crud.upsert_catalog_standard(
+            db_catalog, "PCIDSS", {"PCI-12.1": {"title": "Security policy"}, "PCI-1.1": {"title": "Firewall"}},
+            replace=False,
+        )
+        _, standards_map, versions = crud.get_standards_catalog(db_catalog)
+        assert merged == 3
+        assert list(standards_map)[-1] == "PCIDSS" and versions["PCIDSS"] == "4.0"
+        assert list(standards_map["PCIDSS"]) == ["PCI-1.1", "PCI-3.4", "PCI-12.1"]
+        assert standards_map["PCIDSS"]["PCI-1.1"]["title"] == "Firewall"
+
+        crud.upsert_catalog_standard(db_catalog, "PCIDSS", {"PCI-3.4": {"title": "PAN", "level": 2}})
+        _, standards_map, _ = crud.get_standards_catalog(db_catalog)
+        assert standards_map["PCIDSS"] == {"PCI-3.4": {"title": "PAN", "description": "", "category": "", "level": 2}}
+
+
+class TestHotReload:
+    def test_sync_installs_only_new_revisions(self, db_catalog):
+        assert api._sync_standards_catalog(db_catalog) == 1
+        assert api._sync_standards_catalog(db_catalog) is None
+        version = standards.CATALOG_VERSION
+
+        crud.upsert_catalog_standard(db_catalog, "PCIDSS", NEW_CONTROLS)
+        assert api._sync_standards_catalog(db_catalog) == 2
+        assert standards.CATALOG_VERSION != version
+        assert standards.get_standard_from_tag_id("PCI-3.4") == "PCIDSS"
+        assert standards.validate_and_correct_control_tags(["PCI-3.4"]) == ["PCI-3.4 (PCIDSS)"]
+        assert standards.search_predefined_tags("PCIDSS") == ["PCI-1.1", "PCI-3.4"]
+
+    def test_pinned_context_keeps_a_consistent_view(self, db_catalog):
+        with standards.pinned_catalog():
+            version = standards.CATALOG_VERSION
+            crud.upsert_catalog_standard(db_catalog, "PCIDSS", NEW_CONTROLS)
+            api._sync_standards_catalog(db_catalog)
+            assert standards.CATALOG_VERSION == version
+            assert "PCI-1.1" not in standards.ALL_CONTROLS
+            assert standards.validate_and_correct_control_tags(["PCI-1.1"]) == []
+        assert "PCI-1.1" in standards.ALL_CONTROLS
+
+    def test_workers_share_the_compiled_file(self, db_catalog, tmp_path):
+        crud.upsert_catalog_standard(db_catalog, "PCIDSS", NEW_CONTROLS)
+        api._sync_standards_catalog(db_catalog)
+        files = list(tmp_path.glob("catalog.bin.*"))
+        assert len(files) == 1
+        _, standards_map, versions = crud.get_standards_catalog(db_catalog)
+        # A second worker finds the compiled file instead of compiling again
+        standards.install_catalog(standards_map, versions)
+        assert isinstance(standards._CATALOG_REF.catalog.reader._buffer, mmap.mmap)
+        assert list(tmp_path.glob("catalog.bin.*")) == files
+
+    def test_standard_names_follow_the_catalog(self, db_catalog):
+        with pytest.raises(AttributeError):
+            standards.PCIDSS_TAGS
+        crud.upsert_catalog_standard(db_catalog, "PCIDSS", NEW_CONTROLS)
+        with standards.pinned_catalog():
+            api._sync_standards_catalog(db_catalog)
+            with pytest.raises(AttributeError):
+                standards.PCIDSS_CONTROLS
+        assert standards.PCIDSS_TAGS == ["PCI-1.1", "PCI-3.4"]
+        assert standards.PCIDSS_CONTROLS["PCI-1.1"]["title"] == "Firewall configuration"
+        assert "PCIDSS_CONTROLS" in dir(standards)
+
+
+class TestRenormalization:
+    def test_one_worker_claims_each_revision(self, db_catalog):
+        assert crud.claim_catalog_renormalization(db_catalog, 1) is True
+        assert crud.claim_catalog_renormalization(db_catalog, 1) is False  # Another worker
+        revision = crud.upsert_catalog_standard(db_catalog, "PCIDSS", NEW_CONTROLS)
+        assert crud.claim_catalog_renormalization(db_catalog, 1) is False  # Superseded
+        assert crud.renormalize_catalog_revision(db_catalog, revision) == 0
+        assert crud.renormalize_catalog_revision(db_catalog, revision) is None  # Done
+
+    def test_abandoned_claim_is_taken_over(self, db_catalog):
+        assert crud.claim_catalog_renormalization(db_catalog, 1) is True
+        db_catalog.query(models.CatalogRevision).update(
+            {models.CatalogRevision.renormalize_claimed_at: datetime.utcnow() - crud.RENORMALIZE_CLAIM_TIMEOUT * 2}
+        )
+        assert crud.claim_catalog_renormalization(db_catalog, 1) is True
+
+    def test_stale_tags_are_renormalized_against_the_revision(self, db_catalog, test_information_system):
+        crud.bulk_create_threats(db_catalog, test_information_system.id, [{
+            "title": "T", "description": "d", "type": "Spoofing",
+            "remediation": {"description": "fix", "control_tags": ["PCI-1.1"]},
+        }])
+        remediation = db_catalog.query(models.Remediation).one()
+        remediation.control_tags = json.dumps(["PCI-1.1"])  # Unknown to the catalog it was stored against
+        remediation.control_tags_version = None
+        db_catalog.commit()
+
+        revision = crud.upsert_catalog_standard(db_catalog, "PCIDSS", NEW_CONTROLS)
+        api._sync_standards_catalog(db_catalog)
+        assert crud.renormalize_catalog_revision(db_catalog, revision) == 1
+        db_catalog.refresh(remediation)
+        assert json.loads(remediation.control_tags) == ["PCI-1.1 (PCIDSS)"]
+        assert remediation.control_tags_version == standards.CATALOG_VERSION
+
+
+class TestUpsertEndpoint:
+    def test_admin_adds_standard(self, db_catalog, admin_auth_headers):
+        response = client.put(
+            "/control-tags/standards/pcidss",
+            json={"version": "4.0", "controls": NEW_CONTROLS},
+            headers=admin_auth_headers,
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["standard"] == "PCIDSS"
+        assert data["controls_count"] == 2
+        assert data["catalog_version"] == standards.CATALOG_VERSION
+
+        response = client.get("/control-tags/standards", headers=admin_auth_headers)
+        assert "PCIDSS" in response.json()["standards"]
+
+    def test_requires_admin(self, db_catalog, analyst_auth_headers):
+        response = client.put(
+            "/control-tags/standards/PCIDSS", json={"controls": NEW_CONTROLS}, headers=analyst_auth_headers
+        )
+        assert response.status_code == 403
+
+    @pytest.mark.parametrize("name, controls", [
+        ("PCI-DSS", NEW_CONTROLS),
+        ("PCIDSS", {}),
+        ("PCIDSS", {" PCI-1": {"title": "x"}}),
+    ])
+    def test_rejects_invalid_input(self, db_catalog, admin_auth_headers, name, controls):
+        response = client.put(
+            f"/control-tags/standards/{name}", json={"controls": controls}, headers=admin_auth_headers
+        )
+        assert response.status_code == 400
@@ -203,3 +203,123 @@ class TestControlTagsErrorHandling:
         data = response.json()
         # Query vacía debe retornar todos o ningún resultado
         assert "results" in data
+
+
+class TestBatchNormalization:
+    """Tests para /control-tags/normalize/batch"""
+
+    TAGS = ["V2.1.1", "V2.1.1 (ASVS)", "SBS-504-99", "SC-8 (NIST)", "junk", "V2.1.1", "SBS-504-99"]
+
+    def test_json_report(self, auth_headers):
+        response = client.post("/control-tags/normalize/batch", json=self.TAGS, headers=auth_headers)
+        assert response.status_code == 200
+        data = response.json()
+        assert [item["tag"] for item in data["results"]] == ["V2.1.1", "V2.1.1 (ASVS)", "SBS-504-99", "SC-8 (NIST)", "junk"]
+        assert [item["status"] for item in data["results"]] == ["valid", "valid", "corrected", "external", "unknown"]
+        assert data["corrections"] == {"SBS-504-99": "SBS-504-20 (SBS)"}
+        assert data["categories"] == {"ASVS": ["V2.1.1 (ASVS)"], "SBS": ["SBS-504-20 (SBS)"], "NIST": ["SC-8 (NIST)"]}
+        assert data["unknown"] == ["junk"]
+        assert data["summary"] == {
+            "total_submitted": 7, "total_unique": 5, "valid": 2, "corrected": 1, "external": 1, "unknown": 1
+        }
+
+    def test_ndjson_stream(self, auth_headers):
+        import json
+        tags = [f"SBS-504-{n}" for n in range(3000)] * 2
+        response = client.post("/control-tags/normalize/batch?format=ndjson", json=tags, headers=auth_headers)
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert len(lines) == 3001
+        assert lines[1] == {"tag": "SBS-504-1", "normalized": "SBS-504-1 (SBS)", "standard": "SBS", "status": "valid"}
+        assert lines[-1]["summary"]["total_submitted"] == 6000
+        assert lines[-1]["summary"]["total_unique"] == 3000
+
+    def test_categorize_strips_standard_suffix(self, auth_headers):
+        response = client.post("/control-tags/categorize", json=["V2.1.1 (ASVS)", "AUTH-1"], headers=auth_headers)
+        assert response.json()["categorized_tags"] == {"ASVS": ["V2.1.1 (ASVS)"], "MASVS": ["AUTH-1"]}
+
+
+class TestControlTagAutocomplete:
+    """Tests para /control-tags/search?mode=autocomplete"""
+
+    def test_autocomplete_mode(self, auth_headers):
+        response = client.get("/control-tags/search?query=auth-&limit=3&mode=autocomplete", headers=auth_headers)
+        assert response.status_code == 200
+        data = response.json()
+        assert data["results"] == ["AUTH-1 (MASVS)", "AUTH-2 (MASVS)", "AUTH-3 (MASVS)"]
+        assert data["detailed_results"][0]["tag"] == "AUTH-1"
+        assert data["detailed_results"][0]["standard"] == "MASVS"
+        assert data["total"] == 3
+
+    def test_invalid_mode(self, auth_headers):
+        response = client.get("/control-tags/search?query=auth&mode=fuzzy", headers=auth_headers)
+        assert response.status_code == 422
+
+
+class TestControlTagCrosswalk:
+    def test_crosswalk_endpoint(self, auth_headers):
+        response = client.get("/control-tags/V2.1.1 (ASVS)/crosswalk", headers=auth_headers)
+        assert response.status_code == 200
+        data = response.json()
+        assert data["tag"] == "V2.1.1" and data["standard"] == "ASVS"
+        assert [c["tag_id"] for c in data["crosswalk"]["NIST"]] == ["PR.AC-1"]
+        assert data["crosswalk"]["ISO27001"][0]["tag"] == "A.9.2.4 (ISO27001)"
+        assert data["total"] == sum(len(c) for c in data["crosswalk"].values())
+
+        filtered = client.get("/control-tags/V2.1.1/crosswalk?standards=nist", headers=auth_headers).json()
+        assert list(filtered["crosswalk"]) == ["NIST"]
+        assert client.get("/control-tags/NOPE-1/crosswalk", headers=auth_headers).status_code == 404
+
+    def test_dashboard_coverage_through_crosswalk(self, db_session, auth_headers, test_information_system):
+        import crud
+        import models
+        remediation = crud.create_remediation(db_session, "TLS everywhere", ["V9.1.1"])
+        db_session.add(models.Threat(
+            title="Sniffing", information_system_id=test_information_system.id, remediation_id=remediation.id,
+        ))
+        db_session.commit()
+
+        direct = client.get("/dashboard/stats", headers=auth_headers).json()
+        assert direct["standards_coverage"]["ASVS"] == 100.0
+        assert direct["standards_coverage"]["NIST"] == 0.0 and direct["crosswalk"] is False
+
+        mapped = client.get("/dashboard/stats?crosswalk=true", headers=auth_headers).json()
+        assert mapped["crosswalk"] is True
+        assert {k for k, v in mapped["standards_coverage"].items() if v} == {"ASVS", "NIST", "MASVS", "SBS"}
+
+
+class TestControlTagsHttpCaching:
+    """Tests para ETag / 304 en los endpoints de lectura del catálogo"""
+
+    @pytest.mark.parametrize("path", [
+        "/control-tags/standards",
+        "/control-tags/standards/ASVS",
+        "/control-tags/predefined",
+        "/control-tags/V2.1.1/details",
+        "/control-tags/suggestions/Spoofing",
+    ])
+    def test_etag_and_not_modified(self, auth_headers, path):
+        response = client.get(path, headers=auth_headers)
+        assert response.status_code == 200
+        etag = response.headers["etag"]
+        assert response.headers["cache-control"] == "private, no-cache"
+
+        cached = client.get(path, headers={**auth_headers, "If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.content == b""
+        assert cached.headers["etag"] == etag
+
+        stale = client.get(path, headers={**auth_headers, "If-None-Match": '"other"'})
+        assert stale.status_code == 200
+        assert stale.json() == response.json()
+
+    def test_etag_follows_catalog_version(self, auth_headers):
+        import standards
+        response = client.get("/control-tags/standards", headers=auth_headers)
+        assert response.headers["etag"].startswith(f'"{standards.CATALOG_VERSION}-')
+
+    def test_not_found_is_not_cached(self, auth_headers):
+        response = client.get("/control-tags/NOPE-999/details", headers=auth_headers)
+        assert response.status_code == 404
+        assert "etag" not in response.headers
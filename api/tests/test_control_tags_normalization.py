@@ -0,0 +1,57 @@
+"""
+Tests for write-time normalization of remediation control tags
+"""
+import json
+from unittest.mock import patch
+
+import crud
+import models
+import schemas
+import standards
+
+
+class TestWriteTimeNormalization:
+    def test_create_stores_canonical_tags_and_version(self, db_session):
+        remediation = crud.create_remediation(
+            db_session, "fix", ["V2.1.1", "V2.1.1 (ASVS)", "SBS-504-99", "garbage"]
+        )
+        assert json.loads(remediation.control_tags) == ["V2.1.1 (ASVS)", "SBS-504-20 (SBS)"]
+        assert remediation.control_tags_version == standards.CATALOG_VERSION
+
+    def test_update_accepts_stored_json_string(self, db_session):
+        remediation = crud.create_remediation(db_session, "fix", ["V2.1.1"])
+        updated = crud.update_remediation(db_session, remediation.id, control_tags=remediation.control_tags)
+        assert json.loads(updated.control_tags) == ["V2.1.1 (ASVS)"]
+
+    def test_read_trusts_current_version(self, db_session):
+        remediation = crud.create_remediation(db_session, "fix", ["V2.1.1"])
+        with patch.object(standards, "validate_and_correct_control_tags") as validate:
+            serialized = schemas.Remediation.model_validate(remediation)
+        validate.assert_not_called()
+        assert serialized.control_tags == ["V2.1.1 (ASVS)"]
+
+    def test_read_revalidates_stale_rows(self, db_session):
+        remediation = models.Remediation(description="legacy", control_tags='["V2.1.1", "SBS-504-99"]')
+        db_session.add(remediation)
+        db_session.commit()
+        serialized = schemas.Remediation.model_validate(remediation)
+        assert serialized.control_tags == ["V2.1.1 (ASVS)", "SBS-504-20 (SBS)"]
+
+
+class TestBackgroundRenormalization:
+    def test_renormalizes_stale_and_legacy_rows(self, db_session):
+        legacy = models.Remediation(description="legacy", control_tags='["V2.1.1"]')
+        outdated = models.Remediation(description="old", control_tags='["SBS-504-99"]', control_tags_version="old")
+        current = crud.create_remediation(db_session, "fix", ["AUTH-1"])
+        db_session.add_all([legacy, outdated])
+        db_session.commit()
+
+        assert crud.renormalize_stale_remediations(db_session, batch_size=1) == 2
+        db_session.refresh(legacy)
+        db_session.refresh(outdated)
+        assert json.loads(legacy.control_tags) == ["V2.1.1 (ASVS)"]
+        assert json.loads(outdated.control_tags) == ["SBS-504-20 (SBS)"]
+        assert {legacy.control_tags_version, outdated.control_tags_version, current.control_tags_version} == {
+            standards.CATALOG_VERSION
+        }
+        assert crud.renormalize_stale_remediations(db_session) == 0
@@ -0,0 +1,92 @@
+"""
+Tests for the compliance gap analysis (control-catalog bitsets)
+"""
+import pytest
+
+import crud
+import gap_analysis
+import models
+import schemas
+import standards
+from tests.conftest import client
+
+
+def _add_threat(db, system, tags, remediated=False):
+    remediation = crud.create_remediation(db, "fix", tags)
+    remediation.status = remediated
+    db.add(models.Threat(title="t", information_system_id=system.id, remediation_id=remediation.id))
+    db.commit()
+
+
+@pytest.fixture
+def project_systems(db_session, test_user):
+    project = crud.create_project(db_session, schemas.ProjectCreate(name="Gap"), created_by=test_user.id)
+    web, mobile, empty = (
+        crud.create_information_system(
+            db_session, schemas.InformationSystemBaseCreate(title=title, project_id=project.id)
+        )
+        for title in ("Web", "Mobile", "Empty")
+    )
+    _add_threat(db_session, web, ["V2.1.1", "V2.1.2"], remediated=True)
+    _add_threat(db_session, web, ["V3.1.1 (ASVS)", "PR.AC-1"])
+    _add_threat(db_session, mobile, ["AUTH-1", "V2.1.2"])
+    return project, web, mobile, empty
+
+
+class TestBitsets:
+    def test_round_trip(self):
+        bits = standards.control_tags_bitset(["V2.1.2 (ASVS)", "V2.1.1", "garbage", "V2.1.1"])
+        assert bits.bit_count() == 2
+        assert standards.bitset_tags(bits) == ["V2.1.1", "V2.1.2"]
+        assert standards.bitset_tags(standards.standard_bitset("masvs")) == list(standards.STANDARDS_MAP["MASVS"])
+        assert standards.standard_bitset("NOPE") == 0
+
+    def test_crosswalk_bits(self):
+        bits = standards.control_tags_bitset(["V2.1.1"], crosswalk=True)
+        assert set(standards.bitset_tags(bits)) == {"V2.1.1", "PR.AC-1", "A.9.2.4", "A.9.3.1", "A.9.4.3", "AUTH-4", "SBS-504-8"}
+
+    def test_standard_gaps(self):
+        covered = standards.control_tags_bitset(["V2.1.1", "V2.1.2", "AUTH-1"])
+        remediated = standards.control_tags_bitset(["V2.1.1"])
+        gaps = gap_analysis.standard_gaps("ASVS", covered, remediated)
+        assert (gaps["total_controls"], gaps["covered"], gaps["remediated"]) == (94, 2, 1)
+        assert gaps["pending"] == ["V2.1.2"]
+        assert len(gaps["uncovered"]) == 92 and "V2.1.1" not in gaps["uncovered"]
+
+
+class TestGapAnalysisEndpoints:
+    def test_project_gaps(self, project_systems, auth_headers):
+        project, web, mobile, empty = project_systems
+        response = client.get(f"/projects/{project.id}/gap-analysis?standards=asvs,masvs", headers=auth_headers)
+        assert response.status_code == 200
+        data = response.json()
+        assert (data["systems_count"], data["threats_count"]) == (3, 3)
+        asvs, masvs = data["standards"]
+        assert asvs["standard"] == "ASVS"
+        assert (asvs["covered"], asvs["remediated"]) == (3, 2)
+        assert asvs["pending"] == ["V3.1.1"]
+        assert "V2.1.1" not in asvs["uncovered"] and "V4.1.1" in asvs["uncovered"]
+        assert masvs["covered"] == 1 and masvs["remediated"] == 0
+
+        per_system = {s["title"]: s for s in data["systems"]}
+        assert per_system["Web"]["standards"][0]["covered"] == 3
+        assert per_system["Mobile"]["standards"][1]["covered"] == 1
+        assert per_system["Empty"]["threats"] == 0
+        assert per_system["Web"]["standards"][0]["uncovered"] is None
+
+    def test_crosswalk_and_system_scope(self, project_systems, auth_headers):
+        project, web, _, _ = project_systems
+        data = client.get(
+            f"/information_systems/{web.id}/gap-analysis?standards=NIST&crosswalk=true", headers=auth_headers
+        ).json()
+        nist = data["standards"][0]
+        assert data["crosswalk"] is True and data["systems"] == []
+        assert "PR.AC-7" in nist["pending"]  # V3.1.1 (sessions) maps to PR.AC-7
+        assert "PR.AC-1" not in nist["uncovered"]
+
+    def test_errors(self, project_systems, auth_headers):
+        project = project_systems[0]
+        assert client.get(f"/projects/{project.id}/gap-analysis?standards=PCI", headers=auth_headers).status_code == 400
+        missing = "00000000-0000-0000-0000-000000000000"
+        assert client.get(f"/projects/{missing}/gap-analysis", headers=auth_headers).status_code == 404
+        assert client.get(f"/information_systems/{missing}/gap-analysis", headers=auth_headers).status_code == 404
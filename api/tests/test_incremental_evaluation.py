@@ -0,0 +1,121 @@
+"""
+Tests for diff-aware (incremental) re-evaluation of text descriptions
+"""
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from tests.conftest import client
+from section_diff import split_sections, build_incremental_content, threat_signature
+
+
+DESCRIPTION_V1 = """# Login
+Users authenticate with username and password.
+
+# Payments
+Payments are sent to the bank API over HTTPS.
+
+# Reports
+Admins download monthly reports."""
+
+DESCRIPTION_V2 = """# Login
+Users authenticate with username and password.
+
+# Payments
+Payments are sent to the bank API over plain HTTP using a shared API key.
+
+# Reports
+Admins download monthly reports."""
+
+
+def _ai_result(*threats):
+    risk = SimpleNamespace(**{
+        "skill_level": 5, "motive": 4, "opportunity": 4, "size": 4,
+        "ease_of_discovery": 3, "ease_of_exploit": 3, "awareness": 4, "intrusion_detection": 3,
+        "loss_of_confidentiality": 6, "loss_of_integrity": 5, "loss_of_availability": 5,
+        "loss_of_accountability": 7, "financial_damage": 3, "reputation_damage": 4,
+        "non_compliance": 5, "privacy_violation": 5,
+    })
+    return SimpleNamespace(threats=[
+        SimpleNamespace(
+            title=title,
+            description="desc",
+            type=stride,
+            remediation=SimpleNamespace(description="fix", control_tags=["V2.1.1 (ASVS)"]),
+            risk=risk,
+        )
+        for title, stride in threats
+    ])
+
+
+class TestSectionDiff:
+    def test_split_by_headings(self):
+        sections = split_sections(DESCRIPTION_V1)
+        assert len(sections) == 3
+        assert sections[1].startswith("# Payments")
+
+    def test_split_by_paragraphs_without_headings(self):
+        assert split_sections("first\n\nsecond\n\n\nthird") == ["first", "second", "third"]
+
+    def test_only_changed_section_is_sent(self):
+        content, changed = build_incremental_content(DESCRIPTION_V1, DESCRIPTION_V2)
+        assert changed == 1
+        assert "plain HTTP" in content
+        # Neighbours only appear as one-line context
+        assert "[CONTEXTO] # Login" in content
+        assert "username and password" not in content
+
+    def test_whitespace_only_change_is_ignored(self):
+        reflowed = DESCRIPTION_V1.replace("Admins download", "Admins   download")
+        content, changed = build_incremental_content(DESCRIPTION_V1, reflowed)
+        assert content is None
+        assert changed == 0
+
+    def test_signature_ignores_case_and_accents(self):
+        assert threat_signature("Suplantación de Sesión", "Spoofing") == \
+            threat_signature("  suplantacion de  sesion ", "spoofing")
+
+
+class TestIncrementalEvaluateEndpoint:
+    def _create_system(self, headers):
+        response = client.post("/new", json={"title": "Incremental", "description": "d"}, headers=headers)
+        assert response.status_code == 200
+        return response.json()["id"]
+
+    def test_incremental_reevaluation_skips_unchanged_and_duplicates(self, analyst_auth_headers):
+        system_id = self._create_system(analyst_auth_headers)
+
+        with patch("api.clientAI", return_value=_ai_result(("Robo de credenciales", "Spoofing"))):
+            first = client.post(f"/evaluate/{system_id}", data={"text_content": DESCRIPTION_V1},
+                                headers=analyst_auth_headers)
+        assert first.json()["threats_found"] == 1
+
+        second_result = _ai_result(("Robo de Credenciales", "Spoofing"), ("Intercepción de pagos", "Tampering"))
+        with patch("api.clientAI", return_value=second_result) as mocked:
+            second = client.post(f"/evaluate/{system_id}",
+                                 data={"text_content": DESCRIPTION_V2, "incremental": "true"},
+                                 headers=analyst_auth_headers)
+        body = second.json()
+        assert body["success"] is True
+        assert body["changed_sections"] == 1
+        assert body["threats_found"] == 1
+        assert body["threats_skipped"] == 1
+        sent_content = mocked.call_args[0][0]
+        assert "plain HTTP" in sent_content
+        assert "Admins download monthly reports" not in sent_content
+
+        threats = client.get(f"/information_systems/{system_id}/threats", headers=analyst_auth_headers).json()
+        assert len(threats) == 2
+
+    def test_incremental_without_changes_does_not_call_model(self, analyst_auth_headers):
+        system_id = self._create_system(analyst_auth_headers)
+        with patch("api.clientAI", return_value=_ai_result(("Robo de credenciales", "Spoofing"))):
+            client.post(f"/evaluate/{system_id}", data={"text_content": DESCRIPTION_V1},
+                        headers=analyst_auth_headers)
+
+        with patch("api.clientAI") as mocked:
+            response = client.post(f"/evaluate/{system_id}",
+                                   data={"text_content": DESCRIPTION_V1, "incremental": "true"},
+                                   headers=analyst_auth_headers)
+        assert response.json()["threats_found"] == 0
+        assert response.json()["changed_sections"] == 0
+        mocked.assert_not_called()
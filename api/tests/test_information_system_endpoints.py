@@ -115,3 +115,41 @@ class TestInformationSystemEndpoints:
         response = client.post(f"/evaluate/{str(test_information_system.id)}", headers=admin_auth_headers)
         # Note: Evaluate endpoint may expect different parameters
         assert response.status_code in [200, 422]
+
+
+class TestInformationSystemSummary:
+    """Tests para el listado resumido de sistemas"""
+
+    def test_counts_and_total(self, auth_headers, db_session, test_information_system):
+        import crud
+        crud.bulk_create_threats(db_session, test_information_system.id, [
+            {
+                "title": f"T{n}", "description": "d", "type": "Spoofing",
+                "risk": {factor: 1 for factor in crud.OWASP_RISK_FACTORS},
+                "remediation": {"description": "fix", "status": n == 0},
+            }
+            for n in range(3)
+        ])
+        empty = crud.create_information_system(
+            db_session, crud.schemas.InformationSystemBaseCreate(title="Empty")
+        )
+
+        response = client.get("/information_systems/summary", headers=auth_headers)
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 2
+        summaries = {item["title"]: item for item in data["items"]}
+        assert "threats" not in summaries["Test System"]
+        assert summaries["Test System"]["threat_count"] == 3
+        assert sum(summaries["Test System"]["risk_counts"].values()) == 3
+        assert summaries["Test System"]["remediated_count"] == 1
+        assert summaries["Test System"]["remediation_ratio"] == pytest.approx(1 / 3)
+        assert summaries["Empty"]["threat_count"] == 0
+        assert summaries["Empty"]["remediation_ratio"] == 0.0
+        assert str(empty.id) in {item["id"] for item in data["items"]}
+
+    def test_page_keeps_total(self, auth_headers, test_information_system):
+        response = client.get("/information_systems/summary?skip=0&limit=1", headers=auth_headers)
+        assert response.json()["total"] == 1 and len(response.json()["items"]) == 1
+        response = client.get("/information_systems/summary?skip=5&limit=1", headers=auth_headers)
+        assert response.json() == {"total": 1, "items": []}
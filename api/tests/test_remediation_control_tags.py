@@ -0,0 +1,57 @@
+"""
+Tests for the remediation_control_tags table and the standard/tag filters of /report
+"""
+import pytest
+
+import crud
+import models
+from tests.conftest import client
+
+
+def _threat(title, control_tags):
+    return {
+        "title": title, "description": "d", "type": "Spoofing",
+        "risk": {factor: 1 for factor in crud.OWASP_RISK_FACTORS},
+        "remediation": {"description": "fix", "control_tags": control_tags},
+    }
+
+
+@pytest.fixture
+def tagged_threats(db_session, test_information_system):
+    crud.bulk_create_threats(db_session, test_information_system.id, [
+        _threat("asvs", ["V2.1.1 (ASVS)"]),
+        _threat("both", ["V2.1.1 (ASVS)", "AUTH-1 (MASVS)"]),
+        _threat("none", []),
+    ])
+    return {t.title: t for t in db_session.query(models.Threat).all()}
+
+
+def _titles(response):
+    assert response.status_code == 200
+    return sorted(t["title"] for t in response.json())
+
+
+class TestRemediationControlTags:
+    def test_bulk_insert_writes_tag_rows(self, tagged_threats, db_session):
+        rows = db_session.query(models.RemediationControlTag).filter(
+            models.RemediationControlTag.remediation_id == tagged_threats["both"].remediation_id
+        ).all()
+        assert sorted((r.standard, r.tag_id) for r in rows) == [("ASVS", "V2.1.1"), ("MASVS", "AUTH-1")]
+
+    def test_report_filters_by_standard_and_tag(self, tagged_threats, auth_headers):
+        assert _titles(client.get("/report?standards=asvs", headers=auth_headers)) == ["asvs", "both"]
+        assert _titles(client.get("/report?standards=ASVS,MASVS", headers=auth_headers)) == ["both"]
+        assert _titles(client.get("/report?control_tags=AUTH-1", headers=auth_headers)) == ["both"]
+        response = client.get("/report?control_tags=NOT-A-TAG", headers=auth_headers)
+        assert response.status_code == 400
+
+    def test_update_and_delete_keep_rows_in_sync(self, tagged_threats, db_session, auth_headers):
+        crud.update_remediation(db_session, tagged_threats["asvs"].remediation_id, control_tags=["AUTH-1 (MASVS)"])
+        assert _titles(client.get("/report?standards=MASVS", headers=auth_headers)) == ["asvs", "both"]
+        assert _titles(client.get("/report?standards=ASVS", headers=auth_headers)) == ["both"]
+
+        remediation_id = tagged_threats["both"].remediation_id
+        assert crud.delete_threat(db_session, str(tagged_threats["both"].id))
+        assert db_session.query(models.RemediationControlTag).filter(
+            models.RemediationControlTag.remediation_id == remediation_id
+        ).count() == 0
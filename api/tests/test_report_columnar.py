@@ -0,0 +1,75 @@
+"""
+Tests for the columnar (Parquet / Arrow IPC) export of the threat report
+"""
+import io
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+import crud
+import report_export
+from tests.conftest import client
+
+
+@pytest.fixture
+def columnar_threats(db_session, test_information_system, monkeypatch):
+    monkeypatch.setattr(report_export, "BATCH_ROWS", 2)  # Several record batches
+    crud.bulk_create_threats(db_session, test_information_system.id, [
+        {
+            "title": "Tagged", "description": "d", "type": "Spoofing",
+            "risk": {factor: 9 for factor in crud.OWASP_RISK_FACTORS},
+            "remediation": {"description": "fix", "control_tags": ["V2.1.1", "AUTH-1"], "status": True},
+        },
+        *(
+            {
+                "title": f"Plain {n}", "description": "d", "type": "Tampering",
+                "risk": {factor: 1 for factor in crud.OWASP_RISK_FACTORS},
+                "remediation": {"description": "todo"},
+            }
+            for n in range(3)
+        ),
+    ])
+    return test_information_system
+
+
+class TestReportColumnarExport:
+    def test_parquet(self, columnar_threats, auth_headers):
+        response = client.get("/report/export?format=parquet", headers=auth_headers)
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/vnd.apache.parquet"
+        assert ".parquet" in response.headers["content-disposition"]
+
+        parquet = pq.ParquetFile(io.BytesIO(response.content))
+        assert parquet.schema_arrow == report_export.columnar_schema()
+        assert parquet.metadata.num_row_groups == 3  # 5 rows in batches of 2
+        rows = parquet.read().to_pylist()
+        assert len(rows) == 5  # The tagged threat is exploded into two rows
+
+        tagged = [row for row in rows if row["title"] == "Tagged"]
+        assert {(row["control_tag_standard"], row["control_tag_id"]) for row in tagged} == {
+            ("ASVS", "V2.1.1"), ("MASVS", "AUTH-1"),
+        }
+        row = tagged[0]
+        assert row["information_system_title"] == "Test System"
+        assert row["skill_level"] == 9 and row["privacy_violation"] == 9
+        assert row["risk_score"] == 9.0
+        assert row["inherent_level"] == "CRITICAL"
+        assert row["current_level"] == "CRITICAL"  # No residual risk: stays inherent
+        assert row["remediation_status"] is True
+
+        plain = [row for row in rows if row["title"] != "Tagged"]
+        assert all(row["control_tag_id"] is None for row in plain)
+        assert {row["current_level"] for row in plain} == {"LOW"}
+
+    def test_arrow_ipc_and_filters(self, columnar_threats, auth_headers):
+        response = client.get("/report/export?format=arrow&current_risk=CRITICAL&control_tags=AUTH-1", headers=auth_headers)
+        assert response.status_code == 200
+        table = pa.ipc.open_file(pa.py_buffer(response.content)).read_all()
+        assert set(table.column("title").to_pylist()) == {"Tagged"}
+        assert table.num_rows == 2  # Every tag of the matching threat is kept
+
+        response = client.get("/report/export?format=arrow&system_id=not-a-uuid", headers=auth_headers)
+        table = pa.ipc.open_file(pa.py_buffer(response.content)).read_all()
+        assert table.num_rows == 0
+        assert table.schema == report_export.columnar_schema()
@@ -0,0 +1,59 @@
+"""
+Tests for the streaming NDJSON/CSV export of the threat report
+"""
+import csv
+import io
+import json
+
+import pytest
+
+import crud
+import report_export
+from tests.conftest import client
+
+
+@pytest.fixture
+def exported_threats(db_session, test_information_system, monkeypatch):
+    monkeypatch.setattr(report_export, "CHUNK_ROWS", 2)  # Several chunks with few rows
+    remediation = {"description": "fix", "control_tags": ["V2.1.1", "AUTH-1"], "status": True}
+    threats = [
+        {
+            "title": f"T{n}", "description": "d", "type": "Spoofing",
+            "risk": {factor: 1 for factor in crud.OWASP_RISK_FACTORS}, "remediation": remediation,
+        }
+        for n in range(5)
+    ]
+    threats[0]["title"] = "=HYPERLINK(\"http://evil\")"
+    crud.bulk_create_threats(db_session, test_information_system.id, threats)
+    return test_information_system
+
+
+class TestReportExport:
+    def test_ndjson_matches_report_order(self, exported_threats, auth_headers):
+        response = client.get("/report/export?format=ndjson", headers=auth_headers)
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        assert "attachment" in response.headers["content-disposition"]
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert [row["id"] for row in rows] == [t["id"] for t in client.get("/report", headers=auth_headers).json()]
+        assert list(rows[0]) == list(report_export.EXPORT_COLUMNS)
+        assert rows[0]["information_system_title"] == "Test System"
+        assert rows[0]["control_tags"] == ["V2.1.1 (ASVS)", "AUTH-1 (MASVS)"]
+        assert rows[0]["remediation_status"] is True
+
+    def test_csv(self, exported_threats, auth_headers):
+        response = client.get("/report/export?format=CSV", headers=auth_headers)
+        assert response.status_code == 200
+        records = list(csv.DictReader(io.StringIO(response.text.lstrip("\ufeff"))))
+        assert len(records) == 5
+        assert records[0]["control_tags"] == "V2.1.1 (ASVS); AUTH-1 (MASVS)"
+        titles = {record["title"] for record in records}
+        assert "'=HYPERLINK(\"http://evil\")" in titles  # Formula neutralized
+
+    def test_filters_and_errors(self, exported_threats, auth_headers):
+        response = client.get(f"/report/export?system_id={exported_threats.id}", headers=auth_headers)
+        assert len(response.text.splitlines()) == 5
+        response = client.get("/report/export?system_id=not-a-uuid", headers=auth_headers)
+        assert response.text == ""
+        assert client.get("/report/export?format=xml", headers=auth_headers).status_code == 400
+        assert client.get("/report/export?current_risk=BAD", headers=auth_headers).status_code == 400
@@ -0,0 +1,81 @@
+"""
+Tests for the keyset (cursor) pagination of /report and system threat listings
+"""
+import datetime
+
+import pytest
+
+import crud
+import models
+from tests.conftest import client
+
+
+def _threat(title):
+    return {
+        "title": title, "description": "d", "type": "Spoofing",
+        "risk": {factor: 1 for factor in crud.OWASP_RISK_FACTORS},
+        "remediation": {"description": "fix"},
+    }
+
+
+@pytest.fixture
+def many_threats(db_session, test_information_system):
+    """7 threats; two share their creation time (the id breaks the tie)."""
+    crud.bulk_create_threats(
+        db_session, test_information_system.id,
+        [_threat(f"T{n}") for n in range(7)],
+    )
+    base = datetime.datetime(2026, 1, 1)
+    threats = db_session.query(models.Threat).order_by(models.Threat.title).all()
+    for n, threat in enumerate(threats):
+        threat.created_at = base + datetime.timedelta(minutes=min(n, 5))
+    db_session.commit()
+    newest_first = sorted(threats, key=lambda t: (t.created_at, t.id), reverse=True)
+    return test_information_system, [str(t.id) for t in newest_first]
+
+
+def _read_all(url, headers, **params):
+    pages, cursor = [], None
+    while True:
+        response = client.get(url, params={**params, **({"cursor": cursor} if cursor else {})}, headers=headers)
+        assert response.status_code == 200
+        pages.append([t["id"] for t in response.json()])
+        cursor = response.headers.get("x-next-cursor")
+        if cursor is None:
+            return pages
+
+
+class TestReportCursorPagination:
+    def test_pages_follow_newest_first_order(self, many_threats, auth_headers):
+        _, expected = many_threats
+        pages = _read_all("/report", auth_headers, limit=3)
+        assert [len(page) for page in pages] == [3, 3, 1]
+        assert [tid for page in pages for tid in page] == expected
+
+    def test_inserts_do_not_shift_pages(self, many_threats, db_session, auth_headers):
+        system, expected = many_threats
+        first = client.get("/report", params={"limit": 3}, headers=auth_headers)
+        crud.bulk_create_threats(db_session, system.id, [_threat("new")])
+        second = client.get(
+            "/report", params={"limit": 3, "cursor": first.headers["x-next-cursor"]}, headers=auth_headers
+        )
+        assert [t["id"] for t in second.json()] == expected[3:6]
+
+    def test_estimated_total_and_invalid_cursor(self, many_threats, auth_headers):
+        response = client.get("/report", params={"limit": 2, "estimate_total": True}, headers=auth_headers)
+        assert response.headers["x-total-count-estimate"] == "7"
+        assert response.json()[0]["created_at"]
+        for level, total in (("LOW", "7"), ("HIGH", "0")):  # The filtered total, not the table's
+            response = client.get(
+                "/report", params={"limit": 2, "estimate_total": True, "current_risk": level}, headers=auth_headers
+            )
+            assert response.headers["x-total-count-estimate"] == total
+        assert client.get("/report", params={"cursor": "not-a-cursor"}, headers=auth_headers).status_code == 400
+
+    def test_system_threats_pages(self, many_threats, auth_headers):
+        system, expected = many_threats
+        url = f"/information_systems/{system.id}/threats"
+        pages = _read_all(url, auth_headers, limit=4)
+        assert [tid for page in pages for tid in page] == expected
+        unpaged = client.get(url, headers=auth_headers)
+        assert "x-next-cursor" not in unpaged.headers and len(unpaged.json()) == 7
@@ -0,0 +1,124 @@
+"""
+Tests for the server-side PDF report (background render + cache by data version)
+"""
+import time
+
+import pytest
+from PIL import Image
+
+import crud
+import models
+import report_pdf
+from tests.conftest import client
+
+
+@pytest.fixture
+def pdf_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(report_pdf, "REPORT_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(report_pdf, "DIAGRAMS_DIR", str(tmp_path / "diagrams"))
+    (tmp_path / "diagrams").mkdir()
+    return tmp_path / "cache"
+
+
+@pytest.fixture
+def report_threats(db_session, test_information_system):
+    crud.bulk_create_threats(db_session, test_information_system.id, [
+        {
+            "title": f"Threat <{n}>", "description": "d", "type": "Spoofing",
+            "risk": {factor: 5 for factor in crud.OWASP_RISK_FACTORS},
+            "remediation": {"description": "fix", "control_tags": ["V2.1.1 (ASVS)"]},
+        }
+        for n in range(3)
+    ])
+    return test_information_system
+
+
+def _wait_for_pdf(url, headers):
+    for _ in range(100):
+        response = client.get(url, headers=headers)
+        if response.status_code != 202:
+            return response
+        time.sleep(0.05)
+    raise AssertionError("PDF not rendered in time")
+
+
+class TestReportPdf:
+    def test_render_then_serve_from_cache(self, pdf_cache, report_threats, db_session, auth_headers):
+        Image.new("RGB", (40, 20), "white").save(pdf_cache.parent / "diagrams" / "diagram.png")
+        report_threats.diagram = "diagram.png"
+        db_session.commit()
+
+        response = client.get("/report/pdf", headers=auth_headers)
+        assert response.status_code == 202
+        key = response.json()["key"]
+        assert response.headers["location"] == f"/report/pdf/{key}"
+
+        response = _wait_for_pdf(f"/report/pdf/{key}", auth_headers)
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/pdf"
+        assert response.content.startswith(b"%PDF")
+        assert b"/Subtype /Image" in response.content  # Diagram embedded from the store
+
+        # Unchanged data: the cached file comes back at once
+        response = client.get("/report/pdf", headers=auth_headers)
+        assert response.status_code == 200 and response.content.startswith(b"%PDF")
+
+    def test_writes_invalidate_and_replace_the_artifact(self, pdf_cache, report_threats, db_session, auth_headers):
+        first = client.get("/report/pdf", headers=auth_headers).json()["key"]
+        assert _wait_for_pdf(f"/report/pdf/{first}", auth_headers).status_code == 200
+
+        threat = report_threats.threats[0]
+        crud.update_remediation(db_session, threat.remediation_id, status=True)
+        response = client.get("/report/pdf", headers=auth_headers)
+        assert response.status_code == 202
+        second = response.json()["key"]
+        assert second != first and second.split("-v")[0] == first.split("-v")[0]
+        assert _wait_for_pdf(f"/report/pdf/{second}", auth_headers).status_code == 200
+        assert [p.name for p in pdf_cache.iterdir()] == [f"{second}.pdf"]
+
+    def test_filters_change_the_key_and_bad_keys(self, pdf_cache, report_threats, auth_headers):
+        all_key = client.get("/report/pdf", headers=auth_headers).json()["key"]
+        high = client.get("/report/pdf?current_risk=HIGH", headers=auth_headers).json()["key"]
+        assert all_key != high
+        for key in (all_key, high):
+            assert _wait_for_pdf(f"/report/pdf/{key}", auth_headers).status_code == 200
+        assert client.get("/report/pdf/../../etc", headers=auth_headers).status_code == 404
+        assert client.get(f"/report/pdf/{'0' * 32}-v999", headers=auth_headers).status_code == 404
+        assert client.get("/report/pdf?inherit_risk=BAD", headers=auth_headers).status_code == 400
+
+    def test_writes_bump_only_their_project_version(self, report_threats, db_session, test_user):
+        versions = dict(db_session.query(models.DataVersion.scope, models.DataVersion.version))
+        assert list(versions) == [models.project_scope(None)]  # No shared 'global' row to contend on
+        assert crud.get_data_version(db_session) == sum(versions.values())
+
+        test_user.name = "Renamed"  # Not report data
+        db_session.commit()
+        assert crud.get_data_version(db_session) == sum(versions.values())
+
+        crud.update_remediation(db_session, report_threats.threats[0].remediation_id, status=True)
+        assert crud.get_data_version(db_session, models.project_scope(None)) == versions["project:none"] + 1
+        assert crud.get_data_version(db_session) == sum(versions.values()) + 1
+
+    def test_cache_is_capped_and_failures_reported_once(self, pdf_cache, report_threats, auth_headers, monkeypatch):
+        monkeypatch.setattr(report_pdf, "REPORT_CACHE_MAX_BYTES", 1)  # Only the latest PDF fits
+        first = client.get("/report/pdf", headers=auth_headers).json()["key"]
+        assert _wait_for_pdf(f"/report/pdf/{first}", auth_headers).status_code == 200
+        second = client.get("/report/pdf?current_risk=MEDIUM", headers=auth_headers).json()["key"]
+        assert _wait_for_pdf(f"/report/pdf/{second}", auth_headers).status_code == 200
+        assert [p.name for p in pdf_cache.iterdir()] == [f"{second}.pdf"]
+
+        def broken(*args):
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr(report_pdf, "render_pdf", broken)
+        key = client.get("/report/pdf?current_risk=LOW", headers=auth_headers).json()["key"]
+        assert _wait_for_pdf(f"/report/pdf/{key}", auth_headers).status_code == 500
+        assert client.get(f"/report/pdf/{key}", headers=auth_headers).status_code == 404
+        assert key not in report_pdf._jobs
+        assert [p.name for p in pdf_cache.iterdir()] == [f"{second}.pdf"]  # No temporary file left
+
+    def test_version_bump_is_one_upsert(self, db_session):
+        scope = models.project_scope("new-project")
+        for _ in range(2):
+            models.bump_data_version(db_session.connection(), scope)
+        assert crud.get_data_version(db_session, scope) == 2
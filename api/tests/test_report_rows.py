@@ -0,0 +1,55 @@
+"""
+Tests for the slim rows and sparse fieldsets of /report
+"""
+import pytest
+
+import crud
+from tests.conftest import client
+
+
+@pytest.fixture
+def report_threats(db_session, test_information_system):
+    crud.bulk_create_threats(
+        db_session, test_information_system.id,
+        [
+            {
+                "title": f"T{n}", "description": "d", "type": "Spoofing",
+                "risk": {factor: 1 for factor in crud.OWASP_RISK_FACTORS},
+                "remediation": {"description": "fix"},
+            }
+            for n in range(3)
+        ],
+    )
+    return test_information_system
+
+
+class TestReportRows:
+    def test_full_view_is_the_default(self, report_threats, auth_headers):
+        rows = client.get("/report", headers=auth_headers).json()
+        assert len(rows[0]["information_system"]["threats"]) == 3
+
+    def test_slim_view_drops_sibling_threats(self, report_threats, auth_headers):
+        full = client.get("/report", headers=auth_headers).json()
+        slim = client.get("/report?view=slim", headers=auth_headers).json()
+        assert [row["id"] for row in slim] == [row["id"] for row in full]
+        assert slim[0]["information_system"] == {
+            "id": str(report_threats.id),
+            "title": "Test System",
+            "project_id": None,
+            "project_name": None,
+        }
+        assert slim[0]["risk"] == full[0]["risk"]
+
+    def test_sparse_fieldset(self, report_threats, auth_headers):
+        response = client.get(
+            "/report", params={"fields": "title, current_risk_level", "limit": 2}, headers=auth_headers
+        )
+        assert response.status_code == 200
+        assert all(set(row) == {"id", "title", "current_risk_level"} for row in response.json())
+        assert "x-next-cursor" in response.headers  # Pagination headers survive the slim response
+
+    def test_invalid_view_or_field(self, report_threats, auth_headers):
+        assert client.get("/report?view=tiny", headers=auth_headers).status_code == 400
+        response = client.get("/report?fields=title,threats", headers=auth_headers)
+        assert response.status_code == 400
+        assert "threats" in response.json()["detail"]
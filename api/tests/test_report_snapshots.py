@@ -0,0 +1,130 @@
+"""
+Tests for the per-project report export snapshots
+"""
+import json
+
+import pytest
+
+import crud
+import models
+import report_snapshots
+from tests.conftest import client
+
+
+@pytest.fixture
+def snapshot_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(report_snapshots, "SNAPSHOT_DIR", str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def projects(db_session, test_user):
+    """Two projects with one system and two threats each."""
+    systems = []
+    for name in ("Alpha", "Beta"):
+        project = models.Project(name=name, created_by=test_user.id)
+        system = models.InformationSystem(title=f"{name} System", description="d", project=project)
+        db_session.add(system)
+        db_session.commit()
+        crud.bulk_create_threats(db_session, system.id, [
+            {
+                "title": f"{name} {n}", "description": "d", "type": "Spoofing",
+                "risk": {factor: 5 for factor in crud.OWASP_RISK_FACTORS},
+                "remediation": {"description": "fix", "control_tags": ["V2.1.1 (ASVS)"]},
+            }
+            for n in range(2)
+        ])
+        systems.append(system)
+    return systems
+
+
+def _wait_for_builds():
+    for future in list(report_snapshots._jobs.values()):
+        future.result(timeout=10)
+
+
+def _get_built(url, headers):
+    """Requests a key twice (its first build waits for the second) and waits for the build."""
+    first = client.get(url, headers=headers)
+    client.get(url, headers=headers)
+    _wait_for_builds()
+    return first
+
+
+class TestReportSnapshots:
+    def test_built_on_second_request_then_fresh(self, snapshot_dir, projects, auth_headers):
+        url = f"/report/export?project_id={projects[0].project_id}"
+        response = client.get(url, headers=auth_headers)
+        assert response.status_code == 200
+        assert "x-snapshot" not in response.headers  # Live answer
+        live = response.text
+        assert {json.loads(line)["title"] for line in live.splitlines()} == {"Alpha 0", "Alpha 1"}
+        _wait_for_builds()
+        assert not list(snapshot_dir.glob("*.json"))  # One-off requests are not materialized
+
+        client.get(url, headers=auth_headers)
+        _wait_for_builds()
+        response = client.get(url, headers=auth_headers)
+        assert response.headers["x-snapshot"] == "fresh"
+        assert response.text == live
+
+    def test_stale_answers_live_while_rebuilding(self, snapshot_dir, projects, db_session, auth_headers):
+        url = f"/report/export?project_id={projects[0].project_id}"
+        _get_built(url, auth_headers)
+
+        threat = db_session.query(models.Threat).filter_by(title="Alpha 0").one()
+        threat.title = "Alpha renamed"
+        db_session.commit()
+
+        response = client.get(url, headers=auth_headers)
+        assert "x-snapshot" not in response.headers
+        assert "Alpha renamed" in response.text and "Alpha 0" not in response.text
+
+        _wait_for_builds()
+        response = client.get(url, headers=auth_headers)
+        assert response.headers["x-snapshot"] == "fresh"
+        assert "Alpha renamed" in response.text
+        assert len(list(snapshot_dir.glob("*.body"))) <= 2  # Current and previous only
+        assert not list(snapshot_dir.glob("*.tmp"))
+
+    def test_other_project_writes_keep_snapshot_fresh(self, snapshot_dir, projects, db_session, auth_headers):
+        url = f"/report/export?project_id={projects[0].project_id}"
+        first = _get_built(url, auth_headers)
+        version = crud.get_data_version(db_session, models.project_scope(projects[0].project_id))
+
+        crud.bulk_create_threats(db_session, projects[1].id, [
+            {"title": "Beta 2", "description": "d", "type": "Tampering", "remediation": {"description": "fix"}},
+        ])
+        threat = db_session.query(models.Threat).filter_by(title="Beta 0").one()
+        threat.risk.skill_level = 1
+        db_session.commit()
+
+        response = client.get(url, headers=auth_headers)
+        assert response.headers["x-snapshot"] == "fresh"
+        assert response.headers["x-data-version"] == str(version)
+        assert "attachment" in response.headers["content-disposition"]
+        assert response.text == first.text
+
+    def test_keys_are_capped(self, snapshot_dir, projects, auth_headers, monkeypatch):
+        monkeypatch.setattr(report_snapshots, "SNAPSHOT_MAX_KEYS", 2)
+        urls = [f"/report/export?project_id={projects[0].project_id}&format={fmt}" for fmt in ("ndjson", "csv")]
+        urls.append(f"/report/export?project_id={projects[1].project_id}")
+        for url in urls:
+            _get_built(url, auth_headers)
+        assert len(list(snapshot_dir.glob("*.json"))) == 2
+        assert len(list(snapshot_dir.glob("*.body"))) == 2
+        assert client.get(urls[-1], headers=auth_headers).headers["x-snapshot"] == "fresh"
+
+    def test_report_pages_are_live(self, snapshot_dir, projects, auth_headers):
+        url = f"/report?project_id={projects[0].project_id}&limit=1"
+        _get_built(url, auth_headers)
+        response = client.get(url, headers=auth_headers)
+        assert "x-snapshot" not in response.headers  # Pages share one live keyset cursor
+        first = response.json()
+        cursor = response.headers["x-next-cursor"]
+
+        response = client.get(f"{url}&cursor={cursor}", headers=auth_headers)
+        titles = {row["title"] for row in first + response.json()}
+        assert titles == {"Alpha 0", "Alpha 1"}
+        assert not list(snapshot_dir.iterdir())
+        assert client.get("/report?project_id=nope", headers=auth_headers).status_code == 400
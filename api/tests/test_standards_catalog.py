@@ -0,0 +1,341 @@
+"""
+Tests for the precomputed indexes of the standards catalog
+"""
+import gc
+import mmap
+import os
+import subprocess
+import sys
+import tracemalloc
+from pathlib import Path
+
+import pytest
+
+import standards
+from standards._compact import CatalogReader, CatalogWriter, CompactCatalog, ControlView, write_catalog
+from standards import (
+    ALL_CONTROLS,
+    STANDARDS_MAP,
+    TAG_TO_STANDARD,
+    TAG_RECORDS,
+    categorize_tags,
+    get_all_predefined_tags,
+    get_standard_from_tag_id,
+    get_suggested_tags_for_stride,
+)
+
+
+class TestReverseIndex:
+    def test_every_control_is_indexed(self):
+        assert set(TAG_TO_STANDARD) == set(ALL_CONTROLS)
+        assert set(TAG_RECORDS) == set(ALL_CONTROLS)
+
+    def test_matches_linear_scan(self):
+        for tag_id in ALL_CONTROLS:
+            expected = next(std for std, controls in STANDARDS_MAP.items() if tag_id in controls)
+            assert get_standard_from_tag_id(tag_id) == expected
+
+    def test_unknown_tag(self):
+        assert get_standard_from_tag_id("NOPE-1") == ""
+        assert categorize_tags(["NOPE-1", "V2.1.1"]) == {"ASVS": ["V2.1.1"], "UNKNOWN": ["NOPE-1"]}
+
+    def test_records_are_immutable(self):
+        record = TAG_RECORDS["V2.1.1"]
+        assert record.tag == "V2.1.1 (ASVS)"
+        with pytest.raises(AttributeError):
+            record.standard = "NIST"
+
+    def test_returned_dicts_are_copies(self):
+        tags = get_all_predefined_tags()
+        assert len(tags) == len(ALL_CONTROLS)
+        tags[0]["title"] = "changed"
+        assert get_all_predefined_tags()[0]["title"] != "changed"
+
+    @pytest.mark.parametrize("category", list(standards.STRIDE_CONTROL_EXAMPLES))
+    def test_stride_suggestions_use_records(self, category):
+        for suggestion in get_suggested_tags_for_stride(category):
+            if suggestion["tag_id"] in TAG_RECORDS:
+                assert suggestion == TAG_RECORDS[suggestion["tag_id"]]._asdict()
+
+
+def _linear_search(query):
+    """Reference implementation: full scan with the same ranking tiers."""
+    query_lower, query_upper = query.lower(), query.upper()
+    exact = [t for t in ALL_CONTROLS if t.lower() == query_lower]
+    partial = [t for t in ALL_CONTROLS if query_lower in t.lower()]
+    if query_upper in STANDARDS_MAP:
+        by_standard = list(STANDARDS_MAP[query_upper])
+    else:
+        by_standard = [t for name, tags in STANDARDS_MAP.items() if query_upper in name for t in tags]
+    content = [
+        t for t, info in ALL_CONTROLS.items()
+        if any(query_lower in info.get(field, "").lower() for field in ("title", "description"))
+    ]
+    results = list(dict.fromkeys(exact + partial + by_standard + content))[:50]
+    return results or [
+        t for t, info in ALL_CONTROLS.items() if query_lower in info.get("category", "").lower()
+    ][:50]
+
+
+class TestSearchIndex:
+    @pytest.mark.parametrize("query", [
+        "V2.1", "v2.1.1", "ASVS", "MASVS", "SBS", "nist", "AUTH", "pr.ac",
+        "password", "cifrado", "Authentication", "log", "zz", "a.9", "xyz123",
+        "logging", "session management",
+    ])
+    def test_matches_linear_scan(self, query):
+        assert standards.search_predefined_tags(query) == _linear_search(query)
+
+    def test_formatted_query_uses_base_tag(self):
+        assert standards.search_predefined_tags("V2.1.1 (ASVS)")[0] == "V2.1.1"
+
+    def test_short_queries(self):
+        assert standards.search_predefined_tags("V") == []
+        # A one-character base tag falls back to verifying every control
+        results = standards.search_predefined_tags("V (ASVS)")
+        assert len(results) == 50
+        assert all("v" in tag.lower() for tag in results)
+
+
+class TestRagLiteBm25:
+    CONTEXT = "Login con usuario y contraseña, tokens de sesión en cookies, API REST con cifrado TLS"
+
+    def test_output_format_and_limit(self):
+        result = standards.rag_lite_suggest(self.CONTEXT, top_n_per_standard=2)
+        assert result
+        for std, controls in result.items():
+            assert std in STANDARDS_MAP
+            assert 1 <= len(controls) <= 2
+            for control in controls:
+                tag_id = control["tag"].rsplit(" (", 1)[0]
+                assert control["tag"] == f"{tag_id} ({std})"
+                assert control["title"] == ALL_CONTROLS[tag_id]["title"]
+
+    def test_ranking_is_by_bm25_score(self):
+        scores = standards._BM25_INDEX.scores(self.CONTEXT)
+        tag_ids = standards._SEARCH_INDEX.tag_ids
+        result = standards.rag_lite_suggest(self.CONTEXT, top_n_per_standard=3)
+        for controls in result.values():
+            ranked = [scores[tag_ids.index(c["tag"].rsplit(" (", 1)[0])] for c in controls]
+            assert ranked == sorted(ranked, reverse=True)
+
+    def test_rare_terms_weigh_more(self):
+        # 'de' is a stopword and common words get a low idf
+        assert standards.rag_lite_suggest("de la el") == {}
+        result = standards.rag_lite_suggest("session")
+        assert result["ASVS"][0]["tag"].startswith("V3.")
+
+
+class TestAutocomplete:
+    @pytest.mark.parametrize("query, expected", [
+        ("V2.1", ["V2.1.1", "V2.1.2", "V2.1.3"]),
+        ("auth-", ["AUTH-1", "AUTH-2", "AUTH-3"]),
+        ("MASVS-AUTH-1", ["AUTH-1"]),
+        ("a.9.4", ["A.9.4.1", "A.9.4.2"]),
+        ("V2.1.1 (ASVS)", ["V2.1.1"]),
+    ])
+    def test_id_prefixes(self, query, expected):
+        assert standards.autocomplete_tags(query, limit=len(expected)) == expected
+
+    def test_accents_and_typos(self):
+        folded = standards.autocomplete_tags("sesion")
+        assert folded == standards.autocomplete_tags("sesión")
+        assert standards.autocomplete_tags("passwrd") == standards.autocomplete_tags("password")[:4]
+        assert standards.autocomplete_tags("V2.1.9") == []  # IDs are never typo-corrected
+        assert standards.autocomplete_tags("xyzzy") == []
+
+    def test_ranking(self):
+        from standards._autocomplete import AutocompleteIndex, fold
+        index = AutocompleteIndex(standards._CATALOG_REF.catalog)
+        # Forcing the fuzzy walk: exact prefixes first, then typo matches; ID matches before title matches
+        words = index._match_word("auth", enough=316)
+        ordinals = [list(ALL_CONTROLS).index(tag_id) for tag_id in index.complete("auth", limit=316)]
+        assert len(ordinals) == len(words)
+        assert [words[o] for o in ordinals] == sorted(words.values())
+        assert index.complete("auth", limit=7) == [f"AUTH-{n}" for n in range(1, 8)]
+        assert all(distance == 1 for distance, _ in index._match_word("authentcation", enough=316).values())
+        assert fold("Autenticación") == "autenticacion"
+
+    def test_every_word_must_match(self):
+        results = standards.autocomplete_tags("control acceso", limit=50)
+        assert results
+        for tag_id in results:
+            title = ALL_CONTROLS[tag_id]["title"].lower()
+            assert "contro" in title and "acces" in title
+
+
+class TestCrosswalk:
+    def test_every_mapped_tag_exists(self):
+        from standards._crosswalk import CROSSWALK_GROUPS
+        missing = [tag_id for tags in CROSSWALK_GROUPS.values() for tag_id in tags if tag_id not in ALL_CONTROLS]
+        assert missing == []
+
+    def test_related_controls_of_other_standards(self):
+        crosswalk = standards.get_crosswalk("V2.1.1 (ASVS)")
+        assert crosswalk["NIST"] == ["PR.AC-1"]
+        assert crosswalk["ISO27001"] == ["A.9.2.4", "A.9.3.1", "A.9.4.3"]
+        assert "ASVS" not in crosswalk
+        assert standards.get_crosswalk("PR.AC-1", ["asvs"]) == {"ASVS": ["V2.1.1", "V2.1.2", "V2.1.3", "V2.3.1", "V2.5.1"]}
+        assert standards.get_crosswalk("NOT-A-TAG") == {}
+
+    def test_relation_is_symmetric(self):
+        for tag_id in ("V6.2.1", "AUTH-3", "SBS-504-13", "A.9.4.2"):
+            for related in (t for tags in standards.get_crosswalk(tag_id).values() for t in tags):
+                own = TAG_TO_STANDARD[tag_id]
+                assert tag_id in standards.get_crosswalk(related)[own]
+
+    def test_coverage(self):
+        assert standards.crosswalk_standards(["V9.1.1 (ASVS)"]) == {"ASVS", "NIST", "MASVS", "SBS"}
+        assert standards.crosswalk_standards(["V11.1.1", "garbage"]) == {"ASVS"}
+        assert standards.crosswalk_standards([]) == set()
+
+
+class TestTagCorrectionFastPath:
+    @pytest.mark.parametrize("raw, expected", [
+        ("V2.1.1 (ASVS)", "V2.1.1 (ASVS)"),
+        ("SBS-504-0", "SBS-504-1 (SBS)"),
+        ("SBS-504-99", "SBS-504-20 (SBS)"),
+        ("SBS-504-7.2", "SBS-504-7 (SBS)"),
+        ("SBS-9999-1", "SBS-9999-1 (SBS)"),
+        ("SC-8 (NIST)", "SC-8 (NIST)"),
+        ("not a tag", None),
+    ])
+    def test_single_tag_correction(self, raw, expected):
+        assert standards._correct_control_tag(raw) == expected
+
+    def test_sbs_index_is_sorted_per_resolution(self):
+        numbers, tag_ids = standards._SBS_BY_RESOLUTION["504"]
+        assert numbers == sorted(numbers)
+        assert tag_ids[numbers.index(10)] == "SBS-504-10"
+
+    def test_repeated_tags_hit_the_cache(self):
+        standards._correct_control_tag.cache_clear()
+        tags = ["V2.1.1 (ASVS)", "SBS-504-99"] * 50
+        assert standards.validate_and_correct_control_tags(tags) == ["V2.1.1 (ASVS)", "SBS-504-20 (SBS)"]
+        info = standards._correct_control_tag.cache_info()
+        assert info.misses == 2
+        assert info.hits == 98
+
+    def test_cache_is_cleared_on_catalog_rebuild(self):
+        standards._correct_control_tag("V2.1.1 (ASVS)")
+        standards.build_catalog_snapshot("")
+        assert standards._correct_control_tag.cache_info().currsize == 0
+
+
+class TestCatalogSnapshot:
+    def test_discovery_skips_helpers_and_backups(self):
+        files = standards._discover_standard_files()
+        assert "sbs.py" in files
+        assert "sbs.backup.py" not in files
+        assert not any(f.startswith("_") for f in files)
+        assert files == sorted(files)
+
+    def test_snapshot_round_trip(self, tmp_path):
+        path = str(tmp_path / "catalog.bin")
+        before = {tag: dict(info) for tag, info in ALL_CONTROLS.items()}
+        loaded = standards.build_catalog_snapshot(path)
+        source_hash = standards._catalog_source_hash(standards._discover_standard_files())
+
+        reader = standards._read_snapshot(path, source_hash)
+        assert reader.meta["loaded_standards"] == loaded
+        assert reader.meta["catalog_version"] == standards.CATALOG_VERSION
+        catalog = CompactCatalog(reader)
+        assert [catalog.record(o) for o in range(len(catalog.tag_ids))] == list(TAG_RECORDS.values())
+        assert ALL_CONTROLS == before
+
+    def test_source_hash_covers_every_package_module(self, tmp_path, monkeypatch):
+        for source in Path(standards.__file__).parent.glob("*.py"):
+            (tmp_path / source.name).write_bytes(source.read_bytes())
+        monkeypatch.setattr(standards, "current_dir", tmp_path)
+        files = standards._discover_standard_files()
+        before = standards._catalog_source_hash(files)
+        with open(tmp_path / "_autocomplete.py", "a", encoding="utf-8") as f:
+            f.write("\n# changed\n")
+        assert standards._catalog_source_hash(files) != before
+
+    def test_stale_or_corrupt_snapshot_is_ignored(self, tmp_path):
+        path = tmp_path / "catalog.bin"
+        standards.build_catalog_snapshot(str(path))
+        assert standards._read_snapshot(str(path), "other-sources") is None
+        path.write_bytes(b"not a catalog")
+        assert standards._read_snapshot(str(path), "other-sources") is None
+        assert standards._read_snapshot(str(tmp_path / "missing.bin"), "x") is None
+
+    def test_warm_start_skips_the_standard_modules(self, tmp_path):
+        # The startup win of the snapshot: a fresh process maps it instead of
+        # importing and indexing every standard module
+        path = tmp_path / "catalog.bin"
+        standards.build_catalog_snapshot(str(path))
+        code = (
+            "import sys, standards; "
+            "print(sorted(m for m in sys.modules if m.startswith('standards.') and not m.startswith('standards._')))"
+        )
+        env = {**os.environ, "TZU_CATALOG_SNAPSHOT": str(path)}
+        out = subprocess.run(
+            [sys.executable, "-c", code], env=env, cwd=Path(standards.__file__).parent.parent,
+            capture_output=True, text=True, check=True,
+        ).stdout
+        assert "Catalog snapshot loaded" in out
+        assert out.strip().splitlines()[-1] == "[]"
+
+    def test_views_keep_identity_across_rebuilds(self, tmp_path):
+        standards.build_catalog_snapshot(str(tmp_path / "catalog.bin"))
+        assert standards.ALL_CONTROLS is ALL_CONTROLS
+        assert len(ALL_CONTROLS) == sum(len(c) for c in STANDARDS_MAP.values())
+        assert standards.search_predefined_tags("V2.1.1 (ASVS)")[0] == "V2.1.1"
+
+
+class TestCompactLayout:
+    def test_views_behave_like_the_former_dicts(self):
+        assert "V2.1.1" in ALL_CONTROLS and "NOPE" not in ALL_CONTROLS
+        control = ALL_CONTROLS["V2.1.1"]
+        assert control.get("title") and control.get("missing", "x") == "x"
+        assert control.copy() == dict(control)
+        assert list(STANDARDS_MAP["SBS"])[0] == "SBS-504-1"
+        assert "V2.1.1" in STANDARDS_MAP["ASVS"] and "V2.1.1" not in STANDARDS_MAP["NIST"]
+        assert standards.TAGS_MAP["ASVS_TAGS"] == list(STANDARDS_MAP["ASVS"])
+        assert standards.ASVS_CONTROLS["V2.1.1"] == control
+        with pytest.raises(KeyError):
+            ALL_CONTROLS["NOPE"]
+
+    def test_extra_fields_and_duplicates(self):
+        writer = CatalogWriter()
+        write_catalog(writer, {
+            "A": {"X-1": {"title": "a", "description": "d", "category": "c", "level": 2}},
+            "B": {"X-1": {"title": "b", "description": "d", "category": "c"}, "Y-1": {"title": "y"}},
+        }, {"A": "1.0"})
+        catalog = CompactCatalog(CatalogReader(writer.to_bytes({})))
+        # ALL_CONTROLS semantics: first position, last value; first standard wins the reverse map
+        assert list(catalog.tag_ids) == ["X-1", "Y-1"]
+        assert catalog.record(0).title == "b"
+        assert catalog.standard_of(0) == "A"
+        a_entry = catalog.entry_of("A", "X-1")
+        assert dict(ControlView(catalog, a_entry)) == {"title": "a", "description": "d", "category": "c", "level": 2}
+        assert list(catalog.standard_ordinals("B")) == [0, 1]
+        assert catalog.standards[0][1] == "1.0" and catalog.standards[1][1] is None
+
+    def test_snapshot_is_memory_mapped(self, tmp_path):
+        standards.build_catalog_snapshot(str(tmp_path / "catalog.bin"))
+        assert isinstance(standards._CATALOG_REF.catalog.reader._buffer, mmap.mmap)
+
+    def test_lookups_keep_no_per_process_copies(self):
+        catalog = standards._CATALOG_REF.catalog
+        attributes = dict(vars(catalog))
+        tracemalloc.start()
+        try:
+            get_all_predefined_tags()
+            for tag_id in ALL_CONTROLS:
+                standards.get_tag_details(tag_id)
+                ALL_CONTROLS[tag_id]["title"]
+            gc.collect()
+            retained, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        assert vars(catalog) == attributes  # Nothing decoded was cached on the catalog
+        assert retained < 16 * 1024
+
+        details = standards.get_tag_details("v2.1.1")
+        assert details["standard"] == "ASVS" and details["title"] == ALL_CONTROLS["V2.1.1"]["title"]
+        details["title"] = "changed"
+        assert standards.get_tag_details("V2.1.1")["title"] != "changed"
+        assert standards.STANDARDS_VERSIONS == catalog.versions()
@@ -0,0 +1,54 @@
+"""
+Tests for the stored risk scores/levels of risks and threats
+"""
+import crud
+import models
+import schemas
+from tests.conftest import client
+
+
+def _factors(value):
+    return {factor: value for factor in crud.OWASP_RISK_FACTORS}
+
+
+def _create_threat(db_session, system, value):
+    risk = crud.create_risk(db_session, schemas.Risk(**_factors(value)))
+    remediation = crud.create_remediation(db_session, "fix")
+    return crud.create_threat(db_session, "T", "d", "Spoofing", system.id, risk.id, remediation.id)
+
+
+class TestStoredRiskLevels:
+    def test_orm_writes_store_scores_and_levels(self, db_session, test_information_system):
+        threat = _create_threat(db_session, test_information_system, 7)
+        assert (threat.risk.likelihood, threat.risk.impact, threat.risk.risk_score) == (7, 7, 7)
+        assert threat.risk.inherent_level == "HIGH"
+        assert threat.current_level == "HIGH"
+
+        crud.update_threat_risk(db_session, str(threat.id), {**_factors(2), "residual_risk": 1})
+        db_session.refresh(threat)
+        assert threat.risk.inherent_level == "LOW" and threat.current_level == "LOW"
+
+        crud.update_threat_risk(db_session, str(threat.id), {**_factors(9), "residual_risk": 4})
+        db_session.refresh(threat)
+        assert threat.current_level == "CRITICAL"  # Remediation not applied yet
+
+        crud.update_remediation(db_session, threat.remediation_id, status=True)
+        db_session.refresh(threat)
+        assert threat.current_level == "MEDIUM" == threat.current_risk_level
+
+    def test_bulk_insert_computes_levels(self, db_session, test_information_system):
+        crud.bulk_create_threats(db_session, test_information_system.id, [
+            {"title": "T", "description": "d", "type": "Spoofing", "risk": _factors(4), "remediation": {"description": "fix"}},
+        ])
+        threat = db_session.query(models.Threat).one()
+        assert threat.risk.risk_score == 4 and threat.risk.inherent_level == "MEDIUM"
+        assert threat.current_level == threat.current_risk_level == "MEDIUM"
+
+    def test_report_filters_use_stored_levels(self, db_session, test_information_system, auth_headers):
+        _create_threat(db_session, test_information_system, 1)
+        high = _create_threat(db_session, test_information_system, 7)
+        response = client.get("/report?inherit_risk=high", headers=auth_headers)
+        assert [t["id"] for t in response.json()] == [str(high.id)]
+        response = client.get("/report?current_risk=LOW", headers=auth_headers)
+        assert len(response.json()) == 1 and response.json()[0]["id"] != str(high.id)
+        assert db_session.query(models.Risk).order_by(models.Risk.overall_risk_score.desc()).first().id == high.risk_id
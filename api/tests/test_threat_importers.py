@@ -0,0 +1,164 @@
+"""
+Tests for Threat Dragon / TM7 importers and the /import endpoint
+"""
+import json
+
+import pytest
+
+import models
+from tests.conftest import client
+from threat_importers import (
+    parse_threat_dragon,
+    parse_tm7,
+    parse_threat_model,
+    normalize_imported_category,
+    ImportFormatError,
+)
+
+
+THREAT_DRAGON_V2 = {
+    "version": "2.2.0",
+    "summary": {"title": "Payments Portal", "description": "Customer payments"},
+    "detail": {
+        "diagrams": [{
+            "title": "Main",
+            "cells": [
+                {"shape": "process", "data": {"name": "API Gateway", "threats": [
+                    {"title": "Token forgery", "type": "Spoofing", "status": "Open",
+                     "severity": "High", "description": "JWT not verified", "mitigation": "Verify signatures"},
+                    {"title": "Flooding", "type": "Availability", "status": "Mitigated",
+                     "severity": "Low", "description": "No rate limiting", "mitigation": "Rate limit"},
+                ]}},
+                {"shape": "flow", "data": {"name": "HTTPS"}},
+            ],
+        }],
+    },
+}
+
+THREAT_DRAGON_V1 = {
+    "summary": {"title": "Legacy"},
+    "detail": {"diagrams": [{"diagramJson": {"cells": [
+        {"type": "tm.Store", "name": "DB", "threats": [
+            {"title": "Log tampering", "type": "Tampering", "status": "Open", "severity": "Medium"},
+        ]},
+    ]}}]},
+}
+
+TM7 = b"""\xef\xbb\xbf<ThreatModel xmlns="http://schemas.datacontract.org/2004/07/ThreatModeling.Model"
+ xmlns:i="http://www.w3.org/2001/XMLSchema-instance">
+  <MetaInformation>
+    <HighLevelSystemDescription>Mobile banking backend</HighLevelSystemDescription>
+    <ThreatModelName>Mobile Banking</ThreatModelName>
+  </MetaInformation>
+  <ThreatInstances xmlns:a="http://schemas.microsoft.com/2003/10/Serialization/Arrays">
+    <a:KeyValueOfstringThreatpc_P0_PhOB>
+      <a:Key>T1</a:Key>
+      <a:Value xmlns:b="http://schemas.datacontract.org/2004/07/ThreatModeling.KnowledgeBase">
+        <b:Properties>
+          <a:KeyValueOfstringstring><a:Key>Title</a:Key><a:Value>Elevation using impersonation</a:Value></a:KeyValueOfstringstring>
+          <a:KeyValueOfstringstring><a:Key>UserThreatCategory</a:Key><a:Value>Elevation Of Privilege</a:Value></a:KeyValueOfstringstring>
+          <a:KeyValueOfstringstring><a:Key>UserThreatDescription</a:Key><a:Value>Service may impersonate the client</a:Value></a:KeyValueOfstringstring>
+          <a:KeyValueOfstringstring><a:Key>InteractionString</a:Key><a:Value>App to API</a:Value></a:KeyValueOfstringstring>
+          <a:KeyValueOfstringstring><a:Key>PossibleMitigations</a:Key><a:Value>Use least privilege</a:Value></a:KeyValueOfstringstring>
+          <a:KeyValueOfstringstring><a:Key>Priority</a:Key><a:Value>Critical</a:Value></a:KeyValueOfstringstring>
+        </b:Properties>
+        <b:State>Mitigated</b:State>
+      </a:Value>
+    </a:KeyValueOfstringThreatpc_P0_PhOB>
+  </ThreatInstances>
+</ThreatModel>"""
+
+
+class TestParsers:
+    def test_threat_dragon_v2(self):
+        model = parse_threat_dragon(json.dumps(THREAT_DRAGON_V2).encode())
+        assert model["title"] == "Payments Portal"
+        assert len(model["threats"]) == 2
+        forgery, flooding = model["threats"]
+        assert forgery["type"] == "Spoofing"
+        assert forgery["description"].startswith("API Gateway:")
+        assert forgery["remediation"] == {"description": "Verify signatures", "status": False, "control_tags": []}
+        assert set(forgery["risk"].values()) == {7}
+        assert flooding["type"] == "Denial of Service"
+        assert flooding["remediation"]["status"] is True
+
+    def test_threat_dragon_v1(self):
+        model = parse_threat_dragon(json.dumps(THREAT_DRAGON_V1).encode())
+        assert [t["type"] for t in model["threats"]] == ["Tampering"]
+        assert model["threats"][0]["remediation"]["description"] == "No remediation defined"
+
+    def test_tm7(self):
+        model = parse_tm7(TM7)
+        assert model["title"] == "Mobile Banking"
+        assert model["description"] == "Mobile banking backend"
+        threat = model["threats"][0]
+        assert threat["type"] == "Elevation of Privilege"
+        assert threat["description"] == "App to API: Service may impersonate the client"
+        assert threat["remediation"]["status"] is True
+        assert set(threat["risk"].values()) == {9}
+
+    def test_format_detection_and_errors(self):
+        assert parse_threat_model("model.tm7", TM7)[0] == "tm7"
+        with pytest.raises(ImportFormatError):
+            parse_threat_model("model.json", b'{"not": "a model"}')
+        with pytest.raises(ImportFormatError):
+            parse_threat_model("model.yaml", b"")
+
+    @pytest.mark.parametrize("model", [
+        {"summary": {}, "detail": {"diagrams": ["not a diagram"]}},
+        {"summary": {}, "detail": {"diagrams": [{"cells": [None, 3]}]}},
+        {"summary": {}, "detail": {"diagrams": [{"cells": [{"data": {"threats": {"title": "x"}}}]}]}},
+        {"summary": {}, "detail": {"diagrams": [{"cells": [{"data": {"threats": ["x"]}}]}]}},
+        {"summary": {}, "detail": {"diagrams": [{"cells": [{"data": {"threats": [{"title": ["x"]}]}}]}]}},
+        {"summary": {}, "detail": {"diagrams": [{"diagramJson": {"cells": "x"}}]}},
+        {"summary": [], "detail": {}},
+    ])
+    def test_malformed_threat_dragon(self, model):
+        with pytest.raises(ImportFormatError):
+            parse_threat_dragon(json.dumps(model).encode())
+
+    def test_tm7_entities_rejected(self):
+        bomb = (
+            b'<?xml version="1.0"?><!DOCTYPE ThreatModel [<!ENTITY a "aaaaaaaaaa">'
+            b'<!ENTITY b "&a;&a;&a;&a;&a;&a;&a;&a;&a;&a;">]><ThreatModel>&b;</ThreatModel>'
+        )
+        with pytest.raises(ImportFormatError):
+            parse_tm7(bomb)
+
+    def test_category_fallback(self):
+        assert normalize_imported_category("information disclosure") == "Information Disclosure"
+        assert normalize_imported_category("Linkability") == "Information Disclosure"
+        assert normalize_imported_category("unknown") == "Spoofing"
+
+
+class TestImportEndpoint:
+    def test_requires_analyst(self, auth_headers):
+        response = client.post("/import", files=[("files", ("m.tm7", TM7))], headers=auth_headers)
+        assert response.status_code == 403
+
+    def test_import_multiple_files(self, analyst_auth_headers, db_session):
+        files = [
+            ("files", ("portal.json", json.dumps(THREAT_DRAGON_V2).encode(), "application/json")),
+            ("files", ("banking.tm7", TM7, "application/xml")),
+            ("files", ("broken.json", b"{", "application/json")),
+        ]
+        response = client.post("/import", files=files, headers=analyst_auth_headers)
+        assert response.status_code == 200
+        body = response.json()
+        assert body["systems_imported"] == 2
+        assert body["threats_imported"] == 3
+        assert body["results"][2]["success"] is False
+
+        system_id = body["results"][1]["information_system_id"]
+        threats = client.get(f"/information_systems/{system_id}/threats", headers=analyst_auth_headers).json()
+        assert len(threats) == 1
+        assert threats[0]["type"] == "Elevation of Privilege"
+        assert threats[0]["current_risk_level"] == "CRITICAL"
+        assert db_session.query(models.Risk).count() == 3
+
+    def test_malformed_model_is_reported_not_500(self, analyst_auth_headers):
+        malformed = {"summary": {}, "detail": {"diagrams": [{"cells": [{"data": {"threats": [42]}}]}]}}
+        files = [("files", ("odd.json", json.dumps(malformed).encode(), "application/json"))]
+        response = client.post("/import", files=files, headers=analyst_auth_headers)
+        assert response.status_code == 200
+        assert response.json()["results"][0]["success"] is False
@@ -0,0 +1,259 @@
+# Native importers for existing threat models
+"""
+Parses OWASP Threat Dragon (JSON, v1 and v2 schemas) and Microsoft Threat
+Modeling Tool (.tm7 XML) files into the structure persisted by
+crud.import_threat_model, without an LLM round trip.
+
+Each importer returns a dict:
+    {
+        "title": str,
+        "description": str,
+        "threats": [
+            {
+                "title": str,
+                "description": str,
+                "type": STRIDE category (normalized),
+                "remediation": {"description": str, "status": bool, "control_tags": []},
+                "risk": {OWASP factor: int, ...},
+            },
+        ],
+    }
+"""
+
+import json
+from pathlib import Path
+from defusedxml import DefusedXmlException
+from defusedxml import ElementTree
+
+from stride_validator import normalize_stride_category
+
+OWASP_FACTORS = (
+    'skill_level', 'motive', 'opportunity', 'size',
+    'ease_of_discovery', 'ease_of_exploit', 'awareness', 'intrusion_detection',
+    'loss_of_confidentiality', 'loss_of_integrity', 'loss_of_availability', 'loss_of_accountability',
+    'financial_damage', 'reputation_damage', 'non_compliance', 'privacy_violation',
+)
+
+# Uniform factor value per source severity; the OWASP overall score equals the
+# value, so each severity lands in the matching TZU risk level.
+_SEVERITY_FACTOR = {
+    'low': 2,
+    'medium': 5,
+    'high': 7,
+    'critical': 9,
+}
+_DEFAULT_FACTOR = 5  # Same default as manually created threats
+
+# Non-STRIDE categories used by Threat Dragon (CIA, LINDDUN, DIE) and TMT templates
+_CATEGORY_FALLBACKS = {
+    'confidentiality': 'Information Disclosure',
+    'integrity': 'Tampering',
+    'availability': 'Denial of Service',
+    'distributed': 'Denial of Service',
+    'immutable': 'Tampering',
+    'ephemeral': 'Tampering',
+    'linkability': 'Information Disclosure',
+    'identifiability': 'Information Disclosure',
+    'non-repudiation': 'Repudiation',
+    'detectability': 'Information Disclosure',
+    'disclosure of information': 'Information Disclosure',
+    'unawareness': 'Information Disclosure',
+    'non-compliance': 'Repudiation',
+}
+
+_MITIGATED_STATES = {'mitigated'}
+
+
+class ImportFormatError(ValueError):
+    """Raised when a file is not a supported threat model."""
+
+
+def normalize_imported_category(category):
+    """Maps a source threat category to a STRIDE category ('Spoofing' as last resort)."""
+    normalized = normalize_stride_category(category)
+    if normalized:
+        return normalized
+    key = (category or '').strip().lower()
+    return _CATEGORY_FALLBACKS.get(key, 'Spoofing')
+
+
+def risk_from_severity(severity):
+    value = _SEVERITY_FACTOR.get((severity or '').strip().lower(), _DEFAULT_FACTOR)
+    return {factor: value for factor in OWASP_FACTORS}
+
+
+def _threat(title, description, category, mitigation, status, severity):
+    return {
+        "title": (title or '').strip() or 'Imported threat',
+        "description": (description or '').strip(),
+        "type": normalize_imported_category(category),
+        "remediation": {
+            "description": (mitigation or '').strip() or 'No remediation defined',
+            "status": (status or '').strip().lower() in _MITIGATED_STATES,
+            "control_tags": [],
+        },
+        "risk": risk_from_severity(severity),
+    }
+
+
+# =====================================================
+# OWASP THREAT DRAGON
+# =====================================================
+
+def _expect(value, kind, what):
+    """value (None counts as empty) if it has the expected JSON type, else ImportFormatError."""
+    if value is None:
+        return kind()
+    if not isinstance(value, kind):
+        raise ImportFormatError(f"Invalid Threat Dragon model: {what} must be a {'list' if kind is list else 'object'}")
+    return value
+
+
+def _text(value, what):
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value)
+    raise ImportFormatError(f"Invalid Threat Dragon model: {what} must be text")
+
+
+def _threat_dragon_cells(diagram):
+    # v2: diagram.cells[].data.threats / v1: diagram.diagramJson.cells[].threats
+    if isinstance(diagram.get('cells'), list):
+        for cell in diagram['cells']:
+            data = _expect(_expect(cell, dict, 'cell').get('data'), dict, 'cell data')
+            yield _text(data.get('name'), 'cell name') or '', _expect(data.get('threats'), list, 'threats')
+    diagram_json = _expect(diagram.get('diagramJson'), dict, 'diagramJson')
+    for cell in _expect(diagram_json.get('cells'), list, 'cells'):
+        cell = _expect(cell, dict, 'cell')
+        yield _text(cell.get('name'), 'cell name') or '', _expect(cell.get('threats'), list, 'threats')
+
+
+def parse_threat_dragon(raw_bytes):
+    """Parses an OWASP Threat Dragon model (v1 or v2 JSON)."""
+    try:
+        data = json.loads(raw_bytes.decode('utf-8-sig'))
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ImportFormatError(f"Invalid Threat Dragon JSON: {e}") from e
+
+    if not isinstance(data, dict) or 'detail' not in data or 'summary' not in data:
+        raise ImportFormatError("Not a Threat Dragon model: missing 'summary'/'detail'")
+
+    # Every element is checked: a malformed model is a format error, not a crash
+    summary = _expect(data.get('summary'), dict, 'summary')
+    detail = _expect(data.get('detail'), dict, 'detail')
+    threats = []
+    for diagram in _expect(detail.get('diagrams'), list, 'diagrams'):
+        for element_name, element_threats in _threat_dragon_cells(_expect(diagram, dict, 'diagram')):
+            for t in element_threats:
+                t = _expect(t, dict, 'threat')
+                fields = {
+                    name: _text(t.get(name), f"threat {name}")
+                    for name in ('title', 'description', 'type', 'mitigation', 'status', 'severity')
+                }
+                description = fields['description'] or ''
+                if element_name and element_name not in description:
+                    description = f"{element_name}: {description}" if description else element_name
+                threats.append(_threat(
+                    fields['title'],
+                    description,
+                    fields['type'],
+                    fields['mitigation'],
+                    fields['status'],
+                    fields['severity'],
+                ))
+
+    return {
+        "title": _text(summary.get('title'), 'summary title') or 'Threat Dragon model',
+        "description": _text(summary.get('description'), 'summary description') or '',
+        "threats": threats,
+    }
+
+
+# =====================================================
+# MICROSOFT THREAT MODELING TOOL (.tm7)
+# =====================================================
+
+def _local(tag):
+    return tag.rsplit('}', 1)[-1]
+
+
+def _child(element, name):
+    for child in element:
+        if _local(child.tag) == name:
+            return child
+    return None
+
+
+def _child_text(element, name):
+    child = _child(element, name) if element is not None else None
+    return (child.text or '').strip() if child is not None and child.text else ''
+
+
+def _tm7_properties(value_element):
+    props = {}
+    properties = _child(value_element, 'Properties')
+    if properties is None:
+        return props
+    for pair in properties:
+        key = _child_text(pair, 'Key')
+        if key:
+            props[key] = _child_text(pair, 'Value')
+    return props
+
+
+def parse_tm7(raw_bytes):
+    """Parses a Microsoft Threat Modeling Tool .tm7 file (entities and DTDs are rejected)."""
+    try:
+        root = ElementTree.fromstring(raw_bytes)
+    except ElementTree.ParseError as e:
+        raise ImportFormatError(f"Invalid TM7 XML: {e}") from e
+    except DefusedXmlException as e:
+        raise ImportFormatError(f"Unsafe TM7 XML: {e}") from e
+
+    if _local(root.tag) != 'ThreatModel':
+        raise ImportFormatError("Not a TM7 model: root element is not ThreatModel")
+
+    meta = _child(root, 'MetaInformation')
+    threats = []
+    instances = _child(root, 'ThreatInstances')
+    for entry in (instances if instances is not None else []):
+        value = _child(entry, 'Value')
+        if value is None:
+            continue
+        props = _tm7_properties(value)
+        description = props.get('UserThreatDescription') or props.get('UserThreatShortDescription') or ''
+        interaction = props.get('InteractionString')
+        if interaction:
+            description = f"{interaction}: {description}" if description else interaction
+        threats.append(_threat(
+            props.get('Title'),
+            description,
+            props.get('UserThreatCategory'),
+            props.get('PossibleMitigations') or props.get('StateInformation'),
+            _child_text(value, 'State'),
+            props.get('Priority') or _child_text(value, 'Priority'),
+        ))
+
+    return {
+        "title": _child_text(meta, 'ThreatModelName') or 'TM7 model',
+        "description": _child_text(meta, 'HighLevelSystemDescription'),
+        "threats": threats,
+    }
+
+
+def parse_threat_model(filename, raw_bytes):
+    """
+    Detects the format from the extension and parses the model.
+
+    Returns:
+        tuple: (format_name, parsed_model)
+    """
+    extension = Path(filename or '').suffix.lower()
+    if extension == '.tm7':
+        return 'tm7', parse_tm7(raw_bytes)
+    if extension == '.json':
+        return 'threat_dragon', parse_threat_dragon(raw_bytes)
+    raise ImportFormatError(
+        f"Unsupported threat model file: {extension or filename}. Supported: .json (Threat Dragon), .tm7"
+    )
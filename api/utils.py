@@ -13,9 +13,9 @@ PDF_EXTENSIONS = {'.pdf'}
 ALLOWED_EXTENSIONS = IMAGE_EXTENSIONS | TEXT_EXTENSIONS | PDF_EXTENSIONS
 
 
-def _ensure_diagrams_dir():
-    if not os.path.exists("diagrams"):
-        os.makedirs("diagrams")
+def _ensure_diagrams_dir(diagrams_dir="diagrams"):
+    if not os.path.exists(diagrams_dir):
+        os.makedirs(diagrams_dir)
 
 
 def save_image(file):
@@ -34,16 +34,17 @@ def save_image(file):
         return None, None
 
 
-def process_file(file):
+def process_file(file, diagrams_dir="diagrams"):
     """
     Process an uploaded file of any supported type.
+    Images are copied to diagrams_dir (the diagram store by default).
     Returns: tuple (content, content_type, saved_filename)
       - content_type = 'image': content is base64-encoded JPEG string
       - content_type = 'text':  content is plain text string
     Supported formats: PNG, JPG, JPEG, GIF, BMP, WebP (image),
                        PDF, TXT, MD, XML, JSON, SVG (text extraction)
     """
-    _ensure_diagrams_dir()
+    _ensure_diagrams_dir(diagrams_dir)
 
     original_filename = file.filename
     file_extension = Path(original_filename).suffix.lower()
@@ -56,24 +57,24 @@ def process_file(file):
 
     try:
         if file_extension in IMAGE_EXTENSIONS:
-            return _process_image(raw_bytes, original_filename)
+            return _process_image(raw_bytes, original_filename, diagrams_dir)
         elif file_extension in PDF_EXTENSIONS:
-            return _process_pdf(raw_bytes)
+            return _process_pdf(raw_bytes, diagrams_dir)
         else:
-            return _process_text_file(raw_bytes, file_extension)
+            return _process_text_file(raw_bytes, file_extension, diagrams_dir)
     finally:
         if hasattr(file, 'file') and hasattr(file.file, 'close'):
             file.file.close()
 
 
-def _process_image(raw_bytes, original_filename):
+def _process_image(raw_bytes, original_filename, diagrams_dir="diagrams"):
     """Convert raw image bytes to base64 JPEG and save to disk."""
     # Save original full-quality copy to disk for the report.
     img_display = Image.open(io.BytesIO(raw_bytes)).convert("RGB")
 
     unique_id = str(uuid.uuid4())
     saved_filename = f"{unique_id}.jpg"
-    file_path = f"diagrams/{saved_filename}"
+    file_path = os.path.join(diagrams_dir, saved_filename)
     img_display.save(file_path, format="JPEG", quality=85, optimize=True)
 
     # Resize by longest side preserving aspect ratio (handles both landscape and portrait)
@@ -95,7 +96,7 @@ def _process_image(raw_bytes, original_filename):
     return image_b64, "image", saved_filename
 
 
-def _process_pdf(raw_bytes):
+def _process_pdf(raw_bytes, diagrams_dir="diagrams"):
     """Extract text from a PDF using pdfplumber."""
     try:
         import pdfplumber
@@ -116,28 +117,45 @@ def _process_pdf(raw_bytes):
     if not content.strip():
         raise ValueError("No se pudo extraer texto del PDF. Puede ser un PDF basado en imágenes.")
 
-    saved_filename = _save_text_to_disk(content, "pdf")
+    saved_filename = _save_text_to_disk(content, "pdf", diagrams_dir)
     return content, "text", saved_filename
 
 
-def _process_text_file(raw_bytes, file_extension):
+def _process_text_file(raw_bytes, file_extension, diagrams_dir="diagrams"):
     """Decode text-based files (TXT, MD, XML, JSON, SVG)."""
     content = raw_bytes.decode('utf-8', errors='replace')
     ext = file_extension.lstrip('.')
-    saved_filename = _save_text_to_disk(content, ext)
+    saved_filename = _save_text_to_disk(content, ext, diagrams_dir)
     return content, "text", saved_filename
 
 
-def _save_text_to_disk(content, ext):
+def _save_text_to_disk(content, ext, diagrams_dir="diagrams"):
     """Persist text content to the diagrams folder and return the filename."""
     unique_id = str(uuid.uuid4())
     saved_filename = f"{unique_id}.{ext}"
-    file_path = f"diagrams/{saved_filename}"
+    file_path = os.path.join(diagrams_dir, saved_filename)
     with open(file_path, 'w', encoding='utf-8') as f:
         f.write(content)
     return saved_filename
 
 
+def read_saved_text(saved_filename):
+    """
+    Read back text content previously persisted by _save_text_to_disk.
+    Returns None if the file is missing or is not a text artifact.
+    """
+    if not saved_filename:
+        return None
+    file_extension = Path(saved_filename).suffix.lower()
+    if file_extension in IMAGE_EXTENSIONS:
+        return None
+    file_path = os.path.join("diagrams", os.path.basename(saved_filename))
+    if not os.path.exists(file_path):
+        return None
+    with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+        return f.read()
+
+
 def save_text_content(text_content):
     """
     Save raw text content (from textarea) to disk.
@@ -147,7 +147,7 @@ const ControlTagsWithAutocomplete = ({ threatId, strideCategory, initialTags = [
       setIsLoading(true);
       setError(null);
       
-      const data = await searchControlTags(query);
+      const data = await searchControlTags(query, 50, 'autocomplete');
       setSuggestions(data.results || []);
       
       // Procesar detailed_results de la búsqueda
@@ -26,6 +26,7 @@ import {
   Select,
   Skeleton,
   Stat,
+  Switch,
   StatLabel,
   StatNumber,
   Table,
@@ -126,13 +127,14 @@ const Dashboard = () => {
   const [projects, setProjects] = useState([]);
   const [projectsLoading, setProjectsLoading] = useState(true);
   const [selectedProject, setSelectedProject] = useState('');
+  const [useCrosswalk, setUseCrosswalk] = useState(false);
 
   // ── Fetch dashboard stats ────────────────────────────────────────────────
-  const fetchStats = useCallback(async (projectId) => {
+  const fetchStats = useCallback(async (projectId, crosswalk = false) => {
     setLoading(true);
     setError(null);
     try {
-      const data = await getDashboardStats(projectId || null);
+      const data = await getDashboardStats(projectId || null, { crosswalk });
       setStats(data);
     } catch (err) {
       setError(err);
@@ -160,7 +162,13 @@ const Dashboard = () => {
   const handleProjectChange = (e) => {
     const pid = e.target.value;
     setSelectedProject(pid);
-    fetchStats(pid || null);
+    fetchStats(pid || null, useCrosswalk);
+  };
+
+  const handleCrosswalkChange = (e) => {
+    const enabled = e.target.checked;
+    setUseCrosswalk(enabled);
+    fetchStats(selectedProject || null, enabled);
   };
 
   // ── Derived state ────────────────────────────────────────────────────────
@@ -230,7 +238,7 @@ const Dashboard = () => {
             {error ? (
               <SectionError
                 message={tb?.error_body || 'Could not load dashboard statistics.'}
-                onRetry={() => fetchStats(selectedProject || null)}
+                onRetry={() => fetchStats(selectedProject || null, useCrosswalk)}
               />
             ) : (
               <Skeleton isLoaded={!loading} borderRadius="md">
@@ -274,7 +282,7 @@ const Dashboard = () => {
             {error ? (
               <SectionError
                 message={tb?.error_body || 'Could not load risk distribution.'}
-                onRetry={() => fetchStats(selectedProject || null)}
+                onRetry={() => fetchStats(selectedProject || null, useCrosswalk)}
               />
             ) : (
               <Skeleton isLoaded={!loading} borderRadius="md" minH="280px">
@@ -324,7 +332,7 @@ const Dashboard = () => {
             {error ? (
               <SectionError
                 message={tb?.error_body || 'Could not load data.'}
-                onRetry={() => fetchStats(selectedProject || null)}
+                onRetry={() => fetchStats(selectedProject || null, useCrosswalk)}
               />
             ) : (
               <Skeleton isLoaded={!loading} borderRadius="md" minH="280px">
@@ -452,13 +460,26 @@ const Dashboard = () => {
 
           {/* Standards Coverage BarChart (T016 / T017) */}
           <GridItem colSpan={{ base: 1, lg: 2 }}>
-            <Heading size="sm" mb={3}>
-              {tb?.standards?.title || 'Standards Coverage'}
-            </Heading>
+            <Flex justify="space-between" align="center" mb={3}>
+              <Heading size="sm">
+                {tb?.standards?.title || 'Standards Coverage'}
+              </Heading>
+              <Flex align="center" gap={2}>
+                <Text fontSize="sm" color="gray.500">
+                  {tb?.standards?.crosswalk || 'Include crosswalk'}
+                </Text>
+                <Switch
+                  size="sm"
+                  isChecked={useCrosswalk}
+                  onChange={handleCrosswalkChange}
+                  isDisabled={loading}
+                />
+              </Flex>
+            </Flex>
             {error ? (
               <SectionError
                 message={tb?.error_body || 'Could not load standards coverage.'}
-                onRetry={() => fetchStats(selectedProject || null)}
+                onRetry={() => fetchStats(selectedProject || null, useCrosswalk)}
               />
             ) : (
               <Skeleton isLoaded={!loading} borderRadius="md" minH="220px">
@@ -24,11 +24,12 @@ import {
   Flex,
   IconButton,
   Button,
-  Collapse
+  Collapse,
+  useToast
 } from '@chakra-ui/react';
-import { ChevronLeftIcon, ChevronRightIcon, ViewIcon, ViewOffIcon } from '@chakra-ui/icons';
+import { ChevronLeftIcon, ChevronRightIcon, DownloadIcon, ViewIcon, ViewOffIcon } from '@chakra-ui/icons';
 import { useLocalization } from '../hooks/useLocalization';
-import { getAllThreats } from '../services';
+import { getThreatsReportPage, exportThreatsReport, exportThreatsReportPdf } from '../services';
 import ReportsFilters from './ReportsFilters';
 
 /**
@@ -69,72 +70,76 @@ const Reports = () => {
   const [selectedInherentRisk, setSelectedInherentRisk] = useState(null);
   const [selectedCurrentRisk, setSelectedCurrentRisk] = useState(null);
 
-  // Estados de paginación
+  // Estados de paginación (por cursor: pageCursors[n] es el cursor de la página n + 1)
   const [currentPage, setCurrentPage] = useState(1);
   const [threatsPerPage] = useState(20);
+  const [pageCursors, setPageCursors] = useState([null]);
+  const [nextCursor, setNextCursor] = useState(null);
 
   // Estado para controlar la visibilidad del panel de filtros
   const [showFilters, setShowFilters] = useState(true);
 
-  // Función para cargar amenazas (con filtros opcionales)
-  const loadThreats = async (filters = {}) => {
+  // Formato que se está exportando (null si no hay exportación en curso)
+  const [exporting, setExporting] = useState(null);
+  const toast = useToast();
+
+  // Filtros activos del reporte
+  const buildFilters = () => {
+    const filters = {};
+    
+    if (selectedStandards.length > 0) {
+      filters.standards = selectedStandards; // Pasar como array, no como string
+    }
+    
+    if (selectedInherentRisk) {
+      filters.inherit_risk = selectedInherentRisk;
+    }
+    
+    if (selectedCurrentRisk) {
+      filters.current_risk = selectedCurrentRisk;
+    }
+    
+    return filters;
+  };
+
+  // Función para cargar una página de amenazas (cursor null = primera página)
+  const loadThreats = async (cursor = null) => {
     try {
       setLoading(true);
       setError(null);
       
-      const params = {
-        skip: (currentPage - 1) * threatsPerPage,
+      const result = await getThreatsReportPage({
+        cursor,
         limit: threatsPerPage,
-        ...filters
-      };
-      
-      const result = await getAllThreats(params);
-      const threatsArray = Array.isArray(result) ? result : [];
+        ...buildFilters()
+      });
       
-      // DEBUG: Ver estructura completa de datos
-      if (threatsArray.length > 0) {
-        console.log('=== ESTRUCTURA COMPLETA DE AMENAZA ===');
-        console.log('Amenaza completa:', JSON.stringify(threatsArray[0], null, 2));
-        console.log('Information system keys:', Object.keys(threatsArray[0].information_system || {}));
-        console.log('Information system:', threatsArray[0].information_system);
-        console.log('Information system ID:', threatsArray[0].information_system?.id);
-        console.log('Information system title:', threatsArray[0].information_system?.title);
-      }
-      
-      // El backend ya devuelve las amenazas filtradas y ordenadas
-      setThreats(threatsArray);
+      // El backend ya devuelve las amenazas filtradas y ordenadas (más recientes primero)
+      setThreats(result.threats);
+      setNextCursor(result.nextCursor);
       
     } catch (err) {
       setError(err.message);
       setThreats([]);
+      setNextCursor(null);
     } finally {
       setLoading(false);
     }
   };
 
-  // Cargar amenazas al montar el componente
+  // Cargar amenazas al cambiar de página
   useEffect(() => {
-    loadThreats();
+    loadThreats(pageCursors[currentPage - 1]);
   }, [currentPage]);
 
-  // Recargar cuando cambian los filtros
+  // Recargar desde la primera página cuando cambian los filtros
   useEffect(() => {
-    setCurrentPage(1); // Resetear a la primera página
-    const filters = {};
-    
-    if (selectedStandards.length > 0) {
-      filters.standards = selectedStandards; // Pasar como array, no como string
-    }
-    
-    if (selectedInherentRisk) {
-      filters.inherit_risk = selectedInherentRisk;
-    }
-    
-    if (selectedCurrentRisk) {
-      filters.current_risk = selectedCurrentRisk;
+    setPageCursors([null]);
+    if (currentPage !== 1) {
+      setCurrentPage(1); // El efecto de página recarga
+    } else {
+      loadThreats(null);
     }
-    
-    loadThreats(filters);
   }, [selectedStandards, selectedInherentRisk, selectedCurrentRisk]);
 
   // Manejar toggle de estándares
@@ -162,10 +167,33 @@ const Reports = () => {
     setSelectedCurrentRisk(null);
   };
 
+  // Descarga todas las amenazas que cumplen los filtros (no solo la página actual)
+  const handleExport = async (format) => {
+    setExporting(format);
+    try {
+      if (format === 'pdf') {
+        await exportThreatsReportPdf(buildFilters());
+      } else {
+        await exportThreatsReport(format, buildFilters());
+      }
+    } catch (err) {
+      toast({
+        title: t.ui.reports.export_error,
+        status: 'error',
+        duration: 5000,
+        isClosable: true,
+      });
+    } finally {
+      setExporting(null);
+    }
+  };
+
   // Simplificar paginación - el backend ya maneja skip/limit
   const currentThreats = Array.isArray(threats) ? threats : [];
 
   const nextPage = () => {
+    if (!nextCursor) return;
+    setPageCursors(prev => [...prev.slice(0, currentPage), nextCursor]);
     setCurrentPage(prev => prev + 1);
   };
 
@@ -271,6 +299,24 @@ const Reports = () => {
                 )}
               </Button>
 
+              {/* Exportación del reporte completo con los filtros activos */}
+              <HStack spacing={2}>
+                {['csv', 'ndjson', 'parquet', 'pdf'].map((format) => (
+                  <Button
+                    key={format}
+                    leftIcon={<DownloadIcon />}
+                    onClick={() => handleExport(format)}
+                    isLoading={exporting === format}
+                    isDisabled={exporting !== null}
+                    variant="outline"
+                    size="sm"
+                    colorScheme="indigo"
+                  >
+                    {t.ui.reports[`export_${format}`]}
+                  </Button>
+                ))}
+              </HStack>
+
               <Text fontSize="sm" color="gray.600">
                 {t.ui.reports.showing_page} {currentPage} - {currentThreats.length} {t.ui.reports.threats}
                 {(selectedStandards.length > 0 || selectedInherentRisk || selectedCurrentRisk) && (
@@ -418,7 +464,7 @@ const Reports = () => {
             </Table>
 
             {/* Controles de paginación */}
-            {currentThreats.length === threatsPerPage && (
+            {(nextCursor || currentPage > 1) && (
               <Flex justify="center" align="center" mt={4} gap={4}>
                 <IconButton
                   icon={<ChevronLeftIcon />}
@@ -435,7 +481,7 @@ const Reports = () => {
                 <IconButton
                   icon={<ChevronRightIcon />}
                   onClick={nextPage}
-                  isDisabled={currentThreats.length < threatsPerPage}
+                  isDisabled={!nextCursor}
                   size="sm"
                   aria-label={t.ui.reports.next_page}
                 />
@@ -81,9 +81,11 @@ export const getAuditLog = async (params = {}) => {
 // DASHBOARD FUNCTIONS
 // ========================================
 
-export const getDashboardStats = async (projectId = null) => {
+export const getDashboardStats = async (projectId = null, { crosswalk = false } = {}) => {
   const params = {};
   if (projectId) params.project_id = projectId;
+  // Count standards reached through the control crosswalk (e.g. ASVS → NIST/ISO27001)
+  if (crosswalk) params.crosswalk = true;
   const response = await apiClient.get('/dashboard/stats', { params });
   return response.data;
 };
@@ -29,6 +29,9 @@ export const {
 
 export const {
   getThreatsReport,
+  getThreatsReportPage,
+  exportThreatsReport,
+  exportThreatsReportPdf,
   getAllThreats,
   updateThreatsRiskBatch,
   createThreatForSystem,
@@ -64,9 +67,8 @@ export { apiClient, API_BASE_URL };
  */
 export const fetchControlTagSuggestions = async (strideCategory) => {
   try {
-    // Add cache buster to ensure we get fresh data
-    const cacheBuster = Date.now();
-    const response = await apiClient.get(`/control-tags/suggestions/${strideCategory}?t=${cacheBuster}`);
+    // El navegador revalida con ETag (304 si el catálogo no cambió)
+    const response = await apiClient.get(`/control-tags/suggestions/${strideCategory}`);
     return response.data;
   } catch (error) {
     console.error('Error fetching control tag suggestions:', error);
@@ -76,10 +78,11 @@ export const fetchControlTagSuggestions = async (strideCategory) => {
 
 /**
  * Busca tags de control existentes
+ * mode: 'search' (subcadena) o 'autocomplete' (prefijos, tolera tildes y errores de tipeo)
  */
-export const searchControlTags = async (query, limit = 50) => {
+export const searchControlTags = async (query, limit = 50, mode = 'search') => {
   try {
-    const response = await apiClient.get(`/control-tags/search?query=${encodeURIComponent(query)}&limit=${limit}`);
+    const response = await apiClient.get(`/control-tags/search?query=${encodeURIComponent(query)}&limit=${limit}&mode=${mode}`);
     return response.data;
   } catch (error) {
     console.error('Error searching control tags:', error);
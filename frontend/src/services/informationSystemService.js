@@ -5,26 +5,28 @@
 import apiClient from './apiClient';
 
 /**
- * Obtiene lista paginada de sistemas de información
+ * Obtiene lista paginada de sistemas de información (resumen: conteos por nivel
+ * de riesgo en lugar de la lista de amenazas)
  * @param {number} skip - Número de sistemas a saltar para la paginación
  * @param {number} limit - Cantidad máxima de sistemas a recuperar
  * @returns {Promise} - Promise con los datos de sistemas y conteo total
  */
 export const getInformationSystems = async (skip = 0, limit = 10, project_id = null, include_archived = false) => {
   try {
-    const projectParam = project_id ? `&project_id=${project_id}` : '';
-    const archivedParam = include_archived ? '&include_archived=true' : '';
-    // Primero obtenemos el total de sistemas (sin límite)
-    const countResponse = await apiClient.get(`/information_systems?skip=0&limit=1000${projectParam}${archivedParam}`);
-    const totalCount = countResponse.data.length;
-    
-    // Luego obtenemos los datos paginados
-    const dataResponse = await apiClient.get(`/information_systems?skip=${skip}&limit=${limit}${projectParam}${archivedParam}`);
-    
-    // Agregamos el conteo total a la respuesta
-    dataResponse.totalCount = totalCount;
-    
-    return dataResponse;
+    const params = { skip, limit };
+    if (project_id) {
+      params.project_id = project_id;
+    }
+    if (include_archived) {
+      params.include_archived = true;
+    }
+    // Una sola llamada: la página y el total vienen en la misma respuesta
+    const response = await apiClient.get('/information_systems/summary', { params });
+    return {
+      ...response,
+      data: response.data.items,
+      totalCount: response.data.total
+    };
   } catch (error) {
     console.error('Error al obtener sistemas de información:', error);
     throw new Error(error.response?.data?.detail || 'Error al obtener sistemas');
@@ -88,13 +90,17 @@ export const uploadDiagram = async (id, file) => {
  * Envía una descripción textual de un sistema para análisis de amenazas.
  * @param {string} id - ID del sistema
  * @param {string} text - Descripción textual de la arquitectura o diagrama
+ * @param {boolean} incremental - Analizar solo las secciones que cambiaron desde el último análisis
  * @returns {Promise} - Promise con la respuesta del servidor
  */
-export const uploadDiagramText = async (id, text) => {
+export const uploadDiagramText = async (id, text, incremental = false) => {
   try {
     console.log(`Enviando descripción de texto para el sistema ${id}`);
     const formData = new FormData();
     formData.append("text_content", text);
+    if (incremental) {
+      formData.append("incremental", "true");
+    }
 
     const response = await apiClient.post(`/evaluate/${id}`, formData, {
       headers: { "Content-Type": "multipart/form-data" }
@@ -108,6 +114,29 @@ export const uploadDiagramText = async (id, text) => {
   }
 };
 
+/**
+ * Importa modelos de amenazas existentes (OWASP Threat Dragon .json o Microsoft TMT .tm7)
+ * sin pasar por el análisis de IA. Cada archivo crea un nuevo sistema de información.
+ * @param {File[]} files - Archivos de modelos de amenazas
+ * @param {string|null} projectId - Proyecto al que se asignan los sistemas importados
+ * @returns {Promise} - Promise con el resultado por archivo
+ */
+export const importThreatModels = async (files, projectId = null) => {
+  try {
+    const formData = new FormData();
+    files.forEach((file) => formData.append("files", file));
+    if (projectId) {
+      formData.append("project_id", projectId);
+    }
+    return await apiClient.post("/import", formData, {
+      headers: { "Content-Type": "multipart/form-data" }
+    });
+  } catch (error) {
+    console.error("Error al importar modelos de amenazas:", error);
+    throw error;
+  }
+};
+
 /**
  * Acceso directo para obtener los datos completos de un sistema por su ID
  * @param {string} id - ID del sistema
@@ -63,3 +63,14 @@ export const removeProjectMember = async (projectId, userId) => {
     throw new Error(error.response?.data?.detail || 'Error al eliminar miembro');
   }
 };
+
+export const getProjectGapAnalysis = async (projectId, { standards = null, crosswalk = false } = {}) => {
+  try {
+    const params = {};
+    if (standards && standards.length) params.standards = standards.join(',');
+    if (crosswalk) params.crosswalk = true;
+    return await apiClient.get(`/projects/${projectId}/gap-analysis`, { params });
+  } catch (error) {
+    throw new Error(error.response?.data?.detail || 'Error al obtener análisis de brechas');
+  }
+};
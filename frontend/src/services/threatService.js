@@ -56,6 +56,118 @@ export const getThreatsReport = async ({
 // Alias para compatibilidad con código existente
 export const getAllThreats = getThreatsReport;
 
+/**
+ * Obtiene una página del reporte de amenazas (paginación por cursor, más recientes primero)
+ * @param {Object} params - Mismos filtros que getThreatsReport
+ * @param {string} params.cursor - Cursor de la página (nextCursor de la página anterior)
+ * @param {string} params.view - 'slim' (el sistema solo trae id, título y proyecto) o 'full'
+ * @returns {Promise<{threats: Array, nextCursor: string|null}>} - Amenazas y cursor de la siguiente página
+ */
+export const getThreatsReportPage = async ({
+  cursor = null,
+  limit = 20,
+  standards = null,
+  inherit_risk = null,
+  current_risk = null,
+  view = 'slim'
+} = {}) => {
+  try {
+    const params = { limit, view };
+    if (cursor) {
+      params.cursor = cursor;
+    }
+    if (standards && standards.length > 0) {
+      params.standards = standards.join(',');
+    }
+    if (inherit_risk) {
+      params.inherit_risk = inherit_risk;
+    }
+    if (current_risk) {
+      params.current_risk = current_risk;
+    }
+
+    const response = await apiClient.get('/report', { params });
+    return {
+      threats: Array.isArray(response.data) ? response.data : [],
+      nextCursor: response.headers['x-next-cursor'] || null
+    };
+  } catch (error) {
+    console.error('Error al obtener reporte de amenazas:', error);
+    throw new Error(error.response?.data?.detail || 'Error al obtener reporte de amenazas');
+  }
+};
+
+// Parámetros de filtro comunes a las descargas del reporte
+const reportFilterParams = ({ standards = null, inherit_risk = null, current_risk = null } = {}) => {
+  const params = {};
+  if (standards && standards.length > 0) {
+    params.standards = standards.join(',');
+  }
+  if (inherit_risk) {
+    params.inherit_risk = inherit_risk;
+  }
+  if (current_risk) {
+    params.current_risk = current_risk;
+  }
+  return params;
+};
+
+// Guarda la respuesta (blob) como archivo usando el nombre de Content-Disposition
+const saveBlobResponse = (response, fallbackName) => {
+  const disposition = response.headers['content-disposition'] || '';
+  const match = disposition.match(/filename="?([^";]+)"?/);
+  const url = window.URL.createObjectURL(response.data);
+  const link = document.createElement('a');
+  link.href = url;
+  link.download = match ? match[1] : fallbackName;
+  document.body.appendChild(link);
+  link.click();
+  link.remove();
+  window.URL.revokeObjectURL(url);
+};
+
+/**
+ * Descarga el reporte completo de amenazas (sin límite de filas) como archivo
+ * @param {string} format - 'csv', 'ndjson', 'parquet' o 'arrow'
+ * @param {Object} filters - Mismos filtros que getThreatsReportPage
+ */
+export const exportThreatsReport = async (format = 'csv', filters = {}) => {
+  try {
+    const params = { format, ...reportFilterParams(filters) };
+    const response = await apiClient.get('/report/export', { params, responseType: 'blob' });
+    saveBlobResponse(response, `threat-report.${format}`);
+  } catch (error) {
+    console.error('Error al exportar reporte de amenazas:', error);
+    throw new Error('Error al exportar reporte de amenazas');
+  }
+};
+
+/**
+ * Descarga el reporte en PDF generado por el backend. Si aún se está generando
+ * (202), consulta la URL devuelta hasta que el archivo esté listo.
+ * @param {Object} filters - Mismos filtros que getThreatsReportPage
+ * @param {number} pollInterval - Milisegundos entre consultas
+ */
+export const exportThreatsReportPdf = async (filters = {}, pollInterval = 2000) => {
+  try {
+    const params = reportFilterParams(filters);
+    let response = await apiClient.get('/report/pdf', { params, responseType: 'blob' });
+    // Como mucho ~10 minutos de espera
+    for (let attempt = 0; response.status === 202; attempt++) {
+      if (attempt >= 300) {
+        throw new Error('Tiempo de espera agotado');
+      }
+      const { key } = JSON.parse(await response.data.text());
+      await new Promise((resolve) => setTimeout(resolve, pollInterval));
+      response = await apiClient.get(`/report/pdf/${key}`, { responseType: 'blob' });
+    }
+    saveBlobResponse(response, 'threat-report.pdf');
+  } catch (error) {
+    console.error('Error al exportar reporte de amenazas en PDF:', error);
+    throw new Error('Error al exportar reporte de amenazas');
+  }
+};
+
 /**
  * Actualiza el riesgo de múltiples amenazas en un lote
  * @param {string} systemId - ID del sistema